@@ -1,8 +1,12 @@
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
 import wearipedia
+from wearipedia.devices.biostrap.evo_fetch import fetch_paged
+from wearipedia.devices.biostrap.evo_gen import create_syn_data, mean_reverting_walk
 
 data_formats = {
     "bpm": (int, float),
@@ -90,3 +94,190 @@ def test_evo(real):
             assert isinstance(
                 value, data_format
             ), f"{data_type} data {value} is not a {data_format.__name__}"
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.status_code = 200
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Pages through canned records three at a time, like the last-timestamp cursor."""
+
+    def __init__(self, records):
+        self.records = records
+        self.cursors = []
+
+    def get(self, url, params):
+        self.cursors.append(params["last-timestamp"])
+        later = [r for r in self.records if r["timestamp"] > params["last-timestamp"]]
+        links = {"next": "more"} if len(later) > 3 else {}
+        return FakeResponse({"data": later[:3], "links": links})
+
+
+def millis(*args):
+    return int(datetime(*args).timestamp() * 1000)
+
+
+def test_evo_fetch_paged():
+    times = [
+        datetime(2023, 5, 31, 23, 59, 50),
+        datetime(2023, 6, 1, 0, 0, 0),
+        datetime(2023, 6, 1, 23, 59, 50),
+        datetime(2023, 6, 2, 0, 0, 0),
+        datetime(2023, 6, 2, 0, 0, 10),
+        datetime(2023, 6, 2, 0, 0, 10),
+        datetime(2023, 6, 3, 0, 0, 0),
+    ]
+    records = [
+        {
+            "timestamp": int(t.timestamp() * 1000),
+            "bpm": 60 + i,
+            "steps": i,
+            "tz_offset_mins": -420,
+        }
+        for i, t in enumerate(times)
+    ]
+    expected = [t.strftime("%Y-%m-%d %H:%M:%S") for t in times[1:5]]
+
+    session = FakeSession(records)
+    bpm = fetch_paged(session, "url", "bpm", "2023-06-01", "2023-06-02")
+
+    # the days are paged separately, each from its own local midnight, the page
+    # crossing midnight is cut at the end of the first day, and the repeated
+    # record is dropped
+    assert sorted(session.cursors)[:2] == [
+        millis(2023, 6, 1) - 1,
+        millis(2023, 6, 2) - 1,
+    ]
+    assert list(bpm.keys()) == [(key, -420) for key in expected]
+    assert list(bpm.values()) == [61, 62, 63, 64]
+
+    steps = fetch_paged(
+        FakeSession(records), "url", "steps", "2023-06-01", "2023-06-02", columnar=True
+    )
+    assert steps["timestamp"].dtype == np.int64
+    assert (
+        steps["timestamp"] == np.array(expected, dtype="datetime64[s]").astype(np.int64)
+    ).all()
+    assert steps["value"].tolist() == [1, 2, 3, 4]
+
+    activities = fetch_paged(
+        FakeSession(records), "url", "activities", "2023-06-01", "2023-06-02"
+    )
+    assert list(activities.keys()) == expected
+    assert list(activities.values()) == records[1:5]
+
+
+@pytest.fixture
+def los_angeles(monkeypatch):
+    monkeypatch.setenv("TZ", "America/Los_Angeles")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_evo_fetch_paged_dst(los_angeles):
+    # 2023-03-12 springs forward at 02:00 and 2023-11-05 falls back at 02:00
+    utc = [
+        datetime(2023, 3, 12, 8, 0, tzinfo=timezone.utc),
+        datetime(2023, 3, 12, 20, 0, tzinfo=timezone.utc),
+        datetime(2023, 3, 13, 12, 0, tzinfo=timezone.utc),
+        datetime(2023, 11, 5, 8, 30, tzinfo=timezone.utc),
+        datetime(2023, 11, 5, 9, 30, tzinfo=timezone.utc),
+        datetime(2023, 11, 5, 20, 0, tzinfo=timezone.utc),
+    ]
+    records = [
+        {"timestamp": int(t.timestamp() * 1000), "steps": i} for i, t in enumerate(utc)
+    ]
+    expected = [
+        datetime.fromtimestamp(t.timestamp()).strftime("%Y-%m-%d %H:%M:%S") for t in utc
+    ]
+    assert expected[1] == "2023-03-12 13:00:00"
+    assert expected[3:5] == ["2023-11-05 01:30:00", "2023-11-05 01:30:00"]
+
+    spring = fetch_paged(
+        FakeSession(records), "url", "steps", "2023-03-12", "2023-03-13"
+    )
+    assert list(spring.keys()) == expected[:3]
+
+    fall = fetch_paged(
+        FakeSession(records), "url", "steps", "2023-11-05", "2023-11-05", columnar=True
+    )
+    assert (
+        fall["timestamp"]
+        == np.array(expected[3:], dtype="datetime64[s]").astype(np.int64)
+    ).all()
+    assert fall["value"].tolist() == [3, 4, 5]
+
+
+def test_evo_synthetic_slice():
+    device = wearipedia.get_device("biostrap/evo")
+    params = {"start_date": "2023-06-10", "end_date": "2023-06-10"}
+
+    bpm = device.get_data("bpm", params)
+    keys = [key for key, _ in bpm.keys()]
+    assert keys[0] == "2023-06-10 00:00:00"
+    assert keys[-1] == "2023-06-10 23:59:50"
+    assert len(keys) == 8640
+
+    steps = device.get_data("steps", params)
+    assert list(steps.keys())[0] == "2023-06-10 00:00:00"
+    assert list(steps.keys())[-1] == "2023-06-10 23:59:00"
+
+    columns = device.get_data("bpm", {**params, "columnar": True})
+    assert list(columns.keys()) == ["timestamp", "value"]
+    assert columns["timestamp"].dtype == np.int64
+    assert columns["value"].tolist() == list(bpm.values())
+    assert (
+        columns["timestamp"] == np.array(keys, dtype="datetime64[s]").astype(np.int64)
+    ).all()
+
+
+def test_evo_mean_reverting_walk():
+    np.random.seed(1)
+    walk = mean_reverting_walk(10000, 45, 70, 0.01, 2, 40, 120)
+    assert walk.shape == (10000,)
+    assert ((40 <= walk) & (walk <= 120)).all()
+    # the walk reverts from its start towards the target
+    assert walk[:10].mean() < 50
+    assert abs(walk[5000:].mean() - 70) < 5
+
+    # large noise is clipped to the bounds instead of escaping them
+    np.random.seed(1)
+    walk = mean_reverting_walk(1000, 98, 98, 0.1, 5, 95, 100)
+    assert walk.min() == 95 and walk.max() == 100
+
+    # unclipped, it is the recursion x = x + reversion * (target - x) + noise
+    np.random.seed(2)
+    walk = mean_reverting_walk(50, 16, 10, 0.25, 0.5, -np.inf, np.inf)
+    np.random.seed(2)
+    noise = np.random.normal(0, 0.5, 50)
+    value, expected = 16.0, []
+    for step in noise:
+        value += 0.25 * (10 - value) + step
+        expected.append(value)
+    assert np.allclose(walk, expected)
+
+
+def test_evo_daily_calories():
+    np.random.seed(0)
+    data = create_syn_data("2023-06-01", "2023-06-03")
+    rest_cals, work_cals, active_cals, step_cals, total_cals = data[5:10]
+    steps = data[12]
+
+    dates = ["2023-06-01", "2023-06-02", "2023-06-03"]
+    assert list(step_cals.keys()) == dates
+    days = np.datetime_as_string(steps["timestamp"].astype("datetime64[s]"), unit="D")
+    for date in dates:
+        day_steps = steps["value"][days == date].sum()
+        assert step_cals[date] == pytest.approx(0.05 * day_steps)
+        assert total_cals[date] == pytest.approx(
+            rest_cals[date] + work_cals[date] + active_cals[date] + step_cals[date]
+        )
+        assert 1000 <= rest_cals[date] <= 1300
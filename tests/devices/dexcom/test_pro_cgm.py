@@ -1,10 +1,14 @@
 # perform additional test specific to dexcom pro CGM device
 
+import json
 from datetime import datetime
 
+import numpy as np
 import pytest
 
 import wearipedia
+from wearipedia.devices.dexcom import pro_cgm_fetch
+from wearipedia.devices.dexcom.pro_cgm_fetch import egv_windows, fetch_data
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -69,3 +73,142 @@ def helper_test(device, start_date, end_date):
             assert (
                 50 <= realtimeval <= 200
             ), f"Expected glucose values to be between 50 and 200, got {realtimeval}"
+
+
+def test_dexcom_pro_cgm_empty_range():
+    device = wearipedia.get_device(
+        "dexcom/pro_cgm",
+        synthetic_start_date="2022-03-01",
+        synthetic_end_date="2022-03-01",
+    )
+
+    data = device.get_data(
+        "data", {"start_date": "2022-03-01", "end_date": "2022-03-02"}
+    )
+
+    assert data["egvs"] == [], f"expected no EGVs, got {len(data['egvs'])}"
+    assert len(device.egv_index) == 0
+
+
+def test_dexcom_pro_cgm_filter_bounds():
+    device = wearipedia.get_device(
+        "dexcom/pro_cgm",
+        synthetic_start_date="2022-03-01",
+        synthetic_end_date="2022-03-05",
+    )
+
+    # [start_date, end_date): the end date itself is excluded
+    egvs = device.get_data(
+        "data", {"start_date": "2022-03-02", "end_date": "2022-03-04"}
+    )["egvs"]
+    assert len(egvs) == 2 * 24 * 12
+    assert egvs[0]["systemTime"] == "2022-03-03T23:55:00"
+    assert egvs[-1]["systemTime"] == "2022-03-02T00:00:00"
+
+    # the index lines up with the EGVs it was generated with
+    assert (
+        -device.egv_index
+        == np.array(
+            [egv["systemTime"] for egv in device.data["egvs"]], dtype="datetime64[s]"
+        ).astype(np.int64)
+    ).all()
+
+    egvs = device.get_data(
+        "data", {"start_date": "2022-03-04", "end_date": "2022-03-10"}
+    )["egvs"]
+    assert egvs == device.data["egvs"][: 24 * 12]
+
+
+def test_dexcom_egv_windows():
+    assert egv_windows("2022-01-01", "2022-01-02") == [
+        ("2022-01-01T00:00:00", "2022-01-02T00:00:00")
+    ]
+    assert egv_windows("2022-01-01", "2022-05-01", window_days=90) == [
+        ("2022-01-01T00:00:00", "2022-04-01T00:00:00"),
+        ("2022-04-01T00:00:00", "2022-05-01T00:00:00"),
+    ]
+    assert egv_windows("2022-01-01", "2022-01-01") == []
+
+
+class FakeResponse:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self.text = json.dumps(body)
+
+
+class FakeSession:
+    def __init__(self, egvs, valid_token):
+        self.egvs = egvs
+        self.valid_token = valid_token
+        self.calls = []
+        self.closed = False
+
+    def get(self, url, params, headers):
+        self.calls.append((params["startDate"], headers["authorization"]))
+        if headers["authorization"] != f"Bearer {self.valid_token}":
+            return FakeResponse(401, {"fault": "invalid token"})
+
+        start, end = params["startDate"], params["endDate"]
+        egvs = [egv for egv in self.egvs if start <= egv["systemTime"] <= end]
+        return FakeResponse(
+            200, {"unit": "mg/dL", "rateUnit": "mg/dL/min", "egvs": egvs}
+        )
+
+    def close(self):
+        self.closed = True
+
+
+def egv(system_time, value):
+    return {"systemTime": system_time, "displayTime": system_time, "value": value}
+
+
+def test_dexcom_fetch_data(monkeypatch):
+    egvs = [
+        egv("2022-01-01T00:00:00", 100),
+        egv("2022-01-02T12:00:00", 110),
+        # on the boundary of both windows, so returned twice
+        egv("2022-01-03T00:00:00", 120),
+        egv("2022-01-04T08:00:00", 130),
+    ]
+    session = FakeSession(egvs, valid_token="new")
+    monkeypatch.setattr(pro_cgm_fetch.requests, "Session", lambda: session)
+    monkeypatch.setattr(
+        pro_cgm_fetch,
+        "egv_windows",
+        lambda start, end: egv_windows(start, end, window_days=2),
+    )
+
+    refreshes = []
+
+    def refresh():
+        refreshes.append(True)
+        return "new"
+
+    out = fetch_data("old", "2022-01-01", "2022-01-05", refresh=refresh, max_workers=1)
+
+    # one 401 with the expired token, then every request with the new one
+    assert refreshes == [True]
+    assert session.calls == [
+        ("2022-01-01T00:00:00", "Bearer old"),
+        ("2022-01-01T00:00:00", "Bearer new"),
+        ("2022-01-03T00:00:00", "Bearer new"),
+    ]
+    assert session.closed
+    assert [e["systemTime"] for e in out["egvs"]] == [
+        "2022-01-04T08:00:00",
+        "2022-01-03T00:00:00",
+        "2022-01-02T12:00:00",
+        "2022-01-01T00:00:00",
+    ]
+    assert out["unit"] == "mg/dL"
+
+    session = FakeSession(egvs, valid_token="new")
+    out = fetch_data("new", "2022-01-01", "2022-01-05", columnar=True)
+    frame = out["egvs"]
+    assert frame["value"].tolist() == [130, 120, 110, 100]
+    assert str(frame["systemTime"].dtype).startswith("datetime64")
+    assert frame.index.tolist() == [0, 1, 2, 3]
+
+    session = FakeSession(egvs, valid_token="new")
+    with pytest.raises(Exception, match="fault"):
+        fetch_data("old", "2022-01-01", "2022-01-05")
@@ -1,9 +1,14 @@
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
 import pytest
 from dateutil import parser
 
 import wearipedia
+from wearipedia.devices.fitbit import fitbit_sense_fetch
+from wearipedia.devices.fitbit.fitbit_sense_fetch import decode_intraday
+from wearipedia.utils import RateLimiter
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -154,3 +159,172 @@ def helper_test(device, start_synthetic, end_synthetic, real):
         sum(distance_arr) / len(distance_arr) < 30
     ), f"Average distance should be less than 30 but was {sum(distance_arr) / len(distance_arr)}"
     assert len(distance_arr) >= 1, "Number of distance data points should be at least 1"
+
+
+def test_decode_intraday():
+    heart_rate = {
+        "activities-heart": [{"dateTime": "2022-06-10", "value": {}}],
+        "activities-heart-intraday": {
+            "dataset": [
+                {"time": "00:00:00", "value": 61},
+                {"time": "12:30:15", "value": 88},
+                {"time": "23:59:59", "value": 57},
+            ],
+            "datasetInterval": 1,
+            "datasetType": "second",
+        },
+    }
+    offsets, values = decode_intraday("intraday_heart_rate", heart_rate)
+    assert offsets.tolist() == [0, 45015, 86399]
+    assert values.tolist() == [61, 88, 57]
+
+    spo2 = {
+        "dateTime": "2022-06-10",
+        "minutes": [
+            {"value": 95.5, "minute": "2022-06-09T23:59:00"},
+            {"value": 97.0, "minute": "2022-06-10T01:00:00"},
+        ],
+    }
+    offsets, values = decode_intraday("intraday_spo2", spo2)
+    assert offsets.tolist() == [-60, 3600]
+    assert values.tolist() == [95.5, 97.0]
+
+    hrv = {
+        "hrv": [
+            {
+                "dateTime": "2022-06-10",
+                "minutes": [
+                    {
+                        "minute": "2022-06-09T23:55:00.000",
+                        "value": {"rmssd": 41.5, "coverage": 0.9},
+                    },
+                    {
+                        "minute": "2022-06-10T02:00:00.000",
+                        "value": {"rmssd": 36.0, "coverage": 0.95},
+                    },
+                ],
+            }
+        ]
+    }
+    offsets, values = decode_intraday("intraday_hrv", hrv)
+    assert offsets.tolist() == [-300, 7200]
+    assert values.tolist() == [41.5, 36.0]
+
+    breath_rate = {"br": [{"value": {"breathingRate": 15.5}, "dateTime": "2022-06-10"}]}
+    offsets, values = decode_intraday("intraday_breath_rate", breath_rate)
+    assert offsets.tolist() == [0]
+    assert values.tolist() == [15.5]
+
+    breath_rate = {
+        "br": [
+            {"value": {"fullSleepSummary": {"breathingRate": 0}}, "dateTime": "x"},
+            {"value": {}, "dateTime": "2022-06-10"},
+        ]
+    }
+    offsets, values = decode_intraday("intraday_breath_rate", breath_rate)
+    assert values[0] == 0
+    assert np.isnan(values[1]), "a night without a breathing rate should be NaN"
+
+
+def test_decode_intraday_unpadded_times():
+    heart_rate = {
+        "activities-heart": [{"dateTime": "2022-06-10", "value": {}}],
+        "activities-heart-intraday": {
+            "dataset": [
+                {"time": "0:00:05", "value": 61},
+                {"time": "12:30:15", "value": 88},
+            ],
+        },
+    }
+    offsets, values = decode_intraday("intraday_heart_rate", heart_rate)
+    assert offsets.tolist() == [5, 45015]
+
+    heart_rate["activities-heart-intraday"]["dataset"][0]["time"] = "00-00-05"
+    heart_rate["activities-heart-intraday"]["dataset"][1]["time"] = "12-30-15"
+    with pytest.raises(ValueError):
+        decode_intraday("intraday_heart_rate", heart_rate)
+
+
+def test_fetch_breath_rate_columnar(monkeypatch):
+    def call_API(url, access_token, **kwargs):
+        return {
+            "br": [
+                {"value": {"breathingRate": 16.0}, "dateTime": "2022-06-11"},
+                {"value": {"breathingRate": 14.5}, "dateTime": "2022-06-10"},
+            ]
+        }
+
+    monkeypatch.setattr(fitbit_sense_fetch, "call_API", call_API)
+
+    frame = fitbit_sense_fetch.fetch_real_data(
+        "intraday_breath_rate", "token", "2022-06-10", "2022-06-11", columnar=True
+    )
+
+    assert frame["date"].astype(str).tolist() == ["2022-06-10", "2022-06-11"]
+    assert frame["offset"].tolist() == [0, 0]
+    assert frame["value"].tolist() == [14.5, 16.0]
+
+
+def test_fetch_intraday_windows(monkeypatch):
+    urls = []
+
+    def call_API(url, access_token, **kwargs):
+        urls.append(url)
+        start, end = url.split("/date/")[1].split("/")[:2]
+        # only every other day has a breathing rate, in no particular order
+        days = np.arange(np.datetime64(start), np.datetime64(end) + 1)[::2]
+        return {
+            "br": [
+                {"value": {"breathingRate": 15.0}, "dateTime": str(day)}
+                for day in days[::-1]
+            ]
+        }
+
+    monkeypatch.setattr(fitbit_sense_fetch, "call_API", call_API)
+
+    days = fitbit_sense_fetch.fetch_real_data(
+        "intraday_breath_rate", "token", "2022-01-01", "2022-02-05", max_workers=4
+    )
+
+    # 36 days are requested in two windows of at most 30 days
+    assert sorted(urls) == [
+        "https://api.fitbit.com/1/user/-/br/date/2022-01-01/2022-01-30/all.json",
+        "https://api.fitbit.com/1/user/-/br/date/2022-01-31/2022-02-05/all.json",
+    ]
+
+    # one response per requested day, in date order, empty for days without data
+    assert len(days) == 36
+    expected = np.arange(np.datetime64("2022-01-01"), np.datetime64("2022-02-06"))
+    for day, date in zip(days, expected.astype(str)):
+        if day["br"]:
+            assert day["br"][0]["dateTime"] == date
+    assert days[1] == {"br": []}
+    assert days[0]["br"][0]["dateTime"] == "2022-01-01"
+
+
+def test_fetch_intraday_shares_rate_limiter(monkeypatch):
+    limiters = []
+
+    def call_API(url, access_token, rate_limiter=None, **kwargs):
+        limiters.append(rate_limiter)
+        return {"hrv": []}
+
+    monkeypatch.setattr(fitbit_sense_fetch, "call_API", call_API)
+
+    for _ in range(2):
+        fitbit_sense_fetch.fetch_real_data(
+            "intraday_hrv", "token", "2022-01-01", "2022-03-01"
+        )
+
+    assert len(limiters) == 4
+    assert all(limiter is fitbit_sense_fetch.RATE_LIMITER for limiter in limiters)
+
+
+def test_rate_limiter_throttles():
+    limiter = RateLimiter(2, 0.2)
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.wait()
+
+    assert time.monotonic() - start >= 0.2
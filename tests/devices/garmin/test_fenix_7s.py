@@ -1,10 +1,21 @@
 # perform additional tests specific to the Fenix 7S device
 
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 
 import pytest
+from garminconnect import GarminConnectTooManyRequestsError
 
 import wearipedia
+from wearipedia.devices.garmin import fenix_fetch
+from wearipedia.devices.garmin.fenix_7s import (
+    TOKEN_MAX_AGE,
+    load_tokens,
+    login_with_tokens,
+    save_tokens,
+    token_store_lock,
+)
+from wearipedia.devices.garmin.fenix_gen import create_syn_data
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -246,3 +257,171 @@ def test_fenix_7s(real):
         assert (
             set(entry["dailySleepDTO"]["sleepScores"].keys()) == sleep_scores_keys
         ), f"Sleep data 'sleepScores' keys are not correct: {entry['dailySleepDTO']['sleepScores'].keys()}"
+
+
+def test_fenix_7s_token_store(tmp_path):
+    path = str(tmp_path / "tokens.json")
+    assert load_tokens(path) is None, "Missing token store should not load"
+
+    with token_store_lock(path):
+        save_tokens(path, "tokens", time.time())
+    assert load_tokens(path)["tokens"] == "tokens", "Tokens did not round-trip"
+
+    save_tokens(path, "tokens", time.time() - TOKEN_MAX_AGE - 1)
+    assert load_tokens(path) is None, "Expired tokens should not load"
+
+
+class FakeClient:
+    def loads(self, tokens):
+        if tokens != "valid":
+            raise ValueError("Invalid tokens")
+
+    def login(self, email, password):
+        pass
+
+
+class FakeGarmin:
+    # falls back to the credentials like Garmin.login does
+    def __init__(self):
+        self.client = FakeClient()
+
+    def login(self, tokenstore=None):
+        try:
+            self.client.loads(tokenstore)
+        except ValueError:
+            self.client.login("email", "password")
+
+
+def test_fenix_7s_login_with_tokens():
+    assert not login_with_tokens(
+        FakeGarmin(), "valid"
+    ), "Loaded tokens should not count as a credential login"
+    assert login_with_tokens(
+        FakeGarmin(), "invalid"
+    ), "Falling back to the credentials should be detected"
+
+
+def test_fenix_7s_synthetic_shape():
+    data = create_syn_data("2022-02-27", "2022-03-02")
+    midnight = int(datetime(2022, 2, 27).timestamp() * 1000)
+
+    assert data["dates"] == [
+        datetime(2022, 2, 27) + timedelta(days=i) for i in range(3)
+    ]
+    for key in ["hrv", "steps", "hr", "body_battery", "floors", "stress"]:
+        assert len(data[key]) == 3, key
+
+    # HRV nights start at 23:00 local time on the previous day
+    hrv = data["hrv"][0]
+    assert hrv["hrvSummary"]["calendarDate"] == "2022-02-27"
+    assert hrv["startTimestampLocal"] == "2022-02-26T23:00:00.0"
+    assert hrv["startTimestampGMT"] == "2022-02-27T06:00:00.0"
+    assert data["hrv"][2]["startTimestampLocal"] == "2022-02-28T23:00:00.0"
+
+    # 15-minute step intervals, contiguous across days
+    steps = [interval for day in data["steps"] for interval in day]
+    assert [len(day) for day in data["steps"]] == [96] * 3
+    assert steps[0]["startGMT"] == "2022-02-27T06:00:00.0"
+    assert all(a["endGMT"] == b["startGMT"] for a, b in zip(steps[:-1], steps[1:]))
+
+    floors = data["floors"][1]["floorValuesArray"]
+    assert len(floors) == 68
+    assert floors[0][:2] == ["2022-02-28T07:00:00.0", "2022-02-28T07:15:00.0"]
+    assert [type(value) for value in floors[0]] == [str, str, int, int]
+
+    respiration = data["respiration"][0]["respirationValuesArray"]
+    assert len(respiration) == 96
+    assert respiration[1][0] == midnight + 15 * 60000
+    assert [type(value) for value in respiration[0]] == [int, float]
+
+    battery = data["body_battery"][0][0]["bodyBatteryValuesArray"]
+    assert len(battery) == 96
+    assert battery[0][0] == midnight + 23 * 3600000
+
+    hr = data["hr"][0]["heartRateValues"]
+    assert [timestamp for timestamp, _ in hr] == [
+        midnight + (7 + hour) * 3600000 for hour in range(24)
+    ]
+    assert [len(day["stressValuesArray"]) for day in data["stress"]] == [96] * 3
+
+
+def test_fenix_fetch_days_order():
+    def fetch_day(date):
+        # later days answer first
+        time.sleep(0.01 * (6 - date.day))
+        return str(date)
+
+    responses = fenix_fetch.fetch_days(fetch_day, "2022-03-01", 5, max_workers=4)
+
+    assert responses == [f"2022-03-0{day}" for day in range(1, 6)]
+
+
+def test_fenix_call_with_backoff(monkeypatch):
+    delays = []
+    monkeypatch.setattr(fenix_fetch.time, "sleep", delays.append)
+    calls = []
+
+    def connectapi(url, params=None):
+        calls.append((url, params))
+        if len(calls) == 1:
+            raise GarminConnectTooManyRequestsError("429")
+        return {"date": params["date"]}
+
+    out = fenix_fetch.call_with_backoff(connectapi, "/url", params={"date": "d"})
+
+    assert out == {"date": "d"}
+    assert calls == [("/url", {"date": "d"})] * 2
+    assert len(delays) == 1
+    assert fenix_fetch.BACKOFF_BASE <= delays[0] < fenix_fetch.BACKOFF_BASE + 1
+
+    def always_limited(url):
+        raise GarminConnectTooManyRequestsError("429")
+
+    with pytest.raises(GarminConnectTooManyRequestsError):
+        fenix_fetch.call_with_backoff(always_limited, "/url")
+    assert len(delays) == 1 + fenix_fetch.MAX_RETRIES - 1
+
+
+class FakeBatteryApi:
+    def __init__(self):
+        self.windows = []
+
+    def connectapi(self, url, params=None):
+        self.windows.append((params["startDate"], params["endDate"]))
+        start = datetime.strptime(params["startDate"], "%Y-%m-%d")
+        end = datetime.strptime(params["endDate"], "%Y-%m-%d")
+
+        # one report per day, except on the 10th of the month, and two on the 1st
+        reports = []
+        for i in range((end - start).days + 1):
+            date = (start + timedelta(days=i)).strftime("%Y-%m-%d")
+            if date.endswith("-10"):
+                continue
+            reports.append({"date": date, "charged": i})
+            if date.endswith("-01"):
+                reports.append({"date": date, "charged": -i})
+        return reports
+
+
+def test_fenix_fetch_body_battery():
+    api = FakeBatteryApi()
+
+    days = fenix_fetch.fetch_real_data("2022-01-01", "2022-03-02", "body_battery", api)
+
+    assert sorted(api.windows) == [
+        ("2022-01-01", "2022-01-28"),
+        ("2022-01-29", "2022-02-25"),
+        ("2022-02-26", "2022-03-01"),
+    ]
+    assert len(days) == 60
+    assert [len(reports) for reports in days[:11]] == [2] + [1] * 8 + [0, 1]
+    assert days[9] == [], "a day without a report should get an empty list"
+    assert days[31] == [
+        {"date": "2022-02-01", "charged": 3},
+        {"date": "2022-02-01", "charged": -3},
+    ]
+    assert all(
+        report["date"] == str(datetime(2022, 1, 1).date() + timedelta(days=i))
+        for i, reports in enumerate(days)
+        for report in reports
+    )
@@ -1,3 +1,6 @@
+from types import SimpleNamespace
+
+import json
 from datetime import datetime
 
 import numpy as np
@@ -5,6 +8,8 @@ import pandas as pd
 import pytest
 
 import wearipedia
+from wearipedia.devices.google import googlefitness_fetch
+from wearipedia.devices.google.googlefitness_synthetic import create_syn_data
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -381,3 +386,141 @@ def distance_helper(data):
             )
             assert d[0]["dataset"][0]["point"][0]["value"][0]["fpVal"] <= 100000
             assert d[0]["dataset"][0]["point"][0]["value"][0]["fpVal"] >= 0
+
+
+def test_googlefit_get_many():
+    device = wearipedia.get_device("google/googlefit")
+    params = {"start_date": "2022-03-05", "end_date": "2022-03-20"}
+
+    data = device.get_many(["steps", "heart_rate", "sleep"], params=params)
+
+    assert list(data.keys()) == ["steps", "heart_rate", "sleep"]
+    for data_type, buckets in data.items():
+        assert buckets == device.get_data(data_type, params=params)
+        assert len(buckets) == 15
+
+
+def test_googlefit_minute_buckets():
+    steps = create_syn_data("2022-01-01", "2022-01-02", "60000")["steps"]
+
+    assert len(steps) == 2 * 1440
+    starts = [bucket[0]["startTimeMillis"] for bucket in steps]
+    assert starts[0] == pd.Timestamp("2022-01-01").value // 1000000
+    assert np.all(np.diff(starts) == 60000)
+    point = steps[5][0]["dataset"][0]["point"][0]
+    assert steps[5][0]["endTimeMillis"] - steps[5][0]["startTimeMillis"] == 60000
+    assert int(point["startTimeNanos"]) == starts[5] * 1000000
+    assert int(point["endTimeNanos"]) == (starts[5] + 60000) * 1000000
+
+
+def test_googlefit_synthetic_slicing():
+    data = create_syn_data("2022-01-01", "2022-01-10", "3600000", seed=4)
+    heart_rate = data["heart_rate"]
+
+    assert heart_rate[10:20] == [heart_rate[i] for i in range(10, 20)]
+    assert heart_rate[-1] == heart_rate[len(heart_rate) - 1]
+    assert heart_rate[::24] == [heart_rate[i] for i in range(0, 240, 24)]
+    assert heart_rate[300:] == []
+
+    # the buckets compare equal to, and serialize like, a plain list
+    assert heart_rate == list(heart_rate)
+    assert heart_rate == heart_rate[:]
+    assert json.loads(json.dumps(heart_rate[:])) == heart_rate
+
+    # every data type draws from its own stream, in whichever order they are used
+    other = create_syn_data("2022-01-01", "2022-01-10", "3600000", seed=4)
+    other["steps"][:]
+    assert other["heart_rate"] == heart_rate
+    assert data["steps"] == other["steps"]
+    assert create_syn_data("2022-01-01", "2022-01-10", "3600000", seed=5)[
+        "heart_rate"
+    ] != list(heart_rate)
+
+
+def test_googlefit_time_bucket():
+    device = wearipedia.get_device("google/googlefit", time_bucket="3600000")
+    params = {"start_date": "2022-03-05", "end_date": "2022-03-07"}
+
+    steps = device.get_data("steps", params=params)
+
+    assert type(steps) is list
+    assert len(steps) == 2 * 24
+    assert steps[0][0]["startTimeMillis"] == pd.Timestamp("2022-03-05").value // 10**6
+    json.dumps(steps)
+
+
+def canned_buckets(body):
+    # one bucket per day of the request, with a dataset per aggregated data type
+    return [
+        {
+            "startTimeMillis": start,
+            "endTimeMillis": start + 86400000,
+            "dataset": [
+                {"dataSourceId": aggregate["dataSourceId"], "point": [{"start": start}]}
+                for aggregate in body["aggregateBy"]
+            ],
+        }
+        for start in range(body["startTimeMillis"], body["endTimeMillis"], 86400000)
+    ]
+
+
+def test_googlefit_split_by_type():
+    body = googlefitness_fetch.build_request_body(
+        ["steps", "heart_rate"], 0, 2 * 86400000, 86400000
+    )
+    out = googlefitness_fetch.split_by_type(
+        canned_buckets(body), ["steps", "heart_rate"]
+    )
+
+    assert list(out.keys()) == ["steps", "heart_rate"]
+    for data_type, buckets in out.items():
+        assert [b["startTimeMillis"] for b in buckets] == [0, 86400000]
+        for bucket in buckets:
+            assert len(bucket["dataset"]) == 1
+            assert (
+                bucket["dataset"][0]["dataSourceId"]
+                == googlefitness_fetch.datasourceids[data_type]
+            )
+
+
+def test_googlefit_fetch_batched(monkeypatch):
+    bodies = []
+
+    def post_aggregate(session, headers, body):
+        bodies.append(body)
+        return canned_buckets(body)
+
+    monkeypatch.setattr(googlefitness_fetch, "post_aggregate", post_aggregate)
+
+    start_date, end_date = "2022-01-01", "2022-07-20"
+    data_types = ["steps", "heart_rate", "sleep"]
+    out = googlefitness_fetch.fetch_real_data_batched(
+        SimpleNamespace(access_token="token"),
+        start_date,
+        end_date,
+        data_types,
+        types_per_request=2,
+    )
+
+    # 200 days are split into 90-day chunks, for each group of data types
+    start_millis = googlefitness_fetch.milliconvert(start_date)
+    end_millis = googlefitness_fetch.milliconvert(end_date)
+    chunks = sorted(
+        {(body["startTimeMillis"], body["endTimeMillis"]) for body in bodies}
+    )
+    assert chunks == [
+        (start_millis, start_millis + 90 * 86400000),
+        (start_millis + 90 * 86400000, start_millis + 180 * 86400000),
+        (start_millis + 180 * 86400000, end_millis),
+    ]
+    assert len(bodies) == 6
+
+    assert list(out.keys()) == data_types
+    for data_type, buckets in out.items():
+        starts = [bucket[0]["startTimeMillis"] for bucket in buckets]
+        assert starts == list(range(start_millis, end_millis, 86400000))
+        assert all(
+            bucket[0]["dataset"][0]["dataSourceId"]
+            == googlefitness_fetch.datasourceids[data_type]
+            for bucket in buckets
+        )
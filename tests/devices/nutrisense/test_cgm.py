@@ -4,6 +4,9 @@ import numpy as np
 import pytest
 
 import wearipedia
+from wearipedia.devices.nutrisense import cgm_fetch
+from wearipedia.devices.nutrisense.cgm_gen import gen_data
+from wearipedia.utils import seed_everything
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -47,3 +50,142 @@ def helper(data, start_synthetic, end_synthetic, real):
         assert (
             start_synthetic <= np.datetime64(e["x"]) <= end_synthetic
         ), f"expected all data to be between start and end, but got {np.datetime64(e['x'])}, which is not between {start_synthetic} and {end_synthetic}"
+
+
+def test_nutrisense_gen_data():
+    seed_everything(0)
+    scores, continuous, summary, stat, times = gen_data("2022-01-01", "2022-01-10", 0)
+
+    assert len(continuous) == len(times) == 10 * 96
+    assert times.dtype == np.dtype("datetime64[m]")
+    assert continuous[0]["x"] == "2022-01-01T00:00:00-08:00"
+    assert continuous[-1]["x"] == "2022-01-10T23:45:00-08:00"
+
+    levels = np.array([e["y"] for e in continuous])
+    assert ((75 <= levels) & (levels <= 135)).all()
+    # every day starts at its drawn level, which lies within the bounds
+    assert ((110 <= levels[::96]) & (levels[::96] <= 135)).all()
+    assert summary["min"] == levels.min() and summary["max"] == levels.max()
+    assert set(scores) >= {"score", "scorePeak"}
+    assert set(stat) == {"today", "average"}
+
+    seed_everything(0)
+    again = gen_data("2022-01-01", "2022-01-10", 0)
+    assert again[0] == scores
+    assert again[1] == continuous
+    assert again[2] == summary
+    assert again[3] == stat
+    assert (again[4] == times).all()
+
+
+def test_nutrisense_continuous_slice():
+    device = wearipedia.get_device(
+        "nutrisense/cgm",
+        synthetic_start_date="2022-03-01",
+        synthetic_end_date="2022-03-10",
+    )
+
+    # [start_date, end_date + 1 day), both ends included as whole days
+    data = device.get_data(
+        "continuous", {"start_date": "2022-03-03", "end_date": "2022-03-04"}
+    )
+    assert len(data) == 2 * 96
+    assert data[0]["x"] == "2022-03-03T00:00:00-08:00"
+    assert data[-1]["x"] == "2022-03-04T23:45:00-08:00"
+
+    data = device.get_data(
+        "continuous", {"start_date": "2022-03-10", "end_date": "2022-03-10"}
+    )
+    assert data == device.continuous[-96:]
+
+    data = device.get_data(
+        "continuous", {"start_date": "2022-02-20", "end_date": "2022-02-28"}
+    )
+    assert data == []
+
+
+def chart_response(start_date, end_date, low, high):
+    values = [{"x": f"{start_date}T00:00:00", "y": low}]
+    values.append({"x": f"{end_date}T00:00:00", "y": high})
+    chart = {"type": "timeline", "range": {"min": low, "max": high}, "values": values}
+    return {"data": {"allCharts": {"charts": [chart]}}}
+
+
+def test_nutrisense_chart_windows(monkeypatch):
+    windows = []
+
+    def post_query(session, headers, operation, start_date, end_date):
+        windows.append((start_date, end_date))
+        low = int(start_date[5:7])
+        return chart_response(start_date, end_date, low, 100 + low)
+
+    monkeypatch.setattr(cgm_fetch, "post_query", post_query)
+
+    res = cgm_fetch.fetch_operation(None, {}, "allCharts", "2022-01-01", "2022-03-10")
+
+    assert sorted(windows) == [
+        ("2022-01-01", "2022-01-31"),
+        ("2022-02-01", "2022-03-03"),
+        ("2022-03-04", "2022-03-10"),
+    ]
+    chart = res["data"]["allCharts"]["charts"][0]
+    assert [value["x"][:10] for value in chart["values"]] == [
+        "2022-01-01",
+        "2022-01-31",
+        "2022-02-01",
+        "2022-03-03",
+        "2022-03-04",
+        "2022-03-10",
+    ]
+    assert chart["range"] == {"min": 1, "max": 103}
+
+    # a single window is returned as is
+    windows.clear()
+    res = cgm_fetch.fetch_operation(None, {}, "allCharts", "2022-01-01", "2022-01-31")
+    assert windows == [("2022-01-01", "2022-01-31")]
+    assert res == chart_response("2022-01-01", "2022-01-31", 1, 101)
+
+
+def test_nutrisense_merge_charts_missing_range():
+    first = chart_response("2022-01-01", "2022-01-31", 80, 140)
+    second = chart_response("2022-02-01", "2022-03-03", None, 150)
+    third = chart_response("2022-03-04", "2022-03-10", 70, None)
+    del third["data"]["allCharts"]["charts"][0]["range"]
+
+    chart = cgm_fetch._merge_charts([first, second, third])["data"]["allCharts"]
+    assert len(chart["charts"][0]["values"]) == 6
+    assert chart["charts"][0]["range"] == {"min": 80, "max": 150}
+
+
+def test_nutrisense_memo_skips_errors(monkeypatch):
+    requests_sent = []
+    failing = [True]
+
+    def post_query(session, headers, operation, start_date, end_date):
+        requests_sent.append(operation)
+        if failing[0]:
+            return {"errors": [{"message": "Unauthorized"}], "data": None}
+        return chart_response(start_date, end_date, 80, 140)
+
+    monkeypatch.setattr(cgm_fetch, "post_query", post_query)
+    memo = {}
+
+    with pytest.raises(TypeError):
+        cgm_fetch.fetch_many("2022-01-01", "2022-01-10", ["continuous"], {}, memo)
+    assert memo == {}, "error responses should not be memoized"
+
+    failing[0] = False
+    data = cgm_fetch.fetch_many(
+        "2022-01-01", "2022-01-10", ["continuous", "summary"], {}, memo
+    )
+    assert requests_sent == ["allCharts", "allCharts"]
+    assert data["summary"] == {"min": 80, "max": 140}
+    assert len(data["continuous"]) == 2
+
+    cgm_fetch.fetch_real_data("2022-01-01", "2022-01-10", "summary", {}, memo)
+    assert len(requests_sent) == 2, "memoized responses should cost no request"
+
+    device = wearipedia.get_device("nutrisense/cgm")
+    device.responses = memo
+    device.clear_responses()
+    assert device.responses == {}
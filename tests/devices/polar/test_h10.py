@@ -1,9 +1,18 @@
+from types import SimpleNamespace
+
+import io
+import zipfile
 from datetime import datetime
 
 import numpy as np
+import pandas as pd
 import pytest
+import requests
 
 import wearipedia
+from wearipedia.devices.polar import polar_get
+from wearipedia.devices.polar.polar_gen import gen_sessions, sessions_to_dict
+from wearipedia.devices.polar.polar_get import parse_rr_member, parse_session_csv
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -112,3 +121,171 @@ def session_tests(data, start_synthetic, end_synthetic, real):
             assert (
                 40 <= hr <= 200
             ), f"Heart rate should be between 40 and 200, but received {hr}"
+
+
+def test_h10_sessions_deterministic():
+    serial = gen_sessions(7, "2022-01-01", "2022-01-15", rr=True)
+    pooled = gen_sessions(7, "2022-01-01", "2022-01-15", rr=True, max_workers=2)
+
+    assert [day for day, _, _ in serial] == [day for day, _, _ in pooled]
+    for (_, hr, rr), (_, pooled_hr, pooled_rr) in zip(serial, pooled):
+        assert np.array_equal(hr["heart_rates"], pooled_hr["heart_rates"])
+        assert hr["calories"] == pooled_hr["calories"]
+        assert np.array_equal(rr["rr"], pooled_rr["rr"])
+        assert np.array_equal(rr["time"], pooled_rr["time"])
+
+    hr = sessions_to_dict(serial)
+    assert all(type(day) is str for day in hr)
+    walk = np.concatenate([day["heart_rates"] for day in hr.values()])
+    assert ((50 <= walk) & (walk <= 190)).all()
+
+
+SESSION_CSV = """Name,Sport,Date,Start time,Duration,Total distance (km),Average heart rate (bpm)
+Jane Doe,RUNNING,01-03-2022,08:00:00,00:00:05,1.2,81
+Sample rate,Time,HR (bpm),Speed (km/h),Pace (min/km)
+1,00:00:00,80,9.5,6:19
+1,00:00:01,81,9.6,6:15
+1,00:00:02,,9.6,6:15
+1,00:00:03,83,9.7,6:11
+1,24:00:04,84,9.7,6:11
+"""
+
+
+class FakeResponse:
+    def __init__(self, text="", body=None):
+        self.text = text
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeFlowSession:
+    cookies = requests.cookies.RequestsCookieJar()
+
+    def __init__(self, history):
+        self.history = history
+        self.exports = []
+
+    def post(self, url, cookies, headers, json):
+        self.json_data = json
+        return FakeResponse(body=self.history)
+
+    def get(self, url):
+        self.exports.append(url.rsplit("/", 1)[1])
+        return FakeResponse(text=SESSION_CSV)
+
+
+def test_h10_parse_session_csv():
+    raw = parse_session_csv(SESSION_CSV, "2022-03-01")
+
+    # the summary rows are skipped, and samples without a heart rate or past
+    # the end of the day are dropped
+    assert list(raw.columns) == ["time", "bpm"]
+    assert raw["bpm"].tolist() == [80, 81, 83]
+    assert raw["time"].tolist() == list(
+        pd.to_datetime(
+            ["2022-03-01 00:00:00", "2022-03-01 00:00:01", "2022-03-01 00:00:03"]
+        )
+    )
+
+
+def test_h10_fetch_sessions():
+    history = [
+        {
+            "id": 3,
+            "startDate": "2022-03-02 09:00",
+            "hrAvg": 90,
+            "duration": 1800000,
+            "calories": 300,
+        },
+        {
+            "id": 2,
+            "startDate": "2022-03-01 18:00",
+            "hrAvg": None,
+            "duration": 1800000,
+            "calories": 100,
+        },
+        {
+            "id": 1,
+            "startDate": "2022-03-01 08:00",
+            "hrAvg": 81,
+            "duration": 2400000,
+            "calories": 250,
+        },
+    ]
+    session = FakeFlowSession(history)
+    post = FakeResponse(text='AppGlobal.init("42", "en-US");')
+
+    result = polar_get.fetch_real_data(
+        "2022-03-01", "2022-03-02", "sessions", session, post, max_workers=2
+    )
+
+    assert session.json_data["userId"] == 42
+    assert sorted(session.exports) == ["1", "3"]
+    assert list(result.keys()) == ["2022-03-01", "2022-03-02"]
+    assert result["2022-03-01"] == {
+        "heart_rates": [80.0, 81.0, 83.0],
+        "calories": 250,
+        "minutes": 40.0,
+    }
+    assert result["2022-03-02"]["calories"] == 300
+
+
+def rr_export():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("!About This Export.txt", "Elite HRV export\n")
+        archive.writestr("export/2022-03-01 08-00-00.txt", "800\n810.5\n790\n1000\n")
+        archive.writestr("export/2022-03-02 07-30-00.txt", "650\n")
+        archive.writestr("export/2022-03-02 07-30-00.csv", "ignored\n")
+    return buffer.getvalue()
+
+
+def test_h10_parse_rr_member():
+    archive = zipfile.ZipFile(io.BytesIO(rr_export()))
+
+    dte, rr, offsets = parse_rr_member(archive, "export/2022-03-01 08-00-00.txt")
+
+    # the first line is the header, and every interval starts when the previous
+    # one ends
+    assert dte == "2022-03-01 08-00-00"
+    assert rr.dtype == np.float32
+    assert rr.tolist() == [810.5, 790.0, 1000.0]
+    assert offsets.dtype == np.int64
+    assert offsets.tolist() == [0, 810, 1600]
+
+
+@pytest.mark.parametrize("columnar", [True, False])
+def test_h10_fetch_rr(monkeypatch, columnar):
+    content = rr_export()
+    monkeypatch.setattr(
+        polar_get.requests,
+        "post",
+        lambda url, headers, data: SimpleNamespace(content=content),
+    )
+    elite_hrv_session = {"sessionId": "s", "user": {"id": 1}}
+
+    result = polar_get.fetch_real_data(
+        "2022-03-01",
+        "2022-03-02",
+        "rr",
+        None,
+        None,
+        elite_hrv_session=elite_hrv_session,
+        columnar=columnar,
+    )
+
+    assert list(result.keys()) == ["2022-03-01 08-00-00", "2022-03-02 07-30-00"]
+    reading = result["2022-03-01 08-00-00"]
+    if columnar:
+        assert reading["rr"].dtype == np.float32
+        assert reading["offset"].tolist() == [0, 810, 1600]
+    else:
+        assert reading["rr"] == [810.5, 790.0, 1000.0]
+        assert reading["time"] == [
+            datetime(1900, 1, 1),
+            datetime(1900, 1, 1, 0, 0, 0, 810000),
+            datetime(1900, 1, 1, 0, 0, 1, 600000),
+        ]
+    assert len(result["2022-03-02 07-30-00"]["rr"]) == 0
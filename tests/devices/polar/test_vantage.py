@@ -4,6 +4,8 @@ import numpy as np
 import pytest
 
 import wearipedia
+from wearipedia.devices.polar import vantage_fetch
+from wearipedia.devices.polar.vantage_fetch import ACCESSLINK_URL, fetch_transaction
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -253,3 +255,90 @@ def training_by_id_helper(data):
                 "Power (W)",
                 "Unnamed: 11",
             ]
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    def __init__(self, routes, commit_status=200):
+        self.routes = routes
+        self.commit_status = commit_status
+        self.headers = {}
+        self.requests = []
+        self.closed = False
+
+    def post(self, url):
+        self.requests.append(("POST", url))
+        return FakeResponse(201, {"transaction-id": 7})
+
+    def get(self, url):
+        self.requests.append(("GET", url))
+        return FakeResponse(200, self.routes[url])
+
+    def put(self, url):
+        self.requests.append(("PUT", url))
+        return FakeResponse(self.commit_status)
+
+    def close(self):
+        self.closed = True
+
+
+def transaction_routes():
+    transaction_url = f"{ACCESSLINK_URL}/users/1/activity-transactions/7"
+    items = [f"{transaction_url}/activities/{i}" for i in range(3)]
+    routes = {transaction_url: {"activity-log": items}}
+    for i, url in enumerate(items):
+        routes[url] = {"id": i}
+        routes[f"{url}/step-samples"] = {"samples": [i]}
+        routes[f"{url}/zone-samples"] = {"samples": [-i]}
+    return transaction_url, routes
+
+
+def test_vantage_fetch_transaction(monkeypatch):
+    transaction_url, routes = transaction_routes()
+    session = FakeSession(routes)
+    monkeypatch.setattr(vantage_fetch.requests, "Session", lambda: session)
+
+    items = fetch_transaction("token", "1", "daily_activity", samples=True)
+
+    assert [item["id"] for item in items] == [0, 1, 2]
+    assert [item["step-samples"]["samples"] for item in items] == [[0], [1], [2]]
+    assert items[2]["zone-samples"] == {"samples": [-2]}
+
+    # a single transaction, committed once after everything was fetched
+    assert session.requests[0] == (
+        "POST",
+        f"{ACCESSLINK_URL}/users/1/activity-transactions",
+    )
+    assert session.requests[-1] == ("PUT", transaction_url)
+    assert [method for method, _ in session.requests].count("PUT") == 1
+    assert session.headers["Authorization"] == "Bearer token"
+    assert session.closed
+
+
+def test_vantage_fetch_transaction_failures(monkeypatch):
+    transaction_url, routes = transaction_routes()
+    session = FakeSession(routes, commit_status=500)
+    monkeypatch.setattr(vantage_fetch.requests, "Session", lambda: session)
+
+    with pytest.raises(Exception, match="Committing activity-transactions failed"):
+        fetch_transaction("token", "1", "daily_activity")
+    assert session.closed
+
+    # a failed fetch leaves the transaction uncommitted
+    del routes[f"{transaction_url}/activities/1"]
+    session = FakeSession(routes)
+    session.get = lambda url: FakeResponse(
+        404 if url not in routes else 200, routes.get(url)
+    )
+
+    with pytest.raises(Exception, match="Failed to fetch activity-log"):
+        fetch_transaction("token", "1", "daily_activity")
+    assert "PUT" not in [method for method, _ in session.requests]
@@ -78,3 +78,25 @@ def helper(data, start_synthetic, end_synthetic, real):
             assert (
                 40 <= hr <= 200
             ), f"Heart rate should be between 40 and 200, but received {hr}"
+
+
+def test_verity_sense_columnar():
+    device = wearipedia.get_device(
+        "polar/verity_sense",
+        start_date="2022-03-01",
+        end_date="2022-03-10",
+        sampling_rate=2,
+    )
+    params = {"start_date": "2022-03-02", "end_date": "2022-03-04"}
+
+    sessions = device.get_data("sessions", params)
+    frame = device.get_data("sessions", {**params, "columnar": True})
+
+    assert list(frame.columns) == ["date", "time", "heart_rate"]
+    assert len(frame) == sum(len(s["heart_rates"]) for s in sessions.values())
+    for date, session in sessions.items():
+        # two samples per second of every session
+        assert len(session["heart_rates"]) == session["minutes"] * 60 * 2
+        day = frame[frame["date"] == np.datetime64(date)]
+        assert np.allclose(day["heart_rate"], session["heart_rates"])
+        assert day["time"].iloc[1] == 0.5
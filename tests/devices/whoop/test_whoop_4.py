@@ -1,11 +1,19 @@
 # perform additional test specific to Whoop 4 device
 
+from types import SimpleNamespace
+
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
 import pytest
 from dateutil import parser
 
 import wearipedia
+from wearipedia.devices.whoop import whoop_user
+from wearipedia.devices.whoop.whoop_gen import FakeCycles
+from wearipedia.devices.whoop.whoop_user import WhoopUser, hr_windows
+from wearipedia.utils import seed_everything
 
 
 def check_keys(d, expected_keys):
@@ -150,3 +158,118 @@ def helper_test(device, start_synthetic, end_synthetic, real):
         ), f"expected v2_activities to be a list, but got {type(record['v2_activities'])}"
 
     # TODO: check more stuff
+
+
+def test_whoop_4_hr_slice():
+    device = wearipedia.get_device(
+        "whoop/whoop_4",
+        synthetic_start_date="2022-04-01",
+        synthetic_end_date="2022-04-10",
+    )
+    start, end = "2022-04-03T06:00:00.000Z", "2022-04-04T06:00:00.000Z"
+
+    hr = device.get_data("hr", params={"start": start, "end": end})
+
+    # the window is [start, end), in the order the samples were generated
+    start_ts = pd.Timestamp(start).timestamp()
+    end_ts = pd.Timestamp(end).timestamp()
+    inside = (start_ts <= device.hr["time"]) & (device.hr["time"] < end_ts)
+    assert [value["time"] for value in hr["values"]] == device.hr["time"][
+        inside
+    ].tolist()
+    assert [value["data"] for value in hr["values"]] == device.hr["data"][
+        inside
+    ].tolist()
+    assert hr["start"] == hr["values"][0]["time"]
+    assert len(hr["values"]) in (1426, 1427)
+
+    hr = device.get_data(
+        "hr",
+        params={"start": "2022-05-01T00:00:00.000Z", "end": "2022-05-02T00:00:00.000Z"},
+    )
+    assert hr["values"] == []
+
+
+def test_whoop_4_fake_cycles():
+    seed_everything(0)
+    cycles = FakeCycles(datetime(2022, 4, 1), datetime(2022, 4, 11))
+
+    assert len(cycles) == 10
+    records = cycles[2:5]
+    assert type(records) is list
+    assert [record["cycle"]["days"] for record in records] == [
+        "['2022-04-08','2022-04-09')",
+        "['2022-04-07','2022-04-08')",
+        "['2022-04-06','2022-04-07')",
+    ]
+    assert cycles[-1]["cycle"]["days"] == "['2022-04-01','2022-04-02')"
+    assert list(cycles) == cycles[:]
+
+    # every drawn field lies within the bounds it is clipped to
+    frame = cycles.to_frame()
+    assert frame["scaled_strain"].between(0, 30).all()
+    assert frame["day_strain"].between(0, 0.01).all()
+    assert cycles.to_frame("recovery")["recovery_rate"].between(0, 10).all()
+    sleeps = cycles.to_frame("sleep")
+    assert sleeps["quality_duration"].between(0, 50_000_000).all()
+    assert sleeps["wake_duration"].between(0, 1_000_000).all()
+    assert frame["scaled_strain"].nunique() > 1, "values should not be the bounds"
+
+    # the sleeps of a day are the rows of that day in the sleep frame
+    assert [len(record["sleeps"]) for record in cycles] == [
+        int((sleeps["day"] == day).sum()) for day in frame["day"]
+    ]
+
+
+class FakeHRSession:
+    def __init__(self):
+        self.windows = []
+
+    def get(self, url, params, headers):
+        self.windows.append((params["start"], params["end"]))
+        start = pd.Timestamp(params["start"]).timestamp()
+        end = pd.Timestamp(params["end"]).timestamp()
+
+        # a sample every hour, including both ends of the window
+        times = np.arange(start, end + 1, 3600).astype(np.int64)
+        values = [{"data": int(t // 3600 % 24), "time": int(t)} for t in times]
+        return SimpleNamespace(json=lambda: {"start": int(start), "values": values})
+
+    def close(self):
+        pass
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_whoop_hr_windows(monkeypatch, columnar):
+    session = FakeHRSession()
+    monkeypatch.setattr(whoop_user.requests, "Session", lambda: session)
+
+    params = {"start": "2022-04-24T00:00:00.000Z", "end": "2022-04-26T12:00:00.000Z"}
+    hr = WhoopUser("", "").get_heart_rate_json(params, columnar=columnar)
+
+    assert sorted(session.windows) == [
+        ("2022-04-24T00:00:00.000Z", "2022-04-25T00:00:00.000Z"),
+        ("2022-04-25T00:00:00.000Z", "2022-04-26T00:00:00.000Z"),
+        ("2022-04-26T00:00:00.000Z", "2022-04-26T12:00:00.000Z"),
+    ]
+    assert params == {
+        "start": "2022-04-24T00:00:00.000Z",
+        "end": "2022-04-26T12:00:00.000Z",
+    }
+
+    # the samples on the window edges are returned by both windows, but kept once
+    expected = pd.Timestamp(params["start"]).timestamp() + 3600 * np.arange(61)
+    if columnar:
+        times, data = hr["time"], hr["data"]
+    else:
+        times = np.array([value["time"] for value in hr["values"]])
+        data = np.array([value["data"] for value in hr["values"]])
+    assert times.tolist() == expected.astype(np.int64).tolist()
+    assert data.tolist() == (np.arange(61) % 24).tolist()
+    assert hr["start"] == expected[0]
+
+
+def test_whoop_hr_windows_single():
+    assert hr_windows("2022-04-24T00:00:00.000Z", "2022-04-24T06:00:00.000Z") == [
+        ("2022-04-24T00:00:00.000Z", "2022-04-24T06:00:00.000Z")
+    ]
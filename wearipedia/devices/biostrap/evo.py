@@ -4,15 +4,24 @@ import webbrowser
 from datetime import datetime
 from urllib.parse import urlencode
 
+import numpy as np
 import requests
 
 from ...utils import seed_everything
 from ..device import BaseDevice
 from .evo_fetch import fetch_real_data
-from .evo_gen import create_syn_data
+from .evo_gen import TZ_OFFSET, create_syn_data, series_to_dict
 
 
 class EVO(BaseDevice):
+    """This device allows you to work with data from the Biostrap EVO.
+
+    Synthetic bpm, brpm, hrv, spo2, steps and distance are stored as columns
+    sorted by timestamp, so a date range is sliced with a binary search. They are
+    returned as dictionaries keyed like the Biostrap API, or, with `"columnar": True`
+    in the params, as a dictionary with the int64 "timestamp" array (local seconds
+    since the epoch) and the "value" array.
+    """
 
     name = "biostrap/evo"
 
@@ -56,16 +65,17 @@ class EVO(BaseDevice):
 
     def _get_real(self, data_type, params):
         return fetch_real_data(
-            self.access_token, params["start_date"], params["end_date"], data_type
+            self.access_token,
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            columnar=params.get("columnar", False),
         )
 
     def _filter_synthetic(self, data, data_type, params):
         start_date = params["start_date"]
         end_date = params["end_date"]
 
-        start_datetime = f"{start_date} 00:00:00"
-        end_datetime = f"{end_date} 23:59:59"
-
         # For data types that are stored with a date string as a key
         if data_type in [
             "rest_cals",
@@ -80,26 +90,30 @@ class EVO(BaseDevice):
                 if start_date <= date <= end_date
             }
 
-        # For data types that are stored with a datetime string as a key in a tuple
+        # For data types that are stored as columns, sorted by timestamp
         elif data_type in [
             "bpm",
             "brpm",
             "spo2",
             "hrv",
+            "steps",
+            "distance",
         ]:
-            return {
-                key: value
-                for key, value in data.items()
-                if start_datetime <= key[0] <= end_datetime
-            }
+            start_ts = np.datetime64(start_date, "s").astype(np.int64)
+            end_ts = np.datetime64(end_date, "s").astype(np.int64) + 86400
 
-        # For steps and distance that use datetime strings as keys (assuming distance also has datetime as per steps)
-        elif data_type in ["steps", "distance"]:
-            return {
-                datetime: value
-                for datetime, value in data.items()
-                if start_datetime <= datetime <= end_datetime
-            }
+            start_idx = np.searchsorted(data["timestamp"], start_ts, side="left")
+            end_idx = np.searchsorted(data["timestamp"], end_ts, side="left")
+            series = {key: values[start_idx:end_idx] for key, values in data.items()}
+
+            if params.get("columnar", False):
+                return series
+
+            # biometrics are keyed by (datetime, tz_offset), steps and
+            # distance by datetime, like the Biostrap API
+            if data_type in ["steps", "distance"]:
+                return series_to_dict(series)
+            return series_to_dict(series, TZ_OFFSET)
 
         else:
             return data
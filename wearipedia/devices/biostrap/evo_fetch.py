@@ -1,10 +1,209 @@
 import json
+import time
 from datetime import datetime, timedelta
 
+import numpy as np
+import pandas as pd
 import requests
 
+from ...utils import date_windows, fetch_concurrently
+from .evo_gen import format_times
 
-def fetch_real_data(access_token, start_date, end_date, data_type):
+# maximum number of days, or day segments of paged data, fetched at once
+MAX_WORKERS = 4
+
+# The max limit allowed by API
+PAGE_LIMIT = 50
+
+
+def _fetch_segment(session, url, start_ms, end_ms):
+    """Page through the records of [start_ms, end_ms) with the last-timestamp cursor.
+
+    :param session: session to send the requests on
+    :type session: requests.Session
+    :param url: URL of the paged endpoint
+    :type url: str
+    :param start_ms: start of the segment in milliseconds since the epoch
+    :type start_ms: int
+    :param end_ms: end of the segment in milliseconds since the epoch
+    :type end_ms: int
+    :return: the records of the segment, in the order of the API
+    :rtype: List[Dict]
+    """
+    records = []
+    last_timestamp = start_ms - 1
+
+    while True:
+        params = {"last-timestamp": last_timestamp, "limit": PAGE_LIMIT}
+        response = session.get(url, params=params)
+
+        if response.status_code != 200:
+            raise Exception(f"Request failed with status code {response.status_code}")
+
+        data = response.json()
+        page = data["data"]
+
+        records.extend(
+            record for record in page if start_ms <= record["timestamp"] < end_ms
+        )
+
+        # Stop once the segment is covered or there are no more pages
+        if not page or page[-1]["timestamp"] >= end_ms or "next" not in data["links"]:
+            return records
+
+        last_timestamp = page[-1]["timestamp"]
+
+
+def _local_seconds(timestamps_ms, days, bounds):
+    """Convert millisecond timestamps to seconds since the epoch in local time,
+    like `datetime.fromtimestamp` does.
+
+    The UTC offset is constant within most days, so it is taken from the local
+    midnight starting the day of each timestamp; only the timestamps of days
+    whose offset changes by the next midnight (daylight saving time changes) are
+    converted one by one.
+
+    :param timestamps_ms: milliseconds since the epoch
+    :type timestamps_ms: np.ndarray
+    :param days: the days the timestamps fall in, as datetime64[D]
+    :type days: np.ndarray
+    :param bounds: the local midnights starting `days` and the one after the last
+        day, in milliseconds since the epoch
+    :type bounds: np.ndarray
+    :return: int64 seconds since 1970-01-01 00:00:00 in local time
+    :rtype: np.ndarray
+    """
+    day = np.searchsorted(bounds, timestamps_ms, side="right") - 1
+    offsets = days.astype("datetime64[s]").astype(np.int64) * 1000 - bounds
+    seconds = (timestamps_ms + offsets[day]) // 1000
+
+    changing = np.flatnonzero(np.diff(offsets) != 0)
+    for i in np.flatnonzero(np.isin(day, changing)).tolist():
+        utc_seconds = int(timestamps_ms[i] // 1000)
+        seconds[i] = utc_seconds + time.localtime(utc_seconds).tm_gmtoff
+
+    return seconds
+
+
+def fetch_paged(session, url, data_type, start_date, end_date, columnar=False):
+    """Fetch the activities, steps, distance or biometrics of a date range.
+
+    The range is split into days, which are paged through concurrently, each
+    with its own last-timestamp cursor starting at the beginning of the day.
+    The records are then decoded into arrays at once.
+
+    :param session: session to send the requests on
+    :type session: requests.Session
+    :param url: URL of the paged endpoint
+    :type url: str
+    :param data_type: "activities", "steps", "distance" or a biometric
+    :type data_type: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the (inclusive) end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param columnar: whether to return an int64 "timestamp" array (local seconds since
+        the epoch) and a "value" array instead of a dictionary, defaults to False
+    :type columnar: bool, optional
+    :return: the records keyed by their local datetime string (biometrics by a
+        (datetime, tz_offset) tuple), or the columns
+    :rtype: Dict
+    """
+
+    # local midnights from the start date up to the day after the end date
+    days = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 2)
+    bounds = np.array(
+        [
+            int(datetime.strptime(day, "%Y-%m-%d").timestamp() * 1000)
+            for day in days.astype(str)
+        ],
+        dtype=np.int64,
+    )
+    segments = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    pages = fetch_concurrently(
+        lambda segment: _fetch_segment(session, url, *segment),
+        segments,
+        max_workers=MAX_WORKERS,
+    )
+    records = [record for page in pages for record in page]
+
+    if not records:
+        if columnar and data_type != "activities":
+            return {
+                "timestamp": np.array([], dtype=np.int64),
+                "value": np.array([]),
+            }
+        return {}
+
+    frame = pd.DataFrame.from_records(records)
+    frame = frame.drop_duplicates("timestamp").sort_values("timestamp", kind="stable")
+    timestamps = _local_seconds(frame["timestamp"].to_numpy(np.int64), days, bounds)
+
+    if data_type == "activities":
+        return dict(
+            zip(format_times(timestamps), (records[i] for i in frame.index.tolist()))
+        )
+
+    values = frame[data_type].to_numpy()
+    if columnar:
+        return {"timestamp": timestamps, "value": values}
+
+    keys = format_times(timestamps)
+    if data_type not in ["steps", "distance"]:
+        keys = zip(keys, frame["tz_offset_mins"].tolist())
+
+    return dict(zip(keys, values.tolist()))
+
+
+def fetch_by_date(session, url, data_type, start_date, end_date):
+    """Fetch the sleep sessions or sleep details of every day of a date range,
+    requesting the days concurrently.
+
+    :param session: session to send the requests on
+    :type session: requests.Session
+    :param url: URL of the per-day endpoint
+    :type url: str
+    :param data_type: "sleep_session" or "sleep_detail"
+    :type data_type: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the (inclusive) end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: the data of every day that has any, keyed by date
+    :rtype: Dict
+    """
+
+    def fetch_day(date):
+        response = session.get(url, params={"date": date})
+
+        # If empty response, there is nothing for this date
+        if response.status_code == 204:
+            return None
+
+        # Check for successful response
+        if response.status_code != 200:
+            raise Exception(
+                f"Request failed for date {date} with status code {response.status_code}"
+            )
+
+        return response.json()
+
+    dates = [day for day, _ in date_windows(start_date, end_date, 1)]
+    days = fetch_concurrently(fetch_day, dates, max_workers=MAX_WORKERS)
+
+    all_data = {}
+    for date, data in zip(dates, days):
+        # Check if the data exists in the response
+        if data_type == "sleep_session" and data and data.get("data"):
+            all_data[date] = data["data"]
+        elif data_type == "sleep_detail" and data:
+            all_data[date] = data
+
+    return all_data
+
+
+def fetch_real_data(access_token, start_date, end_date, data_type, columnar=False):
     """
     Fetch specified data from the Biostrap API within a given date range.
 
@@ -22,6 +221,10 @@ def fetch_real_data(access_token, start_date, end_date, data_type):
                       "activities", "bpm", "brpm", "hrv", "spo2", "rest_cals", "work_cals", "active_cals",
                       "step_cals", "total_cals", "sleep_session", "sleep_detail", "steps", "distance".
     :type data_type: str
+    :param columnar: whether to return steps, distance and biometrics as an int64
+        "timestamp" array (local seconds since the epoch) and a "value" array,
+        defaults to False
+    :type columnar: bool, optional
 
     :return: A dictionary containing the retrieved data. The format varies based on the data_type.
     :rtype: Dict
@@ -60,65 +263,15 @@ def fetch_real_data(access_token, start_date, end_date, data_type):
 
         URL = f"{BASE_URL}{ENDPOINT}"
 
-        last_timestamp = 0
-        limit = 50  # The max limit allowed by API
-
-        while True:
-            params = {"last-timestamp": last_timestamp, "limit": limit}
-            response = requests.get(URL, params=params, headers=headers)
-
-            if response.status_code != 200:
-                raise Exception(
-                    f"Request failed with status code {response.status_code}"
-                )
-
-            data = response.json()
-
-            if data_type in ["activities", "steps", "distance"]:
-                for activity in data["data"]:
-
-                    timestamp = activity["timestamp"] / 1000  # Convert to seconds
-                    current_datetime = datetime.fromtimestamp(timestamp)
-
-                    # Break the loop if the timestamp is beyond the end date
-                    if current_datetime > end_date_obj:
-                        break
-
-                    # Include data only if the timestamp is within the given date range
-                    if start_date_obj <= current_datetime <= end_date_obj:
-                        if data_type == "activities":
-                            all_data[
-                                current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-                            ] = activity
-                        elif data_type == "steps":
-                            all_data[
-                                current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-                            ] = activity["steps"]
-                        else:
-                            all_data[
-                                current_datetime.strftime("%Y-%m-%d %H:%M:%S")
-                            ] = activity["distance"]
-            else:
-                for biometric in data["data"]:
-                    timestamp = biometric["timestamp"] / 1000  # Convert to seconds
-                    current_datetime = datetime.fromtimestamp(timestamp)
-
-                    if current_datetime > end_date_obj:
-                        break
-
-                    if start_date_obj <= current_datetime <= end_date_obj:
-                        key = (
-                            current_datetime.strftime("%Y-%m-%d %H:%M:%S"),
-                            biometric["tz_offset_mins"],
-                        )
-                        all_data[key] = biometric[data_type]
-
-            if "next" in data["links"]:
-                last_timestamp = data["data"][-1]["timestamp"]
-            else:
-                break
+        session = requests.Session()
+        session.headers.update(headers)
 
-        return all_data
+        try:
+            return fetch_paged(
+                session, URL, data_type, start_date, end_date, columnar=columnar
+            )
+        finally:
+            session.close()
 
     elif data_type in [
         "rest_cals",
@@ -184,36 +337,13 @@ def fetch_real_data(access_token, start_date, end_date, data_type):
 
         URL = f"{BASE_URL}{ENDPOINT}"
 
-        # We'll loop through each date between the start_date_obj and end_date_obj (inclusive)
-        current_date = start_date_obj
-        while current_date <= end_date_obj:
-            # For each date, we'll fetch the relevant data
-            params = {"date": current_date.strftime("%Y-%m-%d")}
-            response = requests.get(URL, params=params, headers=headers)
-
-            # If empty response, move to the next date
-            if response.status_code == 204:
-                current_date += timedelta(days=1)
-                continue
-
-            data = response.json()
-
-            # Check for successful response
-            if response.status_code != 200:
-                raise Exception(
-                    f"Request failed for date {current_date.strftime('%Y-%m-%d')} with status code {response.status_code}"
-                )
-
-            # Check if the data exists in the response
-            if data_type == "sleep_session" and "data" in data and data["data"]:
-                all_data[current_date.strftime("%Y-%m-%d")] = data["data"]
-            elif data_type == "sleep_detail" and data:
-                all_data[current_date.strftime("%Y-%m-%d")] = data
+        session = requests.Session()
+        session.headers.update(headers)
 
-            # Move to the next date
-            current_date += timedelta(days=1)
-
-        return all_data
+        try:
+            return fetch_by_date(session, URL, data_type, start_date, end_date)
+        finally:
+            session.close()
 
     else:
         raise ValueError(f"Invalid data_type: {data_type}")
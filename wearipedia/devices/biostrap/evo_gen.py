@@ -3,6 +3,90 @@ import random
 from datetime import datetime, timedelta
 
 import numpy as np
+from scipy.signal import lfilter
+
+# time zone offset of the synthetic biometrics, in minutes
+TZ_OFFSET = -420
+
+# seconds between consecutive biometric samples
+SAMPLE_SECONDS = 10
+
+
+def mean_reverting_walk(n, start, target, reversion, noise, low, high):
+    """Mean-reverting (Ornstein-Uhlenbeck-style) random walk of `n` steps.
+
+    Every step moves the value `reversion` of the way back to `target` and adds
+    normal noise with standard deviation `noise`. The recursion is linear, so the
+    whole walk is computed at once with `scipy.signal.lfilter`, and then clipped
+    to [low, high].
+
+    :param n: number of values
+    :type n: int
+    :param start: value before the first step
+    :type start: float
+    :param target: value the walk reverts to
+    :type target: float
+    :param reversion: fraction of the distance to `target` covered by every step
+    :type reversion: float
+    :param noise: standard deviation of the noise added by every step
+    :type noise: float
+    :param low: lower bound of the walk
+    :type low: float
+    :param high: upper bound of the walk
+    :type high: float
+    :return: the walk
+    :rtype: np.ndarray
+    """
+    decay = 1 - reversion
+    deviation, _ = lfilter(
+        [1],
+        [1, -decay],
+        np.random.normal(0, noise, n),
+        zi=[decay * (start - target)],
+    )
+    return np.clip(target + deviation, low, high)
+
+
+def is_night(timestamps):
+    """Whether timestamps fall within typical sleeping hours (23:00 to 06:00).
+
+    :param timestamps: seconds since 1970-01-01 00:00:00 in local time
+    :type timestamps: np.ndarray
+    :return: boolean mask
+    :rtype: np.ndarray
+    """
+    hour = timestamps // 3600 % 24
+    return (hour >= 23) | (hour < 6)
+
+
+def format_times(timestamps):
+    """Format timestamps as "YYYY-MM-DD HH:MM:SS" strings.
+
+    :param timestamps: seconds since 1970-01-01 00:00:00 in local time
+    :type timestamps: np.ndarray
+    :return: list of formatted timestamps
+    :rtype: List[str]
+    """
+    strings = np.datetime_as_string(timestamps.astype("datetime64[s]"), unit="s")
+    return np.char.replace(strings, "T", " ").tolist()
+
+
+def series_to_dict(series, tz_offset=None):
+    """Dictionary of a columnar series, keyed by its formatted timestamps.
+
+    :param series: dictionary with the int64 "timestamp" array and the "value" array
+    :type series: Dict[str: np.ndarray, str: np.ndarray]
+    :param tz_offset: if given, keys are (timestamp, tz_offset) tuples, like the
+        biometrics of the Biostrap API, defaults to None
+    :type tz_offset: int, optional
+    :return: dictionary from timestamp to value
+    :rtype: Dict
+    """
+    keys = format_times(series["timestamp"])
+    if tz_offset is not None:
+        keys = [(key, tz_offset) for key in keys]
+
+    return dict(zip(keys, series["value"].tolist()))
 
 
 def create_syn_data(start_date, end_date):
@@ -16,10 +100,10 @@ def create_syn_data(start_date, end_date):
 
     :return: A tuple consisting of:
         - activities: Dictionary containing details of a random synthetic activity
-        - bpm: Dictionary representing beats per minute for every 10 seconds throughout the range
-        - brpm: Dictionary representing breaths per minute based on bpm values for every minute throughout the range
-        - hrv: Dictionary representing heart rate variability for every 10 seconds throughout the range
-        - spo2: Dictionary representing blood oxygen saturation for every 10 seconds
+        - bpm: Columnar beats per minute for every 10 seconds throughout the range
+        - brpm: Columnar breaths per minute for every minute throughout the range
+        - hrv: Columnar heart rate variability for every 10 seconds throughout the range
+        - spo2: Columnar blood oxygen saturation for every 10 seconds
         - rest_cals: Dictionary representing resting calories burned each day
         - work_cals: Dictionary representing workout calories burned each day
         - active_cals: Dictionary representing active calories burned each day
@@ -27,8 +111,13 @@ def create_syn_data(start_date, end_date):
         - total_cals: Dictionary representing total calories burned each day
         - sleep_session: Dictionary representing moments of movement during typical sleeping hours
         - sleep_detail: Dictionary representing details of a synthetic sleep session
-        - steps: Dictionary representing steps taken every minute throughout the range
-        - distance: Dictionary representing distance covered (based on steps) every minute throughout the range
+        - steps: Columnar steps taken every minute throughout the range
+        - distance: Columnar distance covered (based on steps) every minute throughout the range
+
+        The columnar biometrics, steps and distance are dictionaries with an int64 "timestamp" array, in
+        seconds since 1970-01-01 00:00:00 local time (UTC offset TZ_OFFSET), and a
+        "value" array. :func:`series_to_dict` turns them into the dictionaries served
+        by the device.
 
     :rtype: Tuple[Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict, Dict]
     """
@@ -37,173 +126,82 @@ def create_syn_data(start_date, end_date):
     start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
     end_date_obj = datetime.strptime(end_date, "%Y-%m-%d")
 
-    TZ_OFFSET = -420
+    def synthetic_biometrics(start_date_obj, end_date_obj):
+        # every 10 seconds of the range, as seconds since the epoch in local time
+        num_days = (end_date_obj - start_date_obj).days + 1
+        timestamps = np.datetime64(start_date_obj, "s").astype(np.int64) + np.arange(
+            0, num_days * 86400, SAMPLE_SECONDS, dtype=np.int64
+        )
+        n = len(timestamps)
 
-    # Adjusted Gaussian noise functions for each biometric with more realistic standard deviations
-    def gaussian_noise_bpm():
-        return np.random.normal(0, 2)  # Reduced standard deviation for less noise
+        # initial values, target means and bounds of the random walks, with
+        # realistic standard deviations for the noise
+        bpm = mean_reverting_walk(n, 45, 70, 0.01, 2, 40, 120)
+        hrv = mean_reverting_walk(n, 40, 50, 0.1, 1, 20, 100)
+        spo2 = mean_reverting_walk(n, 98, 98, 0.1, 0.05, 95, 100)
 
-    def gaussian_noise_brpm():
-        return np.random.normal(0, 0.5)  # Reduced standard deviation for less noise
+        # brpm is only updated every minute
+        minutes = timestamps[:: 60 // SAMPLE_SECONDS]
+        brpm = mean_reverting_walk(len(minutes), 16, 16, 0.1, 0.5, 12, 20)
 
-    def gaussian_noise_hrv():
-        return np.random.normal(0, 1)  # Reduced standard deviation for less noise
+        return (
+            {"timestamp": timestamps, "value": bpm.astype(np.int64)},
+            {"timestamp": minutes, "value": brpm.astype(np.int64)},
+            {"timestamp": timestamps, "value": hrv.astype(np.int64)},
+            {"timestamp": timestamps, "value": spo2.astype(np.int64)},
+        )
 
-    def gaussian_noise_spo2():
-        return np.random.normal(0, 0.05)  # Reduced standard deviation for minimal noise
+    def synthetic_steps_distance_per_minute(bpm):
+        # steps are only counted every minute
+        minute = bpm["timestamp"] % 60 == 0
+        timestamps = bpm["timestamp"][minute]
+        bpm_values = bpm["value"][minute]
+        n = len(timestamps)
 
-    def synthetic_biometrics(start_date_obj, end_date_obj):
-        bpm = {}
-        brpm = {}
-        hrv = {}
-        spo2 = {}
-
-        curr_date_obj = start_date_obj
-        time_index = 0
-
-        # Initial values for random walk
-        bpm_current = 45
-        brpm_current = 16
-        hrv_current = 40
-        spo2_current = 98
-
-        # Target means and bounds
-        target_mean_bpm = 70
-        target_mean_brpm = 16
-        target_mean_hrv = 50
-        target_mean_spo2 = 98
-
-        bpm_lower_bound, bpm_upper_bound = 40, 120
-        brpm_lower_bound, brpm_upper_bound = 12, 20
-        hrv_lower_bound, hrv_upper_bound = 20, 100
-        spo2_lower_bound, spo2_upper_bound = 95, 100
-
-        # Store the last minute's average bpm to calculate brpm
-        last_minute_bpm = []
-
-        while curr_date_obj <= end_date_obj:
-            curr_time = curr_date_obj
-            while curr_time < curr_date_obj + timedelta(days=1):
-                key = (curr_time.strftime("%Y-%m-%d %H:%M:%S"), TZ_OFFSET)
-
-                # Update bpm, hrv, and spo2 every 10 seconds
-                bpm_mean_reversion = (
-                    target_mean_bpm - bpm_current
-                ) * 0.01  # Changed from 0.1
-                bpm_current += bpm_mean_reversion + gaussian_noise_bpm()
-                bpm_current = max(bpm_lower_bound, min(bpm_upper_bound, bpm_current))
-                bpm[key] = int(bpm_current)
-
-                hrv_mean_reversion = (target_mean_hrv - hrv_current) * 0.1
-                hrv_current += hrv_mean_reversion + gaussian_noise_hrv()
-                hrv_current = max(hrv_lower_bound, min(hrv_upper_bound, hrv_current))
-                hrv[key] = int(hrv_current)
-
-                spo2_mean_reversion = (target_mean_spo2 - spo2_current) * 0.1
-                spo2_current += spo2_mean_reversion + gaussian_noise_spo2()
-                spo2_current = max(
-                    spo2_lower_bound, min(spo2_upper_bound, spo2_current)
-                )
-                spo2[key] = int(spo2_current)
-
-                # Update brpm every minute
-                if time_index % 60 == 0:
-                    brpm_mean_reversion = (target_mean_brpm - brpm_current) * 0.1
-                    brpm_current += brpm_mean_reversion + gaussian_noise_brpm()
-                    brpm_current = max(
-                        brpm_lower_bound, min(brpm_upper_bound, brpm_current)
-                    )
-                    brpm[key] = int(brpm_current)
-
-                # Increment time and index
-                curr_time += timedelta(seconds=10)
-                time_index += 10
-
-            curr_date_obj += timedelta(days=1)
-
-        return bpm, brpm, hrv, spo2
-
-    def synthetic_steps_distance_per_minute(bpm_dict):
-        steps_dict = {}
-        distance_dict = {}
-
-        # For each minute, we'll check the BPM to determine steps
-        for key, bpm_value in bpm_dict.items():
-            dt, _ = key
-
-            # Extracting hour to check for sleeping hours
-            curr_hour = int(dt.split(" ")[1].split(":")[0])
-
-            if dt.endswith("00"):  # Checking if it's on a per-minute mark
-                if 23 <= curr_hour or curr_hour < 6:  # typical sleeping hours
-                    steps = random.choice(
-                        [0, 0, 0, 0, 1, 2]
-                    )  # Mostly zero, but sometimes a small number indicating tossing/turning in sleep
-                elif bpm_value < 60:
-                    steps = random.randint(0, 20)  # Relatively calm/resting
-                elif bpm_value < 80:
-                    steps = random.randint(20, 40)  # Maybe just light walking
-                else:
-                    steps = random.randint(40, 120)  # Active movement or jogging
-
-                distance = steps * random.uniform(0.7, 0.8)
-                date_str = dt.split()[0]
-                time_str = dt.split()[1]
-
-                steps_dict[f"{date_str} {time_str}"] = steps
-                distance_dict[f"{date_str} {time_str}"] = distance
-
-        return steps_dict, distance_dict
-
-    def synthetic_daily_calories(bpm_dict, steps_dict):
-        rest_cals_dict = {}
-        work_cals_dict = {}
-        active_cals_dict = {}
-        step_cals_dict = {}
-        total_cals_dict = {}
-
-        daily_bpm_averages = {}
-
-        # Precompute average BPM per day
-        for (dt, _), v in bpm_dict.items():
-            date_str = dt.split(" ")[0]
-            daily_bpm_averages.setdefault(date_str, []).append(v)
-
-        # Compute average BPM for each day
-        for date_str, bpm_vals in daily_bpm_averages.items():
-            avg_bpm = sum(bpm_vals) / len(bpm_vals)
-            daily_bpm_averages[date_str] = avg_bpm
-
-        # Calculate calories based on the precomputed average BPMs
-        for date_str, avg_bpm in daily_bpm_averages.items():
-            if avg_bpm < 60:
-                active_cals = random.randint(50, 100)  # relatively inactive
-            elif avg_bpm < 80:
-                active_cals = random.randint(100, 200)  # moderately active
-            else:
-                active_cals = random.randint(200, 300)  # very active
-
-            steps_val = sum(
-                [val for dt, val in steps_dict.items() if dt.startswith(date_str)]
-            )
-
-            rest_cals_dict[date_str] = random.randint(1000, 1300)
-            work_cals_dict[date_str] = random.randint(300, 600)
-            step_cals_dict[date_str] = steps_val * 0.05
-            active_cals_dict[date_str] = active_cals
-            total_cals_dict[date_str] = (
-                rest_cals_dict[date_str]
-                + work_cals_dict[date_str]
-                + step_cals_dict[date_str]
-                + active_cals_dict[date_str]
-            )
+        low = np.select([bpm_values < 60, bpm_values < 80], [0, 20], 40)
+        high = np.select([bpm_values < 60, bpm_values < 80], [20, 40], 120)
+        steps = np.random.randint(low, high + 1)
+
+        # mostly zero during typical sleeping hours, but sometimes a small number
+        # indicating tossing/turning in sleep
+        night = is_night(timestamps)
+        steps[night] = np.random.choice([0, 0, 0, 0, 1, 2], np.count_nonzero(night))
+
+        distance = steps * np.random.uniform(0.7, 0.8, n)
 
         return (
-            rest_cals_dict,
-            work_cals_dict,
-            active_cals_dict,
-            step_cals_dict,
-            total_cals_dict,
+            {"timestamp": timestamps, "value": steps},
+            {"timestamp": timestamps, "value": distance},
+        )
+
+    def synthetic_daily_calories(bpm, steps):
+        # group by the day of every sample
+        start_ts = np.datetime64(start_date_obj, "s").astype(np.int64)
+        num_days = (end_date_obj - start_date_obj).days + 1
+        bpm_day = (bpm["timestamp"] - start_ts) // 86400
+        steps_day = (steps["timestamp"] - start_ts) // 86400
+
+        avg_bpm = np.bincount(bpm_day, weights=bpm["value"], minlength=num_days)
+        avg_bpm /= np.maximum(np.bincount(bpm_day, minlength=num_days), 1)
+        steps_val = np.bincount(steps_day, weights=steps["value"], minlength=num_days)
+
+        # relatively inactive, moderately active or very active
+        low = np.select([avg_bpm < 60, avg_bpm < 80], [50, 100], 200)
+        high = np.select([avg_bpm < 60, avg_bpm < 80], [100, 200], 300)
+        active_cals = np.random.randint(low, high + 1)
+
+        rest_cals = np.random.randint(1000, 1301, num_days)
+        work_cals = np.random.randint(300, 601, num_days)
+        step_cals = steps_val * 0.05
+        total_cals = rest_cals + work_cals + step_cals + active_cals
+
+        dates = np.datetime_as_string(
+            np.datetime64(start_date_obj, "D") + np.arange(num_days), unit="D"
+        ).tolist()
+
+        return tuple(
+            dict(zip(dates, values.tolist()))
+            for values in (rest_cals, work_cals, active_cals, step_cals, total_cals)
         )
 
     def synthetic_activity():
@@ -224,17 +222,12 @@ def create_syn_data(start_date, end_date):
             "intensity": random.choice(["light", "moderate", "high"]),
         }
 
-    def synthetic_sleep_session(bpm_dict):
-        # Extracting nighttime bpm readings
-        night_movements = {
-            k: v
-            for k, v in bpm_dict.items()
-            if 23 <= int(k[0].split(" ")[1].split(":")[0])
-            or int(k[0].split(" ")[1].split(":")[0]) < 6
-        }
-        # Filter out readings where bpm indicates deep sleep (low bpm)
-        night_movements = {k: v for k, v in night_movements.items() if v > 65}
-        return night_movements
+    def synthetic_sleep_session(bpm):
+        # nighttime bpm readings, without the ones indicating deep sleep (low bpm)
+        movement = is_night(bpm["timestamp"]) & (bpm["value"] > 65)
+        return series_to_dict(
+            {key: values[movement] for key, values in bpm.items()}, TZ_OFFSET
+        )
 
     def synthetic_sleep_detail():
         sleep_date = (start_date_obj + (end_date_obj - start_date_obj) / 2).strftime(
@@ -164,6 +164,50 @@ class BaseDevice:
                     getattr(self, data_type), data_type, params
                 )
 
+    def get_many(self, data_types, params=None):
+        """Gets several data types at once, with the same params.
+
+        For real data, this calls _get_real_many(), which devices whose API can serve
+        several data types per request override to save round trips. Synthetic data
+        is filtered exactly as get_data() would.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_types: a list of strings describing the types of data to get.
+        :type data_types: List
+        :param params: dictionary containing parameters for API extraction, defaults to None
+        :type params: Dict, optional
+        :raises ValueError: if any of data_types is not in valid_data_types
+        :return: a dictionary mapping each data type to its data
+        :rtype: Dict
+        """
+        for data_type in data_types:
+            if not data_type in self.valid_data_types:
+                raise ValueError(f"data_type must be in {list(self.valid_data_types)}")
+
+        if params is None:
+            params = self._default_params()
+
+        if self.authenticated:
+            return self._get_real_many(list(data_types), params)
+
+        return {data_type: self.get_data(data_type, params) for data_type in data_types}
+
+    def _get_real_many(self, data_types, params):
+        """Gets real data for several data types. By default this simply calls
+        _get_real() once per data type.
+
+        :param data_types: a list of strings describing the types of data to get.
+        :type data_types: List
+        :param params: dictionary containing parameters for API extraction
+        :type params: Dict
+        :return: a dictionary mapping each data type to its data
+        :rtype: Dict
+        """
+        return {
+            data_type: self._get_real(data_type, params) for data_type in data_types
+        }
+
     def _authenticate(self, auth_creds):
         """Authenticates the device. This is called by the authenticate() method.
 
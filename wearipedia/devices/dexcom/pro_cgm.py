@@ -2,10 +2,9 @@ import http
 import json
 
 import numpy as np
-import pandas as pd
 
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .pro_cgm_fetch import dexcom_authenticate, fetch_data, refresh_access_token
 from .pro_cgm_gen import create_synth
 
@@ -16,6 +15,10 @@ class DexcomProCGM(BaseDevice):
 
     * `data`: contains all data in one dictionary
 
+    Real data is downloaded in windows of at most 90 days, and an expired access
+    token is refreshed automatically. Pass `"columnar": True` in the params to get
+    the EGVs as a DataFrame instead of a list of dictionaries.
+
     :param seed: random seed for synthetic data generation, defaults to 0
     :type seed: int, optional
     :param synthetic_start_date: start date for synthetic data generation, defaults to "2022-03-01"
@@ -60,19 +63,22 @@ class DexcomProCGM(BaseDevice):
             self.access_token,
             start_date=params["start_date"],
             end_date=params["end_date"],
+            refresh=self._refresh_access_token,
+            columnar=params.get("columnar", False),
         )
 
     def _filter_synthetic(self, data, data_type, params):
         # there is really only one data type for this device,
         # so we don't need to check the data_type
 
-        start_ts = pd.Timestamp(params["start_date"])
-        end_ts = pd.Timestamp(params["end_date"])
-
-        timestamps = [pd.Timestamp(x["systemTime"]) for x in self.data["egvs"]]
+        start_ts = np.datetime64(params["start_date"], "s").astype(np.int64)
+        end_ts = np.datetime64(params["end_date"], "s").astype(np.int64)
 
-        start_idx = bin_search(timestamps, start_ts)
-        end_idx = bin_search(timestamps, end_ts)
+        # the EGVs are ordered from newest to oldest, so the negated times
+        # are ascending: the first EGV before `end_ts`, and the first EGV
+        # before `start_ts`, bound the [start_ts, end_ts) window
+        start_idx = np.searchsorted(self.egv_index, -end_ts, side="right")
+        end_idx = np.searchsorted(self.egv_index, -start_ts, side="right")
 
         return {
             "unit": "mg/dL",
@@ -84,15 +90,28 @@ class DexcomProCGM(BaseDevice):
         # generate random data according to seed
         seed_everything(self.init_params["seed"])
 
-        self.data = create_synth(
+        self.data, times = create_synth(
             self.init_params["synthetic_start_date"],
             self.init_params["synthetic_end_date"],
         )
 
+        # negated EGV times in seconds, ascending since the EGVs are descending
+        self.egv_index = -times.astype("datetime64[s]").astype(np.int64)
+
+    def _refresh_access_token(self):
+        self.refresh_token, self.access_token = refresh_access_token(
+            self.refresh_token, self.client_id, self.client_secret
+        )
+
+        return self.access_token
+
     def _authenticate(self, auth_creds, use_cache=True):
         if use_cache and hasattr(self, "access_token"):
             return
 
+        self.client_id = auth_creds["client_id"]
+        self.client_secret = auth_creds["client_secret"]
+
         if "refresh_token" in auth_creds:
             self.refresh_token, self.access_token = refresh_access_token(
                 auth_creds["refresh_token"],
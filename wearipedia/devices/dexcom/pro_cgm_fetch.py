@@ -1,14 +1,25 @@
 import http
 import json
+import threading
 import time
 import urllib
-from datetime import datetime
 
+import numpy as np
 import pandas as pd
 import requests
 
+from ...utils import date_windows, fetch_concurrently
+
 __all__ = ["refresh_access_token", "dexcom_authenticate", "fetch_data"]
 
+EGVS_URL = "https://api.dexcom.com/v2/users/self/egvs"
+
+# longest time window the EGV endpoint accepts in a single request
+EGV_WINDOW_DAYS = 90
+
+# maximum number of windows requested at once
+MAX_WORKERS = 4
+
 
 def refresh_access_token(refresh_token, client_id, client_secret):
     # gives us access token given the refresh token
@@ -81,16 +92,7 @@ def dexcom_authenticate(your_client_id, your_client_secret):
     return refresh_token, access_token
 
 
-def fetch_data(access_token, start_date="2022-02-16", end_date="2022-05-15"):
-    start_date = start_date + "T15:30:00"
-    end_date = end_date + "T15:45:00"
-
-    headers = {"authorization": f"Bearer {access_token}"}
-
-    endpoint = f"https://api.dexcom.com/v2/users/self/egvs?startDate={start_date}&endDate={end_date}"
-
-    out = json.loads(requests.get(endpoint, headers=headers).text)
-
+def _check_egvs(out):
     if "errors" in out.keys():
         exception_str = (
             f'Got error(s) {out["errors"]}. Fix start and end dates and rerun.'
@@ -101,6 +103,116 @@ def fetch_data(access_token, start_date="2022-02-16", end_date="2022-05-15"):
             f'Got fault {out["fault"]}. You might need to request another access token.'
         )
         raise Exception(exception_str)
+
+    return out
+
+
+def egv_windows(start_date, end_date, window_days=EGV_WINDOW_DAYS):
+    """Split [start_date, end_date) into request windows of at most `window_days` days.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the (exclusive) end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param window_days: maximum number of days in a single window, defaults to EGV_WINDOW_DAYS
+    :type window_days: int, optional
+    :return: list of (startDate, endDate) pairs in the format "YYYY-MM-DDTHH:MM:SS"
+    :rtype: List[Tuple[str, str]]
+    """
+    last_day = np.datetime64(end_date, "D") - np.timedelta64(1, "D")
+
+    return [
+        (
+            f"{window_start}T00:00:00",
+            f"{np.datetime64(window_end, 'D') + np.timedelta64(1, 'D')}T00:00:00",
+        )
+        for window_start, window_end in date_windows(
+            start_date, str(last_day), window_days
+        )
+    ]
+
+
+def fetch_data(
+    access_token,
+    start_date="2022-02-16",
+    end_date="2022-05-15",
+    refresh=None,
+    columnar=False,
+    max_workers=MAX_WORKERS,
+):
+    """Fetch the EGVs of [start_date, end_date) from the Dexcom API.
+
+    The range is split into windows the API accepts, which are requested
+    concurrently on a single session. The EGVs of all windows are merged and
+    deduplicated by their system time.
+
+    :param access_token: Dexcom access token
+    :type access_token: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str, optional
+    :param end_date: the (exclusive) end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str, optional
+    :param refresh: function returning a new access token, called once when a
+        request is rejected with 401, defaults to None
+    :type refresh: Callable, optional
+    :param columnar: whether to return the EGVs as a DataFrame instead of a list
+        of dictionaries, defaults to False
+    :type columnar: bool, optional
+    :param max_workers: maximum number of windows requested at once, defaults to MAX_WORKERS
+    :type max_workers: int, optional
+    :return: dictionary with keys "unit", "rateUnit" and "egvs", the EGVs ordered
+        from newest to oldest
+    :rtype: Dict
+    """
+    token = {"access_token": access_token}
+    token_lock = threading.Lock()
+
+    session = requests.Session()
+
+    def get(access_token, window):
+        return session.get(
+            EGVS_URL,
+            params={"startDate": window[0], "endDate": window[1]},
+            headers={"authorization": f"Bearer {access_token}"},
+        )
+
+    def fetch_window(window):
+        used_token = token["access_token"]
+        r = get(used_token, window)
+
+        if r.status_code == http.HTTPStatus.UNAUTHORIZED and refresh is not None:
+            # only the first worker to see the expired token refreshes it
+            with token_lock:
+                if token["access_token"] == used_token:
+                    token["access_token"] = refresh()
+            r = get(token["access_token"], window)
+
+        return _check_egvs(json.loads(r.text))
+
+    try:
+        outs = fetch_concurrently(
+            fetch_window, egv_windows(start_date, end_date), max_workers
+        )
+    finally:
+        session.close()
+
+    records = [egv for out in outs for egv in out.get("egvs", [])]
+    egvs = pd.DataFrame(records)
+
+    if len(egvs) > 0:
+        egvs = egvs[~egvs["systemTime"].duplicated()]
+        egvs = egvs.sort_values("systemTime", ascending=False, kind="stable")
+
+    if columnar:
+        egvs = egvs.reset_index(drop=True)
+        for key in ["systemTime", "displayTime"]:
+            if key in egvs:
+                egvs[key] = pd.to_datetime(egvs[key], format="ISO8601")
     else:
+        egvs = [records[i] for i in egvs.index]
 
-        return out
+    return {
+        "unit": outs[0].get("unit", "mg/dL") if outs else "mg/dL",
+        "rateUnit": outs[0].get("rateUnit", "mg/dL/min") if outs else "mg/dL/min",
+        "egvs": egvs,
+    }
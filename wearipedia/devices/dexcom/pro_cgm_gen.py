@@ -1,16 +1,10 @@
-from datetime import datetime, timedelta
-
 import numpy as np
-import pandas as pd
 from scipy.ndimage import gaussian_filter
-from tqdm import tqdm
 
 __all__ = ["create_synth"]
 
 
-def lerp(x1, x2, t):
-    return t * x2 + (1 - t) * x1
-
+SAMPLE_MINUTES = 5
 
 base_keypoints = [100] * 4 + [120] * 4 + [130] * 8 + [120] * 4 + [100] * 4
 
@@ -18,71 +12,58 @@ base_keypoints = [100] * 4 + [120] * 4 + [130] * 8 + [120] * 4 + [100] * 4
 def create_synth(start_day_str, end_day_str):
     """Create a synthetic dataframe of CGM data.
 
+    Every day gets 24 hourly keypoints around `base_keypoints`, and the glucose
+    level is linearly interpolated between them every five minutes. All days are
+    interpolated at once with `np.interp` over a single hourly axis.
+
     :param start_day_str: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_day_str: str
     :param end_day_str: the end date represented as a string in the format "YYYY-MM-DD"
     :type end_day_str: str
-    :return: the synthetic dataframe
-    :rtype: pd.DataFrame
+    :return: the synthetic data, with the EGVs ordered from newest to oldest, and
+        the system times of the EGVs in the same order
+    :rtype: tuple(dict, np.ndarray)
     """
 
-    start_day = datetime.strptime(start_day_str, "%Y-%m-%d")
-    end_day = datetime.strptime(end_day_str, "%Y-%m-%d")
-
-    num_days = (end_day - start_day).days
-
-    datetimes = []
-    glucoses = []
-
-    for day_offset in tqdm(range(num_days)):
-        if day_offset != 0:
-            overlap = keypoints[-1]
-        keypoints = list(np.random.randn(24) * 10 + np.array(base_keypoints))
-        if day_offset != 0:
-            keypoints[0] = overlap
-
-        keypoints = keypoints + [keypoints[0]]
-
-        for minute_offset in range(0, 24 * 60, 5):
-            minute = (
-                start_day
-                + timedelta(days=day_offset)
-                + timedelta(minutes=minute_offset)
-            )
-
-            scaled_offset = minute_offset / 60
+    start_day = np.datetime64(start_day_str, "D")
+    num_days = max(int((np.datetime64(end_day_str, "D") - start_day).astype(int)), 0)
 
-            k1 = keypoints[np.floor(scaled_offset).astype("int")]
-            k2 = keypoints[np.ceil(scaled_offset).astype("int")]
+    if num_days == 0:
+        out = {"unit": "mg/dL", "rateUnit": "mg/dL/min", "egvs": []}
+        return out, np.array([], dtype="datetime64[m]")
 
-            value = lerp(k1, k2, scaled_offset % 1)
-            if value > 130:
-                scaling = 30
-            else:
-                scaling = 15
-            value += np.random.randn() * scaling
+    keypoints = np.random.randn(num_days, 24) * 10 + np.array(base_keypoints)
 
-            datetimes.append(minute)
-            glucoses.append(value)
+    # every day starts (and the previous day ends) at the first keypoint
+    keypoints[1:, 0] = keypoints[:1, 0]
+    keypoints = np.append(keypoints.ravel(), keypoints[:1, 0])
 
-    egvs = []
+    hours = np.arange(num_days * 24 * 60 // SAMPLE_MINUTES) * SAMPLE_MINUTES / 60
+    glucoses = np.interp(hours, np.arange(len(keypoints)), keypoints)
+    glucoses += np.random.randn(len(glucoses)) * np.where(glucoses > 130, 30, 15)
     glucoses = gaussian_filter(glucoses, 2, mode="constant")
 
-    for dt_obj, glucose in zip(datetimes[::-1], glucoses[::-1]):
-        egvs.append(
-            {
-                "systemTime": dt_obj.strftime("%Y-%m-%dT%H:%M:%S"),
-                # this is supposed to be timezone shift
-                "displayTime": dt_obj.strftime("%Y-%m-%dT%H:%M:%S"),
-                "value": glucose,
-                "realtimeValue": glucose,
-                "smoothedValue": None,
-                "status": None,
-                "trend": "flat",
-                "trendRate": np.round(np.random.normal(), 2),
-            }
-        )
+    times = start_day + np.arange(len(glucoses)) * np.timedelta64(SAMPLE_MINUTES, "m")
+    times = times[::-1]
+    time_strs = np.datetime_as_string(times, unit="s").tolist()
+    glucoses = glucoses[::-1].tolist()
+    trend_rates = np.round(np.random.normal(size=len(glucoses)), 2).tolist()
+
+    egvs = [
+        {
+            "systemTime": time_str,
+            # this is supposed to be timezone shift
+            "displayTime": time_str,
+            "value": glucose,
+            "realtimeValue": glucose,
+            "smoothedValue": None,
+            "status": None,
+            "trend": "flat",
+            "trendRate": trend_rate,
+        }
+        for time_str, glucose, trend_rate in zip(time_strs, glucoses, trend_rates)
+    ]
 
     out = {"unit": "mg/dL", "rateUnit": "mg/dL/min", "egvs": egvs}
 
-    return out
+    return out, times
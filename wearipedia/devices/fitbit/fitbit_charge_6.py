@@ -120,6 +120,7 @@ class FitbitCharge6(BaseDevice):
             self.user,
             start_date=params["start_date"],
             end_date=params["end_date"],
+            columnar=params.get("columnar", False),
         )
         return data
 
@@ -128,6 +128,7 @@ class FitbitSense(BaseDevice):
             self.user,
             start_date=params["start_date"],
             end_date=params["end_date"],
+            columnar=params.get("columnar", False),
         )
         return data
 
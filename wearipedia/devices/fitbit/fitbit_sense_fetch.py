@@ -1,13 +1,66 @@
-from datetime import datetime, timedelta
+import time
 
+import numpy as np
+import pandas as pd
 import requests
 
-__all__ = ["fetch_real_data"]
+from ...utils import RateLimiter, date_windows, fetch_concurrently, json_loads
 
+__all__ = ["fetch_real_data", "decode_intraday"]
 
-def call_API(url: str, access_token: str, call: str = "GET"):
+# Fitbit allows 150 requests per hour per user
+RATE_LIMIT_CALLS = 150
+RATE_LIMIT_PERIOD = 3600
+
+# shared by all fetches, so that separate calls stay within the same budget
+RATE_LIMITER = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+# intraday endpoints, along with the maximum number of days a single request may span
+INTRADAY_ENDPOINTS = {
+    "intraday_breath_rate": (
+        "https://api.fitbit.com/1/user/-/br/date/{}/{}/all.json",
+        30,
+    ),
+    "intraday_active_zone_minute": (
+        "https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{}/1d/1min.json",
+        1,
+    ),
+    "intraday_activity": (
+        "https://api.fitbit.com/1/user/-/activities/steps/date/{}/1d/1min.json",
+        1,
+    ),
+    "intraday_heart_rate": (
+        "https://api.fitbit.com/1/user/-/activities/heart/date/{}/1d/1sec.json",
+        1,
+    ),
+    "intraday_hrv": ("https://api.fitbit.com/1/user/-/hrv/date/{}/{}/all.json", 30),
+    "intraday_spo2": ("https://api.fitbit.com/1/user/-/spo2/date/{}/{}/all.json", 30),
+}
+
+
+def call_API(
+    url: str,
+    access_token: str,
+    call: str = "GET",
+    session=None,
+    rate_limiter=None,
+    max_retries=3,
+):
     headers = {"Authorization": "Bearer " + access_token}
-    response = requests.request(call, url=url, headers=headers)
+    requester = session if session is not None else requests
+
+    for _ in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        response = requester.request(call, url=url, headers=headers)
+        if response.status_code != 429:
+            break
+        # out of budget: wait until Fitbit resets the hourly window, then retry
+        reset = response.headers.get(
+            "Retry-After", response.headers.get("Fitbit-Rate-Limit-Reset", 60)
+        )
+        time.sleep(float(reset) + 1)
+
     # Handle specific HTTP status codes
     if response.status_code != 200:
         error_msg = f"{response.status_code}"
@@ -19,22 +72,297 @@ def call_API(url: str, access_token: str, call: str = "GET"):
             pass
 
         raise Exception("Request failed with error: " + error_msg)
-    return response.json()
+    return json_loads(response.content)
+
+
+def _intraday_entries(data_type, response):
+    """Locate the date and the list of samples inside a single-day intraday response.
+
+    :param data_type: the intraday data type the response belongs to
+    :type data_type: str
+    :param response: the parsed JSON response for a single day
+    :type response: Dict
+    :raises ValueError: if the data type is not an intraday time series
+    :return: the date as a string in the format "YYYY-MM-DD" (None if there are no
+        samples) and the list of samples
+    :rtype: Tuple[str, List]
+    """
+    if data_type in ("intraday_heart_rate", "intraday_activity"):
+        resource = "heart" if data_type == "intraday_heart_rate" else "steps"
+        days = response.get(f"activities-{resource}", [])
+        entries = response.get(f"activities-{resource}-intraday", {}).get("dataset", [])
+    elif data_type == "intraday_active_zone_minute":
+        days = response.get("activities-active-zone-minutes-intraday", [])
+        entries = days[0]["minutes"] if days else []
+    elif data_type == "intraday_hrv":
+        days = response.get("hrv", [])
+        entries = days[0]["minutes"] if days else []
+    elif data_type == "intraday_spo2":
+        days = [response] if "dateTime" in response else []
+        entries = response.get("minutes", [])
+    elif data_type == "intraday_breath_rate":
+        # a single breathing rate summary per day
+        days = response.get("br", [])
+        entries = days
+    else:
+        raise ValueError(f"{data_type} is not an intraday time series")
+
+    date = days[0]["dateTime"] if days else None
+    return date, entries
+
+
+def _clock_offsets(times):
+    """Convert "HH:MM:SS" strings into seconds since midnight, without parsing
+    each string in Python. Times in any other format are parsed by pandas.
+
+    :param times: list of "HH:MM:SS" strings
+    :type times: List[str]
+    :return: seconds since midnight
+    :rtype: np.ndarray
+    """
+    joined = "".join(times).encode()
+    if len(joined) == 8 * len(times):
+        digits = np.frombuffer(joined, dtype=np.uint8).reshape(-1, 8)
+        separators = (digits[:, 2] == ord(":")) & (digits[:, 5] == ord(":"))
+        digits = digits.astype(np.int64) - ord("0")
+        numbers = np.delete(digits, [2, 5], axis=1)
+        if separators.all() and ((numbers >= 0) & (numbers <= 9)).all():
+            return (
+                (digits[:, 0] * 10 + digits[:, 1]) * 3600
+                + (digits[:, 3] * 10 + digits[:, 4]) * 60
+                + digits[:, 6] * 10
+                + digits[:, 7]
+            )
+
+    # anything but zero-padded "HH:MM:SS"; raises ValueError if not a time at all
+    seconds = pd.to_timedelta(pd.Series(times)).dt.total_seconds()
+    return seconds.to_numpy().astype(np.int64)
 
 
-def fetch_real_data(data_type, access_token, start_date=None, end_date=None):
+def _breathing_rate(value):
+    # the summary's own rate, else the one of the full sleep, else NaN
+    rate = value.get("breathingRate")
+    if rate is None:
+        rate = value.get("fullSleepSummary", {}).get("breathingRate")
+    return np.nan if rate is None else rate
+
+
+def decode_intraday(data_type, response):
+    """Decode a single-day intraday response into columnar arrays.
+
+    Offsets are seconds relative to midnight of the response's date, so sleep-time
+    samples (HRV, SpO2) recorded the evening before come out negative. HRV is
+    decoded to its rmssd values. Breathing rate has a single sample per day, at
+    offset 0, with the breathing rate of the full sleep.
+
+    :param data_type: the intraday data type the response belongs to, one of
+        "intraday_heart_rate", "intraday_activity", "intraday_active_zone_minute",
+        "intraday_hrv", "intraday_spo2", "intraday_breath_rate"
+    :type data_type: str
+    :param response: the parsed JSON response for a single day
+    :type response: Dict
+    :return: int64 second-of-day offsets and the corresponding values
+    :rtype: Tuple[np.ndarray, np.ndarray]
+    """
+    date, entries = _intraday_entries(data_type, response)
+    n = len(entries)
+
+    if data_type in ("intraday_heart_rate", "intraday_activity"):
+        offsets = (
+            _clock_offsets([entry["time"] for entry in entries])
+            if n
+            else np.zeros(0, dtype=np.int64)
+        )
+        values = np.fromiter(
+            (entry["value"] for entry in entries), dtype=np.int32, count=n
+        )
+        return offsets, values
+
+    if data_type == "intraday_breath_rate":
+        values = np.fromiter(
+            (_breathing_rate(entry["value"]) for entry in entries),
+            dtype=np.float32,
+            count=n,
+        )
+        return np.zeros(n, dtype=np.int64), values
+
+    minutes = np.array(
+        [entry["minute"][:19] for entry in entries], dtype="datetime64[s]"
+    )
+    offsets = (
+        (minutes - np.datetime64(date, "s")).astype(np.int64)
+        if n
+        else np.zeros(0, dtype=np.int64)
+    )
+
+    if data_type == "intraday_active_zone_minute":
+        values = np.fromiter(
+            (entry["value"]["activeZoneMinutes"] for entry in entries),
+            dtype=np.int32,
+            count=n,
+        )
+    elif data_type == "intraday_hrv":
+        values = np.fromiter(
+            (entry["value"]["rmssd"] for entry in entries), dtype=np.float32, count=n
+        )
+    else:
+        values = np.fromiter(
+            (entry["value"] for entry in entries), dtype=np.float32, count=n
+        )
+
+    return offsets, values
+
+
+def _intraday_columns(data_type, response):
+    date, _ = _intraday_entries(data_type, response)
+    offsets, values = decode_intraday(data_type, response)
+    return date, offsets, values
+
+
+def _intraday_frame(columns):
+    """Concatenate per-day decoded columns into a single frame.
+
+    :param columns: list of (date, offsets, values) tuples in date order
+    :type columns: List[Tuple[str, np.ndarray, np.ndarray]]
+    :return: DataFrame with a `date`, `offset` (seconds) and `value` column
+    :rtype: pd.DataFrame
+    """
+    columns = [day for day in columns if day[0] is not None and len(day[1])]
+    if not columns:
+        return pd.DataFrame(
+            {
+                "date": np.zeros(0, dtype="datetime64[s]"),
+                "offset": np.zeros(0, dtype=np.int64),
+                "value": np.zeros(0),
+            }
+        )
+
+    dates = np.array([date for date, _, _ in columns], dtype="datetime64[s]")
+    counts = [len(offsets) for _, offsets, _ in columns]
+
+    return pd.DataFrame(
+        {
+            "date": np.repeat(dates, counts),
+            "offset": np.concatenate([offsets for _, offsets, _ in columns]),
+            "value": np.concatenate([values for _, _, values in columns]),
+        }
+    )
+
+
+def _split_by_day(data_type, response, start_date, end_date):
+    """Split a multi-day intraday response into one response per day, each shaped
+    like the response of the corresponding single-day request. Days without data
+    get an empty response.
+
+    :param data_type: the intraday data type the response belongs to
+    :type data_type: str
+    :param response: the parsed JSON response of a date range request
+    :type response: Dict or List
+    :param start_date: the first day of the request, in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the last day of the request, in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: list of single-day responses in date order, one per requested day
+    :rtype: List
+    """
+    dates = np.arange(
+        np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1
+    ).astype(str)
+
+    if data_type == "intraday_spo2":
+        # spo2 date ranges come back as a list of single-day objects
+        days = response if isinstance(response, list) else [response]
+        by_date = {day["dateTime"]: day for day in days if "dateTime" in day}
+        return [by_date.get(date, {}) for date in dates]
+
+    key = "br" if data_type == "intraday_breath_rate" else "hrv"
+    by_date = {entry["dateTime"]: entry for entry in response.get(key, [])}
+    return [
+        {key: [by_date[date]] if date in by_date else []} for date in dates.tolist()
+    ]
+
+
+def fetch_intraday(
+    data_type, access_token, start_date, end_date, max_workers=4, columnar=False
+):
+    """Fetch intraday data for every day between `start_date` and `end_date`.
+
+    Requests are issued concurrently on a bounded pool sharing a single session,
+    while staying within Fitbit's hourly request budget. Breathing rate, HRV and
+    SpO2 are requested in 30-day ranges, the finer-grained types one day at a time.
+
+    :param data_type: the intraday data type to fetch, e.g. "intraday_heart_rate"
+    :type data_type: str
+    :param access_token: access token for the API
+    :type access_token: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param max_workers: maximum number of requests in flight, defaults to 4
+    :type max_workers: int, optional
+    :param columnar: decode each response as it arrives and return a single frame
+        (see `decode_intraday`) instead of the raw responses, defaults to False
+    :type columnar: bool, optional
+    :return: list of single-day responses in date order, or a DataFrame with a
+        `date`, `offset` and `value` column if `columnar` is set
+    :rtype: List or pd.DataFrame
+    """
+    url, max_days = INTRADAY_ENDPOINTS[data_type]
+    windows = date_windows(start_date, end_date, max_days)
+
+    session = requests.Session()
+
+    def fetch_window(window):
+        window_url = url.format(*window[: url.count("{}")])
+        response = call_API(
+            url=window_url,
+            access_token=access_token,
+            session=session,
+            rate_limiter=RATE_LIMITER,
+        )
+        days = (
+            [response] if max_days == 1 else _split_by_day(data_type, response, *window)
+        )
+        if columnar:
+            # decode right away so the parsed JSON of each day can be released
+            return [_intraday_columns(data_type, day) for day in days]
+        return days
+
+    try:
+        results = fetch_concurrently(fetch_window, windows, max_workers=max_workers)
+    finally:
+        session.close()
+
+    arr = [day for days in results for day in days]
+    return _intraday_frame(arr) if columnar else arr
+
+
+def fetch_real_data(
+    data_type,
+    access_token,
+    start_date=None,
+    end_date=None,
+    max_workers=4,
+    columnar=False,
+):
     """Main function for fetching real data from the Fitbit API.
 
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
     :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
     :type end_date: str
-    :param data_type: the type of data to fetch, one of "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day", "breath_rate"
+    :param data_type: the type of data to fetch, one of "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day" or one of the "intraday_*" types
     :type data_type: str
     :param access_token: access token for the API
     :type api: str
+    :param max_workers: maximum number of concurrent requests for intraday data types, defaults to 4
+    :type max_workers: int, optional
+    :param columnar: return intraday time series as a single DataFrame with a `date`,
+        `offset` and `value` column instead of a list of responses, defaults to False
+    :type columnar: bool, optional
     :return: the data fetched from the API according to the inputs
-    :rtype: List
+    :rtype: List or pd.DataFrame
     """
     categories = {
         "sleep": {
@@ -69,43 +397,16 @@ def fetch_real_data(data_type, access_token, start_date=None, end_date=None):
         },
     }
 
-    arr = []
-
     if "intraday" in data_type:
-        current_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
-
-        # Iterate through dates until end date is reached
-        while current_date <= end:
-            current_date
-            current_date += timedelta(days=1)
-            current_date_str = current_date.strftime("%Y-%m-%d")
-            intraday_categories = {
-                "intraday_breath_rate": {
-                    "url": f"https://api.fitbit.com/1/user/-/br/date/{current_date_str}/all.json"
-                },
-                "intraday_active_zone_minute": {
-                    "url": f"https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{current_date_str}/1d/1min.json"
-                },
-                "intraday_activity": {
-                    "url": f"https://api.fitbit.com/1/user/-/activities/steps/date/{current_date_str}/1d/1min.json"
-                },
-                "intraday_heart_rate": {
-                    "url": f"https://api.fitbit.com/1/user/-/activities/heart/date/{current_date_str}/1d/1sec.json"
-                },
-                "intraday_hrv": {
-                    "url": f"https://api.fitbit.com/1/user/-/hrv/date/{current_date_str}/all.json"
-                },
-                "intraday_spo2": {
-                    "url": f"https://api.fitbit.com/1/user/-/spo2/date/{current_date_str}/all.json"
-                },
-            }
-            response = call_API(
-                url=intraday_categories[data_type]["url"], access_token=access_token
-            )
-            arr.append(response)
-    else:
-        response = call_API(url=categories[data_type]["url"], access_token=access_token)
-    arr.append(response)
+        return fetch_intraday(
+            data_type,
+            access_token,
+            start_date,
+            end_date,
+            max_workers=max_workers,
+            columnar=columnar,
+        )
+
+    response = call_API(url=categories[data_type]["url"], access_token=access_token)
 
-    return arr
+    return [response]
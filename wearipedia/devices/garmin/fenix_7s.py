@@ -1,10 +1,18 @@
+import json
 import os
-import pickle
 import tempfile
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
 from garminconnect import Garmin
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 from ...devices.device import BaseDevice
 from ...utils import seed_everything
 from .fenix_fetch import fetch_real_data
@@ -22,9 +30,121 @@ def user_identifier():
 
 
 CRED_CACHE_PATH = os.path.join(
-    tempfile.gettempdir(), f"wearipedia_fenix_data_{user_identifier()}.pkl"
+    tempfile.gettempdir(), f"wearipedia_fenix_tokens_{user_identifier()}.json"
 )
 
+# garth's OAuth1 tokens, which are used to mint fresh OAuth2 tokens, are valid
+# for about a year, so we log in again a little before that
+TOKEN_MAX_AGE = 360 * 24 * 60 * 60
+
+
+@contextmanager
+def token_store_lock(path):
+    """Hold an exclusive lock on the token store at `path`, so that several
+    processes sharing the store log in only once between them.
+
+    :param path: path to the token store
+    :type path: str
+    """
+    with open(
+        os.open(path + ".lock", flags=os.O_CREAT | os.O_RDWR, mode=0o600), "r+"
+    ) as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def load_tokens(path, max_age=TOKEN_MAX_AGE):
+    """Load the token store at `path`.
+
+    :param path: path to the token store
+    :type path: str
+    :param max_age: maximum age of the tokens in seconds, defaults to TOKEN_MAX_AGE
+    :type max_age: int, optional
+    :return: dictionary with the tokens as dumped by garth under "tokens" and the
+        time of the login that produced them under "saved_at", or None if the store
+        is missing, unreadable or expired
+    :rtype: Dict or None
+    """
+    try:
+        with open(path) as f:
+            store = json.load(f)
+        if time.time() - store["saved_at"] > max_age or not store["tokens"]:
+            return None
+        return store
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_tokens(path, tokens, saved_at):
+    """Atomically write serialized Garmin tokens to the token store at `path`,
+    readable only by the current user.
+
+    :param path: path to the token store
+    :type path: str
+    :param tokens: the tokens as dumped by garth
+    :type tokens: str
+    :param saved_at: time of the login that produced the tokens, in seconds since
+        the epoch
+    :type saved_at: float
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(
+        os.open(tmp_path, flags=os.O_CREAT | os.O_TRUNC | os.O_WRONLY, mode=0o600),
+        "w",
+    ) as f:
+        json.dump({"saved_at": saved_at, "tokens": tokens}, f)
+    os.replace(tmp_path, path)
+
+
+def session_client(api):
+    """The client holding the OAuth session of a `Garmin` API object.
+
+    Older garminconnect versions expose garth's client as `api.garth`, newer
+    ones have their own `api.client`; both can `dumps()` and `loads()` tokens.
+    """
+    return getattr(api, "garth", None) or api.client
+
+
+def login_with_tokens(api, tokens):
+    """Log in with cached tokens, noting whether they were actually used.
+
+    `Garmin.login` silently falls back to logging in with the credentials when the
+    tokens cannot be loaded or refreshed, so the client's credential login is
+    wrapped to find out.
+
+    :param api: the API object to log in
+    :type api: Garmin
+    :param tokens: the tokens as dumped by garth
+    :type tokens: str
+    :return: whether the credentials had to be used instead of the tokens
+    :rtype: bool
+    """
+    client = session_client(api)
+    credential_login = client.login
+    used_credentials = []
+
+    def login(*args, **kwargs):
+        used_credentials.append(True)
+        return credential_login(*args, **kwargs)
+
+    client.login = login
+    try:
+        api.login(tokenstore=tokens)
+    finally:
+        del client.login
+
+    return bool(used_credentials)
+
 
 class Fenix7S(BaseDevice):
     """This device allows you to work with data from the `Garmin Fenix 7S <https://www.garmin.com/en-US/p/735542>`_ device.
@@ -145,25 +265,32 @@ class Fenix7S(BaseDevice):
         self.spo2 = synth_data["spo2"]
 
     def _authenticate(self, auth_creds):
-        # check if we have cached credentials
-        if self.init_params["use_cache"] and os.path.exists(CRED_CACHE_PATH):
-            try:
-                self.api = pickle.load(open(CRED_CACHE_PATH, "rb"))
-                return
-            except:
-                print("Could not load cached credentials. Re-authenticating...")
-                pass
-
         self.api = Garmin(auth_creds["email"], auth_creds["password"])
-        self.api.login()
-
-        if self.init_params["use_cache"]:
-            with open(
-                os.open(
-                    CRED_CACHE_PATH,
-                    flags=os.O_CREAT | os.O_TRUNC | os.O_WRONLY,
-                    mode=0o600,
-                ),
-                mode="wb",
-            ) as cred_cache_file:
-                pickle.dump(self.api, cred_cache_file)
+
+        if not self.init_params["use_cache"]:
+            self.api.login()
+            return
+
+        # only the OAuth tokens are cached, and the store is locked while we
+        # log in, so parallel workers wait for one login instead of each
+        # going through Garmin's rate-limited SSO
+        with token_store_lock(CRED_CACHE_PATH):
+            store = load_tokens(CRED_CACHE_PATH)
+            if store is not None:
+                try:
+                    if login_with_tokens(self.api, store["tokens"]):
+                        # fresh tokens from a credential login
+                        store = {"saved_at": time.time(), "tokens": None}
+                except Exception:
+                    print("Could not load cached credentials. Re-authenticating...")
+                    self.api = Garmin(auth_creds["email"], auth_creds["password"])
+                    store = None
+
+            if store is None:
+                self.api.login()
+                store = {"saved_at": time.time(), "tokens": None}
+
+            # the OAuth2 token may have been refreshed while logging in
+            tokens = session_client(self.api).dumps()
+            if tokens != store["tokens"]:
+                save_tokens(CRED_CACHE_PATH, tokens, store["saved_at"])
@@ -1,11 +1,21 @@
-import os
+import random
+import time
 from datetime import datetime, timedelta
-from threading import Lock, Thread
+from threading import Lock
 
+from garminconnect import GarminConnectTooManyRequestsError
 from tqdm import tqdm
 
+from ...utils import fetch_concurrently
+
 __all__ = ["fetch_real_data"]
 
+# Garmin Connect rate-limits aggressively and does not document its budget,
+# so keep only a few requests in flight and back off when it pushes back
+MAX_WORKERS = 4
+MAX_RETRIES = 5
+BACKOFF_BASE = 2.0
+
 
 def fetch_garmin_url(data_type):
     """Fetches the Garmin Connect API endpoint URL corresponding to a given data type.
@@ -40,26 +50,74 @@ def fetch_garmin_url(data_type):
         return None
 
 
+def call_with_backoff(func, *args, **kwargs):
+    """Call `func`, retrying with exponential backoff (plus jitter) while Garmin
+    responds with "too many requests".
+
+    :param func: the function to call, e.g. `api.connectapi`
+    :type func: Callable
+    :return: whatever `func` returns
+    :rtype: Any
+    """
+    for attempt in range(MAX_RETRIES):
+        try:
+            return func(*args, **kwargs)
+        except GarminConnectTooManyRequestsError:
+            if attempt == MAX_RETRIES - 1:
+                raise
+            time.sleep(BACKOFF_BASE * 2**attempt + random.uniform(0, 1))
+
+
+def fetch_days(fetch_day, start_date, num_days, max_workers=MAX_WORKERS):
+    """Fetch one response per day on a bounded thread pool.
+
+    :param fetch_day: function taking a `datetime.date` and returning that day's response
+    :type fetch_day: Callable
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param num_days: the number of days to fetch
+    :type num_days: int
+    :param max_workers: maximum number of requests in flight, defaults to MAX_WORKERS
+    :type max_workers: int, optional
+    :return: the responses, in date order
+    :rtype: List
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    dates = [(start + timedelta(days=i)).date() for i in range(num_days)]
+
+    pbar = tqdm(total=num_days)
+    pbar_lock = Lock()
+
+    def fetch(date):
+        response = fetch_day(date)
+        with pbar_lock:
+            pbar.update(1)
+        return response
+
+    try:
+        return fetch_concurrently(fetch, dates, max_workers=max_workers)
+    finally:
+        pbar.close()
+
+
 # Steps, HR
 def fetch_steps_and_hr(api, data_type, start_date, num_days, params=None):
     display_name = api.display_name
     url = f"{fetch_garmin_url(data_type)}/{display_name}"
-    response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        params = {"date": str(new_date.date())}
-        response.append(api.connectapi(url, params=params))
-    return response
+
+    def fetch_day(date):
+        return call_with_backoff(api.connectapi, url, params={"date": str(date)})
+
+    return fetch_days(fetch_day, start_date, num_days)
 
 
 # Floors, Stress, Respiration, Spo2, Hydration, HRV, Training Status, Training Readiness, Activities for Date Aggregated, Day Stress Aggregated
 def fetch_aggregated_data(api, data_type, start_date, num_days, params=None):
-    response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        url = f"{fetch_garmin_url(data_type)}/{new_date.date()}"
-        response.append(api.connectapi(url))
-    return response
+    def fetch_day(date):
+        url = f"{fetch_garmin_url(data_type)}/{date}"
+        return call_with_backoff(api.connectapi, url)
+
+    return fetch_days(fetch_day, start_date, num_days)
 
 
 # Blood Pressure, Weigh Ins
@@ -68,7 +126,7 @@ def fetch_blood_pressure_and_weigh_ins(
 ):
     url = f"{fetch_garmin_url(data_type)}/{start_date}/{end_date}"
     params = {"includeAll": True}
-    return api.connectapi(url, params=params)
+    return call_with_backoff(api.connectapi, url, params=params)
 
 
 # RHR
@@ -76,36 +134,54 @@ def fetch_resting_heart_rate(api, data_type, start_date, end_date, params=None):
     display_name = api.display_name
     url = f"{fetch_garmin_url(data_type)}/{display_name}"
     params = {"fromDate": str(start_date), "untilDate": str(end_date), "metricId": 60}
-    return api.connectapi(url, params=params)
+    return call_with_backoff(api.connectapi, url, params=params)
 
 
 # Sleep
 def fetch_sleep(api, data_type, start_date, num_days, params=None):
     display_name = api.display_name
-    response = []
     url = f"{fetch_garmin_url(data_type)}/{display_name}"
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        params = {"date": str(new_date.date()), "nonSleepBufferMinutes": 60}
-        response.append(api.connectapi(url, params=params))
-    return response
+
+    def fetch_day(date):
+        params = {"date": str(date), "nonSleepBufferMinutes": 60}
+        return call_with_backoff(api.connectapi, url, params=params)
+
+    return fetch_days(fetch_day, start_date, num_days)
 
 
 # Body Composition Aggregated, Body Battery
 def fetch_body_comp_agg_and_battery(api, data_type, start_date, num_days, params=None):
-    response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        url = f"{fetch_garmin_url(data_type)}"
-        params = {"startDate": str(new_date), "endDate": str(new_date)}
-        response.append(api.connectapi(url, params=params))
-    return response
+    """Body battery reports accept a date range, so the whole range is fetched in
+    a handful of requests and then regrouped into one list of reports per day,
+    exactly as if each day had been requested on its own.
+    """
+    url = f"{fetch_garmin_url(data_type)}"
+    start = datetime.strptime(start_date, "%Y-%m-%d").date()
+    dates = [start + timedelta(days=i) for i in range(num_days)]
+
+    # keep each range request reasonably small
+    windows = [dates[i : i + 28] for i in range(0, len(dates), 28)]
+
+    def fetch_window(window):
+        params = {"startDate": str(window[0]), "endDate": str(window[-1])}
+        return call_with_backoff(api.connectapi, url, params=params) or []
+
+    reports = {}
+    for window_reports in fetch_concurrently(
+        fetch_window, windows, max_workers=MAX_WORKERS
+    ):
+        for report in window_reports:
+            reports.setdefault(report.get("date"), []).append(report)
+
+    return [reports.get(str(date), []) for date in dates]
 
 
 def fetch_real_data(start_date, end_date, data_type, api):
     """Main function for fetching real data from the Garmin Connect API.
     We parallelize this since making requests to the API is day-by-day,
-    and API requests are I/O bound.
+    and API requests are I/O bound. Requests are issued on a small thread pool
+    and retried with exponential backoff when Garmin rate-limits us; results are
+    always returned in date order.
 
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
@@ -123,7 +199,6 @@ def fetch_real_data(start_date, end_date, data_type, api):
         datetime.strptime(end_date, "%Y-%m-%d")
         - datetime.strptime(start_date, "%Y-%m-%d")
     ).days
-    display_name = api.display_name
 
     if data_type in ["steps", "hr"]:
         return fetch_steps_and_hr(api, data_type, start_date, num_days)
@@ -1,3 +1,4 @@
+import gc
 from datetime import datetime, timedelta
 
 from .fenix_gen_1 import (
@@ -39,6 +40,18 @@ def create_syn_data(start_date, end_date):
         - datetime.strptime(start_date, "%Y-%m-%d")
     ).days
 
+    # the records are millions of small acyclic lists and dicts, which the cyclic
+    # garbage collector would otherwise rescan over and over while they are built
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _create_records(start_date, end_date, num_days)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _create_records(start_date, end_date, num_days):
     synth_data = {
         "dates": [
             datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
@@ -1,9 +1,66 @@
-import random
 from datetime import datetime, timedelta
 
 import numpy as np
 
 
+def gmt_strings(start, count, step_minutes):
+    """Format consecutive timestamps as Garmin GMT strings ("%Y-%m-%dT%H:%M:%S.0").
+
+    :param start: the first timestamp, e.g. "2022-03-01T06:00"
+    :type start: str
+    :param count: the number of timestamps
+    :type count: int
+    :param step_minutes: the number of minutes between consecutive timestamps
+    :type step_minutes: int
+    :return: array of formatted timestamps
+    :rtype: np.ndarray
+    """
+    times = np.datetime64(start, "m") + np.arange(count) * np.timedelta64(
+        step_minutes, "m"
+    )
+    return np.char.add(np.datetime_as_string(times, unit="s"), ".0")
+
+
+def local_millis(start_date, num_days, offsets_minutes):
+    """Millisecond timestamps for every (day, offset) pair, with days interpreted in
+    local time, like `datetime.timestamp()` does for naive datetimes.
+
+    :param start_date: the first day in "YYYY-MM-DD" format
+    :type start_date: str
+    :param num_days: the number of days
+    :type num_days: int
+    :param offsets_minutes: offsets from midnight, in minutes
+    :type offsets_minutes: np.ndarray
+    :return: array of shape (num_days, len(offsets_minutes))
+    :rtype: np.ndarray
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    day_millis = np.array(
+        [int((start + timedelta(days=d)).timestamp() * 1000) for d in range(num_days)],
+        dtype=np.int64,
+    ).reshape(-1, 1)
+    return day_millis + np.asarray(offsets_minutes, dtype=np.int64) * 60000
+
+
+def calendar_dates(start_date, num_days):
+    """Dates of the range as "YYYY-MM-DD" strings.
+
+    :param start_date: the first day in "YYYY-MM-DD" format
+    :type start_date: str
+    :param num_days: the number of days
+    :type num_days: int
+    :return: list of date strings
+    :rtype: List[str]
+    """
+    days = np.datetime64(start_date, "D") + np.arange(num_days)
+    return np.datetime_as_string(days, unit="D").tolist()
+
+
+def randints(low, high, size):
+    """Random integers between `low` and `high`, both inclusive like `random.randint`."""
+    return np.random.randint(low, np.asarray(high) + 1, size=size)
+
+
 def get_hrv_data(start_date, num_days):
     """
     Generate synthetic Heart Rate Variability (HRV) data for a specified date range.
@@ -21,49 +78,46 @@ def get_hrv_data(start_date, num_days):
     :rtype: List[Dict]
     """
 
-    hrv_data = []
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-
-    for i in range(num_days):
-        date = start_date_obj + timedelta(days=i)
-        date_str = date.strftime("%Y-%m-%d")
-        start_timestamp_gmt = f"{date_str}T06:00:00.0"
-        end_timestamp_gmt = (
-            f"{date_str}T13:{random.randint(0, 59):02d}:{random.randint(0, 59):02d}.0"
-        )
-        start_timestamp_local = f"{(datetime.strptime(start_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')}T23:00:00.0"
-        end_timestamp_local = (
-            f"{date_str}T06:{random.randint(0, 59):02d}:{random.randint(0, 59):02d}.0"
-        )
-
-        last_night_avg = random.randint(15, 30)
-        last_night_5min_high = random.randint(30, 60)
-        baseline = {
-            "lowUpper": random.randint(15, 20),
-            "balancedLow": random.randint(20, 25),
-            "balancedUpper": random.randint(25, 35),
-            "markerValue": round(random.uniform(0.3, 0.6), 8),
-        }
-        status = random.choice(["BALANCED", "ELEVATED", "LOW"])
-        feedback_phrase = f"HRV_{status}_RANDOM"
+    dates = calendar_dates(start_date, num_days)
+    previous_dates = calendar_dates(
+        str(np.datetime64(start_date) - np.timedelta64(1, "D")), num_days
+    )
+
+    end_gmt = np.random.randint(0, 60, size=(num_days, 2)).tolist()
+    end_local = np.random.randint(0, 60, size=(num_days, 2)).tolist()
+    last_night_avg = randints(15, 30, num_days).tolist()
+    last_night_5min_high = randints(30, 60, num_days).tolist()
+    low_upper = randints(15, 20, num_days).tolist()
+    balanced_low = randints(20, 25, num_days).tolist()
+    balanced_upper = randints(25, 35, num_days).tolist()
+    marker_value = np.round(np.random.uniform(0.3, 0.6, num_days), 8).tolist()
+    status = np.random.choice(["BALANCED", "ELEVATED", "LOW"], num_days).tolist()
+    user_profile_pk = randints(10000000, 99999999, num_days).tolist()
 
+    hrv_data = []
+    for i, date_str in enumerate(dates):
         hrv_entry = {
-            "userProfilePk": random.randint(10000000, 99999999),
+            "userProfilePk": user_profile_pk[i],
             "hrvSummary": {
                 "calendarDate": date_str,
                 "weeklyAvg": None,
-                "lastNightAvg": last_night_avg,
-                "lastNight5MinHigh": last_night_5min_high,
-                "baseline": baseline,
-                "status": status,
-                "feedbackPhrase": feedback_phrase,
-                "createTimeStamp": date.strftime("%Y-%m-%dT%H:%M:%S.000"),
+                "lastNightAvg": last_night_avg[i],
+                "lastNight5MinHigh": last_night_5min_high[i],
+                "baseline": {
+                    "lowUpper": low_upper[i],
+                    "balancedLow": balanced_low[i],
+                    "balancedUpper": balanced_upper[i],
+                    "markerValue": marker_value[i],
+                },
+                "status": status[i],
+                "feedbackPhrase": f"HRV_{status[i]}_RANDOM",
+                "createTimeStamp": f"{date_str}T00:00:00.000",
             },
             "hrvReadings": [],
-            "startTimestampGMT": start_timestamp_gmt,
-            "endTimestampGMT": end_timestamp_gmt,
-            "startTimestampLocal": start_timestamp_local,
-            "endTimestampLocal": end_timestamp_local,
+            "startTimestampGMT": f"{date_str}T06:00:00.0",
+            "endTimestampGMT": f"{date_str}T13:{end_gmt[i][0]:02d}:{end_gmt[i][1]:02d}.0",
+            "startTimestampLocal": f"{previous_dates[i]}T23:00:00.0",
+            "endTimestampLocal": f"{date_str}T06:{end_local[i][0]:02d}:{end_local[i][1]:02d}.0",
             "sleepStartTimestampGMT": None,
             "sleepEndTimestampGMT": None,
             "sleepStartTimestampLocal": None,
@@ -91,35 +145,38 @@ def get_steps_data(start_date, num_days):
         activity level, and a constant activity level indicator.
     :rtype: List[List[Dict]]
     """
-    steps_data = []
-
-    for _ in range(num_days):
-        calendar_date = (
-            datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=_)
-        ).strftime("%Y-%m-%d")
-        start_timestamp_gmt = f"{calendar_date}T06:00:00.0"
-
-        steps_day = []
-        for i in range(96):  # 24 hours * 60 minutes / 15 minutes
-            interval_start = datetime.strptime(
-                start_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0"
-            ) + timedelta(minutes=15 * i)
-            interval_end = interval_start + timedelta(minutes=15)
-            steps = int(np.random.normal(90, 30))
-            steps_entry = {
-                "startGMT": interval_start.strftime("%Y-%m-%dT%H:%M:%S.0"),
-                "endGMT": interval_end.strftime("%Y-%m-%dT%H:%M:%S.0"),
-                "steps": max(steps, 0),
-                "pushes": 0,
-                "primaryActivityLevel": random.choice(
-                    ["active", "sedentary", "sleeping", "none"]
-                ),
-                "activityLevelConstant": random.choice([True, False]),
-            }
-            steps_day.append(steps_entry)
-        steps_data.append(steps_day)
+    intervals = 96  # 24 hours * 60 minutes / 15 minutes
+
+    # each day starts at 06:00 GMT, so the intervals of consecutive days are contiguous
+    boundaries = gmt_strings(f"{start_date}T06:00", num_days * intervals + 1, 15)
+    start_gmt = boundaries[:-1].tolist()
+    end_gmt = boundaries[1:].tolist()
+
+    steps = np.maximum(np.random.normal(90, 30, num_days * intervals).astype(int), 0)
+    steps = steps.tolist()
+    activity_level = np.random.choice(
+        ["active", "sedentary", "sleeping", "none"], num_days * intervals
+    ).tolist()
+    level_constant = np.random.choice([True, False], num_days * intervals).tolist()
+
+    intervals_data = [
+        {
+            "startGMT": start,
+            "endGMT": end,
+            "steps": step,
+            "pushes": 0,
+            "primaryActivityLevel": level,
+            "activityLevelConstant": constant,
+        }
+        for start, end, step, level, constant in zip(
+            start_gmt, end_gmt, steps, activity_level, level_constant
+        )
+    ]
 
-    return steps_data
+    return [
+        intervals_data[day * intervals : (day + 1) * intervals]
+        for day in range(num_days)
+    ]
 
 
 def get_heart_rate_data(start_date, num_days, steps_data):
@@ -127,6 +184,7 @@ def get_heart_rate_data(start_date, num_days, steps_data):
 
     This function generates synthetic heart rate data for a given date range, including various heart rate metrics
     such as resting heart rate, maximum heart rate, minimum heart rate, and additional descriptors and values.
+    Hourly heart rate values are driven by the steps of the first interval of each day.
 
     :param start_date: The start date in the format "YYYY-MM-DD".
     :type start_date: str
@@ -136,74 +194,47 @@ def get_heart_rate_data(start_date, num_days, steps_data):
         maximum and minimum heart rate, and additional heart rate descriptors and values.
     :rtype: List[Dict]
     """
-    heart_rate_data = []
-
-    for _ in range(num_days):
-        calendar_date = (
-            datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=_)
-        ).strftime("%Y-%m-%d")
-        start_timestamp_gmt = f"{calendar_date}T07:00:00.0"
-        end_timestamp_gmt = (
-            datetime.strptime(start_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-            + timedelta(days=1)
-        ).strftime("%Y-%m-%dT%H:%M:%S.0")
-        start_timestamp_local = f"{calendar_date}T00:00:00.0"
-        end_timestamp_local = (
-            datetime.strptime(start_timestamp_local, "%Y-%m-%dT%H:%M:%S.0")
-            + timedelta(days=1)
-        ).strftime("%Y-%m-%dT%H:%M:%S.0")
-        resting_heart_rate = random.randint(50, 90)
-        max_heart_rate = random.randint(resting_heart_rate + 5, 120)
-        min_heart_rate = random.randint(resting_heart_rate + 2, max_heart_rate - 1)
-
-        last_seven_days_avg = random.randint(
-            resting_heart_rate - 2, resting_heart_rate + 2
-        )
-
-        heart_rate_values = []
-        start_datetime = datetime.strptime(start_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-        end_datetime = datetime.strptime(end_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-        while start_datetime < end_datetime:
-            steps_arrdict_day = steps_data[_]
-            step_timestamps = np.array(
-                [
-                    datetime.strptime(x["startGMT"], "%Y-%m-%dT%H:%M:%S.0").timestamp()
-                    for x in steps_arrdict_day
-                ]
-            )
-            step_idx = np.where(
-                np.logical_and(
-                    datetime.strptime(calendar_date, "%Y-%m-%d").timestamp()
-                    + 6 * 60 * 60
-                    >= step_timestamps,
-                    datetime.strptime(calendar_date, "%Y-%m-%d").timestamp()
-                    <= step_timestamps + 15 * 60,
-                )
-            )[0][0]
-            step_val_avg = steps_arrdict_day[step_idx]["steps"]
-            heart_rate = int(step_val_avg * 0.5 + 75 + np.random.randn() * 10)
-            timestamp = int(
-                start_datetime.timestamp() * 1000
-            )  # Convert to milliseconds
-            heart_rate_values.append([timestamp, heart_rate])
-            start_datetime += timedelta(minutes=60)
+    dates = calendar_dates(start_date, num_days + 1)
+
+    resting_heart_rate = randints(50, 90, num_days)
+    max_heart_rate = randints(resting_heart_rate + 5, 120, num_days)
+    min_heart_rate = randints(resting_heart_rate + 2, max_heart_rate - 1, num_days)
+    last_seven_days_avg = randints(
+        resting_heart_rate - 2, resting_heart_rate + 2, num_days
+    )
+
+    # hourly values from 07:00 GMT on the day to 07:00 GMT on the next day
+    timestamps = local_millis(start_date, num_days, np.arange(24) * 60 + 7 * 60)
+    first_steps = np.array([day[0]["steps"] for day in steps_data], dtype=float)
+    heart_rates = (
+        first_steps[:, None] * 0.5 + 75 + np.random.randn(num_days, 24) * 10
+    ).astype(int)
+    heart_rate_values = np.stack([timestamps, heart_rates], axis=-1).tolist()
+
+    user_profile_pk = randints(10000000, 99999999, num_days).tolist()
+    resting_heart_rate = resting_heart_rate.tolist()
+    max_heart_rate = max_heart_rate.tolist()
+    min_heart_rate = min_heart_rate.tolist()
+    last_seven_days_avg = last_seven_days_avg.tolist()
 
+    heart_rate_data = []
+    for i in range(num_days):
         heart_rate_entry = {
-            "userProfilePK": random.randint(10000000, 99999999),
-            "calendarDate": calendar_date,
-            "startTimestampGMT": start_timestamp_gmt,
-            "endTimestampGMT": end_timestamp_gmt,
-            "startTimestampLocal": start_timestamp_local,
-            "endTimestampLocal": end_timestamp_local,
-            "maxHeartRate": max_heart_rate,
-            "minHeartRate": min_heart_rate,
-            "restingHeartRate": resting_heart_rate,
-            "lastSevenDaysAvgRestingHeartRate": last_seven_days_avg,
+            "userProfilePK": user_profile_pk[i],
+            "calendarDate": dates[i],
+            "startTimestampGMT": f"{dates[i]}T07:00:00.0",
+            "endTimestampGMT": f"{dates[i + 1]}T07:00:00.0",
+            "startTimestampLocal": f"{dates[i]}T00:00:00.0",
+            "endTimestampLocal": f"{dates[i + 1]}T00:00:00.0",
+            "maxHeartRate": max_heart_rate[i],
+            "minHeartRate": min_heart_rate[i],
+            "restingHeartRate": resting_heart_rate[i],
+            "lastSevenDaysAvgRestingHeartRate": last_seven_days_avg[i],
             "heartRateValueDescriptors": [
                 {"key": "timestamp", "index": 0},
                 {"key": "heartrate", "index": 1},
             ],
-            "heartRateValues": heart_rate_values,
+            "heartRateValues": heart_rate_values[i],
         }
 
         heart_rate_data.append(heart_rate_entry)
@@ -227,49 +258,28 @@ def get_body_battery_data(start_date, num_days):
         and an array of body battery levels for each time interval within the day.
     :rtype: List[List[Dict]]
     """
+    dates = calendar_dates(start_date, num_days + 1)
 
-    body_battery_data = []
+    charged = randints(0, 100, num_days).tolist()
+    drained = randints(0, 100, num_days).tolist()
 
-    for day in range(num_days):
-        calendar_date = (
-            datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=day)
-        ).strftime("%Y-%m-%d")
-        start_timestamp_gmt = f"{calendar_date}T23:00:00.0"
-        end_timestamp_gmt = (
-            datetime.strptime(start_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-            + timedelta(days=1)
-        ).strftime("%Y-%m-%dT%H:%M:%S.0")
-        start_timestamp_local = f"{calendar_date}T00:00:00.0"
-        end_timestamp_local = (
-            datetime.strptime(start_timestamp_local, "%Y-%m-%dT%H:%M:%S.0")
-            + timedelta(days=1)
-        ).strftime("%Y-%m-%dT%H:%M:%S.0")
-
-        charged = random.randint(0, 100)
-        drained = random.randint(0, 100)
-
-        body_battery_values_array = []
-        start_datetime = datetime.strptime(start_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-        end_datetime = datetime.strptime(end_timestamp_gmt, "%Y-%m-%dT%H:%M:%S.0")
-        while start_datetime < end_datetime:
-            timestamp = int(
-                start_datetime.timestamp() * 1000
-            )  # Convert to milliseconds
-            body_battery_level = random.randint(0, 100)  # Random body battery level
-            body_battery_values_array.append([timestamp, body_battery_level])
-            # Assuming 15-minute intervals
-            start_datetime += timedelta(minutes=15)
+    # 15-minute intervals from 23:00 on the day to 23:00 on the next day
+    timestamps = local_millis(start_date, num_days, np.arange(96) * 15 + 23 * 60)
+    levels = randints(0, 100, (num_days, 96))
+    body_battery_values = np.stack([timestamps, levels], axis=-1).tolist()
 
+    body_battery_data = []
+    for i in range(num_days):
         body_battery_entry = [
             {
-                "date": calendar_date,
-                "charged": charged,
-                "drained": drained,
-                "startTimestampGMT": start_timestamp_gmt,
-                "endTimestampGMT": end_timestamp_gmt,
-                "startTimestampLocal": start_timestamp_local,
-                "endTimestampLocal": end_timestamp_local,
-                "bodyBatteryValuesArray": body_battery_values_array,
+                "date": dates[i],
+                "charged": charged[i],
+                "drained": drained[i],
+                "startTimestampGMT": f"{dates[i]}T23:00:00.0",
+                "endTimestampGMT": f"{dates[i + 1]}T23:00:00.0",
+                "startTimestampLocal": f"{dates[i]}T00:00:00.0",
+                "endTimestampLocal": f"{dates[i + 1]}T00:00:00.0",
+                "bodyBatteryValuesArray": body_battery_values[i],
                 "bodyBatteryValueDescriptorDTOList": [
                     {
                         "bodyBatteryValueDescriptorIndex": 0,
@@ -1,6 +1,9 @@
-import random
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from .fenix_gen_1 import calendar_dates, randints
+
 
 def get_blood_pressure_data(start_date, end_date, num_summaries):
     """Generate synthetic blood pressure data summaries for a specified date range.
@@ -43,52 +46,44 @@ def get_floors_data(start_date, num_days):
         for each day within the specified date range.
     :rtype: List[Dict]
     """
-    floors_data = []
-
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
+    dates = calendar_dates(start_date, num_days + 1)
+
+    # 15-minute slots from 07:00 to 24:00 local time on every day
+    slots_per_day = (24 - 7) * 4
+    slot_offsets = np.arange(slots_per_day + 1) * 15 + 7 * 60
+    slot_minutes = (
+        np.datetime64(start_date, "m")
+        + np.arange(num_days)[:, None] * np.timedelta64(1, "D")
+        + slot_offsets * np.timedelta64(1, "m")
+    )
+    slot_strings = np.char.add(np.datetime_as_string(slot_minutes, unit="s"), ".0")
+
+    # [start, end, ascended, descended] of every slot, as nested lists at once
+    floor_values = np.empty((num_days, slots_per_day, 4), dtype=object)
+    floor_values[..., 0] = slot_strings[:, :-1]
+    floor_values[..., 1] = slot_strings[:, 1:]
+
+    # Random number of floors ascended and descended
+    floor_values[..., 2] = randints(0, 10, (num_days, slots_per_day))
+    floor_values[..., 3] = randints(0, 10, (num_days, slots_per_day))
+    floor_values = floor_values.tolist()
 
+    floors_data = []
     for day in range(num_days):
-        day_date = start_date_obj + timedelta(days=day)
-        start_timestamp_gmt = day_date.strftime("%Y-%m-%dT07:00:00.0")
-        end_timestamp_gmt = (day_date + timedelta(days=1)).strftime(
-            "%Y-%m-%dT07:00:00.0"
-        )
-        start_timestamp_local = day_date.strftime("%Y-%m-%dT00:00:00.0")
-        end_timestamp_local = (day_date + timedelta(days=1)).strftime(
-            "%Y-%m-%dT00:00:00.0"
-        )
-
         floors_entry = {
-            "startTimestampGMT": start_timestamp_gmt,
-            "endTimestampGMT": end_timestamp_gmt,
-            "startTimestampLocal": start_timestamp_local,
-            "endTimestampLocal": end_timestamp_local,
+            "startTimestampGMT": f"{dates[day]}T07:00:00.0",
+            "endTimestampGMT": f"{dates[day + 1]}T07:00:00.0",
+            "startTimestampLocal": f"{dates[day]}T00:00:00.0",
+            "endTimestampLocal": f"{dates[day + 1]}T00:00:00.0",
             "floorsValueDescriptorDTOList": [
                 {"key": "startTimeGMT", "index": 0},
                 {"key": "endTimeGMT", "index": 1},
                 {"key": "floorsAscended", "index": 2},
                 {"key": "floorsDescended", "index": 3},
             ],
-            "floorValuesArray": [],
+            "floorValuesArray": floor_values[day],
         }
 
-        for hour in range(7, 24):
-            for minute in range(0, 60, 15):
-                time_slot = day_date.replace(hour=hour, minute=minute)
-                next_time_slot = time_slot + timedelta(minutes=15)
-                # Random number of floors ascended
-                floors_ascended = random.randint(0, 10)
-                # Random number of floors descended
-                floors_descended = random.randint(0, 10)
-
-                floor_value = [
-                    time_slot.strftime("%Y-%m-%dT%H:%M:%S.0"),
-                    next_time_slot.strftime("%Y-%m-%dT%H:%M:%S.0"),
-                    floors_ascended,
-                    floors_descended,
-                ]
-                floors_entry["floorValuesArray"].append(floor_value)
-
         floors_data.append(floors_entry)
 
     return floors_data
@@ -110,33 +105,28 @@ def get_resting_hr_data(start_date, num_days):
     :rtype: dict
     """
 
+    dates = calendar_dates(start_date, num_days)
+
+    # Random resting heart rate between 50 and 100 bpm
+    resting_hr_values = randints(50, 100, num_days).tolist()
+
     resting_hr_data = {
-        "userProfileId": random.randint(10000000, 99999999),
+        "userProfileId": int(np.random.randint(10000000, 100000000)),
         "statisticsStartDate": start_date,
         "statisticsEndDate": (
             datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=num_days - 1)
         ).strftime("%Y-%m-%d"),
         "allMetrics": {
-            "metricsMap": {"WELLNESS_RESTING_HEART_RATE": []},
+            "metricsMap": {
+                "WELLNESS_RESTING_HEART_RATE": [
+                    {"value": value, "calendarDate": date}
+                    for value, date in zip(resting_hr_values, dates)
+                ]
+            },
         },
         "groupedMetrics": None,
     }
 
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-
-    for day in range(num_days):
-        current_date = start_date_obj + timedelta(days=day)
-        # Random resting heart rate between 50 and 100 bpm
-        resting_hr_value = random.randint(50, 100)
-        resting_hr_entry = {
-            "value": resting_hr_value,
-            "calendarDate": current_date.strftime("%Y-%m-%d"),
-        }
-
-        resting_hr_data["allMetrics"]["metricsMap"][
-            "WELLNESS_RESTING_HEART_RATE"
-        ].append(resting_hr_entry)
-
     return resting_hr_data
 
 
@@ -155,31 +145,22 @@ def get_hydration_data(start_date, num_days):
         sweat loss, and activity intake.
     :rtype: List[Dict]
     """
-    hydration_data = []
-
-    for _ in range(num_days):
-        user_id = random.randint(10000000, 99999999)
-        calendar_date = (
-            datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=_)
-        ).strftime("%Y-%m-%d")
-        value_in_ml = None
-        goal_in_ml = random.uniform(1800.0, 2500.0)
-        daily_average_in_ml = None
-        last_entry_timestamp_local = None
-        sweat_loss_in_ml = None
-        activity_intake_in_ml = None
-
-        hydration_entry = {
+    dates = calendar_dates(start_date, num_days)
+    user_ids = randints(10000000, 99999999, num_days).tolist()
+    goals_in_ml = np.random.uniform(1800.0, 2500.0, num_days).tolist()
+
+    hydration_data = [
+        {
             "userId": user_id,
             "calendarDate": calendar_date,
-            "valueInML": value_in_ml,
+            "valueInML": None,
             "goalInML": goal_in_ml,
-            "dailyAverageinML": daily_average_in_ml,
-            "lastEntryTimestampLocal": last_entry_timestamp_local,
-            "sweatLossInML": sweat_loss_in_ml,
-            "activityIntakeInML": activity_intake_in_ml,
+            "dailyAverageinML": None,
+            "lastEntryTimestampLocal": None,
+            "sweatLossInML": None,
+            "activityIntakeInML": None,
         }
-
-        hydration_data.append(hydration_entry)
+        for user_id, calendar_date, goal_in_ml in zip(user_ids, dates, goals_in_ml)
+    ]
 
     return hydration_data
@@ -1,5 +1,6 @@
-import random
-from datetime import datetime, timedelta
+import numpy as np
+
+from .fenix_gen_1 import calendar_dates, local_millis, randints
 
 
 def get_sleep_data(start_date, num_days):
@@ -17,91 +18,114 @@ def get_sleep_data(start_date, num_days):
         sleep time, sleep quality, respiration values, and sleep quality scores.
     :rtype: List[Dict]
     """
-    sleep_data = []
-
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
+    dates = calendar_dates(start_date, num_days)
+
+    sleep_time_seconds = randints(6 * 3600, 9 * 3600, num_days)  # Between 6 and 9 hours
+    deep_sleep_seconds = randints(1 * 3600, 3 * 3600, num_days)  # Between 1 and 3 hours
+    light_sleep_seconds = randints(
+        2 * 3600, 4 * 3600, num_days
+    )  # Between 2 and 4 hours
+    rem_sleep_seconds = sleep_time_seconds - deep_sleep_seconds - light_sleep_seconds
+    awake_sleep_seconds = randints(
+        5 * 60, 20 * 60, num_days
+    )  # Between 5 and 20 minutes
+    avg_respiration_value = np.random.uniform(12.0, 20.0, num_days)
+    lowest_respiration_value = avg_respiration_value - np.random.uniform(
+        0.5, 2.0, num_days
+    )
+    highest_respiration_value = avg_respiration_value + np.random.uniform(
+        0.5, 2.0, num_days
+    )
+    awake_count = randints(0, 4, num_days)
+
+    sleep_start_timestamp_gmt = local_millis(start_date, num_days, [0])[:, 0]
+    sleep_end_timestamp_gmt = sleep_start_timestamp_gmt + sleep_time_seconds * 1000
+
+    sleep_start_timestamp_gmt = sleep_start_timestamp_gmt.tolist()
+    sleep_end_timestamp_gmt = sleep_end_timestamp_gmt.tolist()
+    sleep_time_seconds = sleep_time_seconds.tolist()
+    deep_sleep_seconds = deep_sleep_seconds.tolist()
+    light_sleep_seconds = light_sleep_seconds.tolist()
+    rem_sleep_seconds = rem_sleep_seconds.tolist()
+    awake_sleep_seconds = awake_sleep_seconds.tolist()
+    avg_respiration_value = avg_respiration_value.tolist()
+    lowest_respiration_value = lowest_respiration_value.tolist()
+    highest_respiration_value = highest_respiration_value.tolist()
+    awake_count = awake_count.tolist()
+
+    scores = {
+        "total_duration": randints(0, 100, num_days).tolist(),
+        "stress": randints(0, 100, num_days).tolist(),
+        "awake_count": randints(0, 100, num_days).tolist(),
+        "overall": randints(0, 100, num_days).tolist(),
+        "rem_percentage": randints(10, 30, num_days).tolist(),
+        "light_percentage": randints(40, 70, num_days).tolist(),
+        "deep_percentage": randints(20, 40, num_days).tolist(),
+    }
+    sleep_id = randints(1000000000000, 9999999999999, num_days).tolist()
+    user_profile_pk = randints(10000000, 99999999, num_days).tolist()
+    avg_sleep_stress = np.random.uniform(20.0, 30.0, num_days).tolist()
+    resting_heart_rate = randints(50, 70, num_days).tolist()
 
+    sleep_data = []
     for day in range(num_days):
-        current_date = start_date_obj + timedelta(days=day)
-        sleep_time_seconds = random.randint(6 * 3600, 9 * 3600)  # Between 6 and 9 hours
-        deep_sleep_seconds = random.randint(1 * 3600, 3 * 3600)  # Between 1 and 3 hours
-        light_sleep_seconds = random.randint(
-            2 * 3600, 4 * 3600
-        )  # Between 2 and 4 hours
-        rem_sleep_seconds = (
-            sleep_time_seconds - deep_sleep_seconds - light_sleep_seconds
-        )
-        awake_sleep_seconds = random.randint(
-            5 * 60, 20 * 60
-        )  # Between 5 and 20 minutes
-        avg_respiration_value = random.uniform(12.0, 20.0)
-        lowest_respiration_value = avg_respiration_value - random.uniform(0.5, 2.0)
-        highest_respiration_value = avg_respiration_value + random.uniform(0.5, 2.0)
-        awake_count = random.randint(0, 4)
-
-        sleep_start_timestamp_gmt = int(current_date.timestamp() * 1000)
-        sleep_end_timestamp_gmt = int(
-            (current_date + timedelta(seconds=sleep_time_seconds)).timestamp() * 1000
-        )
-        sleep_start_timestamp_local = sleep_start_timestamp_gmt
-        sleep_end_timestamp_local = sleep_end_timestamp_gmt
-
-        total_duration_score = random.randint(0, 100)
-        stress_score = random.randint(0, 100)
-        awake_count_score = random.randint(0, 100)
-        overall_score = random.randint(0, 100)
-        rem_percentage = random.randint(10, 30)
-        light_percentage = random.randint(40, 70)
-        deep_percentage = random.randint(20, 40)
-
         sleep_entry = {
             "dailySleepDTO": {
-                "id": random.randint(1000000000000, 9999999999999),
-                "userProfilePK": random.randint(10000000, 99999999),
-                "calendarDate": current_date.strftime("%Y-%m-%d"),
-                "sleepTimeSeconds": sleep_time_seconds,
+                "id": sleep_id[day],
+                "userProfilePK": user_profile_pk[day],
+                "calendarDate": dates[day],
+                "sleepTimeSeconds": sleep_time_seconds[day],
                 "napTimeSeconds": 0,
                 "sleepWindowConfirmed": True,
                 "sleepWindowConfirmationType": "enhanced_confirmed_final",
-                "sleepStartTimestampGMT": sleep_start_timestamp_gmt,
-                "sleepEndTimestampGMT": sleep_end_timestamp_gmt,
-                "sleepStartTimestampLocal": sleep_start_timestamp_local,
-                "sleepEndTimestampLocal": sleep_end_timestamp_local,
+                "sleepStartTimestampGMT": sleep_start_timestamp_gmt[day],
+                "sleepEndTimestampGMT": sleep_end_timestamp_gmt[day],
+                "sleepStartTimestampLocal": sleep_start_timestamp_gmt[day],
+                "sleepEndTimestampLocal": sleep_end_timestamp_gmt[day],
                 "autoSleepStartTimestampGMT": None,
                 "autoSleepEndTimestampGMT": None,
                 "sleepQualityTypePK": None,
                 "sleepResultTypePK": None,
                 "unmeasurableSleepSeconds": 0,
-                "deepSleepSeconds": deep_sleep_seconds,
-                "lightSleepSeconds": light_sleep_seconds,
-                "remSleepSeconds": rem_sleep_seconds,
-                "awakeSleepSeconds": awake_sleep_seconds,
+                "deepSleepSeconds": deep_sleep_seconds[day],
+                "lightSleepSeconds": light_sleep_seconds[day],
+                "remSleepSeconds": rem_sleep_seconds[day],
+                "awakeSleepSeconds": awake_sleep_seconds[day],
                 "deviceRemCapable": True,
                 "retro": False,
                 "sleepFromDevice": True,
-                "averageRespirationValue": avg_respiration_value,
-                "lowestRespirationValue": lowest_respiration_value,
-                "highestRespirationValue": highest_respiration_value,
-                "awakeCount": awake_count,
-                "avgSleepStress": random.uniform(20.0, 30.0),
+                "averageRespirationValue": avg_respiration_value[day],
+                "lowestRespirationValue": lowest_respiration_value[day],
+                "highestRespirationValue": highest_respiration_value[day],
+                "awakeCount": awake_count[day],
+                "avgSleepStress": avg_sleep_stress[day],
                 "ageGroup": "ADULT",
                 "sleepScoreFeedback": "NEGATIVE_LONG_BUT_NOT_ENOUGH_REM",
                 "sleepScoreInsight": "NONE",
                 "sleepScores": {
                     "totalDuration": {
-                        "value": total_duration_score,
+                        "value": scores["total_duration"][day],
+                        "qualifierKey": "POOR",
+                    },
+                    "stress": {"value": scores["stress"][day], "qualifierKey": "FAIR"},
+                    "awakeCount": {
+                        "value": scores["awake_count"][day],
+                        "qualifierKey": "POOR",
+                    },
+                    "overall": {
+                        "value": scores["overall"][day],
+                        "qualifierKey": "POOR",
+                    },
+                    "remPercentage": {
+                        "value": scores["rem_percentage"][day],
                         "qualifierKey": "POOR",
                     },
-                    "stress": {"value": stress_score, "qualifierKey": "FAIR"},
-                    "awakeCount": {"value": awake_count_score, "qualifierKey": "POOR"},
-                    "overall": {"value": overall_score, "qualifierKey": "POOR"},
-                    "remPercentage": {"value": rem_percentage, "qualifierKey": "POOR"},
                     "lightPercentage": {
-                        "value": light_percentage,
+                        "value": scores["light_percentage"][day],
                         "qualifierKey": "GOOD",
                     },
                     "deepPercentage": {
-                        "value": deep_percentage,
+                        "value": scores["deep_percentage"][day],
                         "qualifierKey": "EXCELLENT",
                     },
                 },
@@ -110,7 +134,7 @@ def get_sleep_data(start_date, num_days):
             "sleepMovement": None,
             "remSleepData": True,
             "sleepLevels": None,
-            "restingHeartRate": random.randint(50, 70),
+            "restingHeartRate": resting_heart_rate[day],
         }
 
         sleep_data.append(sleep_entry)
@@ -132,35 +156,33 @@ def get_stress_data(start_date, num_days):
         user profile ID, calendar date, stress levels, and timestamps for stress level measurements.
     :rtype: List[Dict]
     """
-    stress_data = []
+    dates = calendar_dates(start_date, num_days)
 
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
+    user_profile_pk = randints(10000000, 99999999, num_days).tolist()
+    max_stress_level = randints(70, 100, num_days).tolist()
+    avg_stress_level = randints(20, 50, num_days).tolist()
 
-    for i in range(num_days):
-        date = (start_date_obj + timedelta(days=i)).strftime("%Y-%m-%d")
+    timestamps = local_millis(start_date, num_days, np.arange(24 * 4) * 15)
+    stress_levels = randints(10, 99, timestamps.shape)
+    stress_values = np.stack([timestamps, stress_levels], axis=-1).tolist()
 
+    stress_data = []
+    for i, date in enumerate(dates):
         stress_entry = {
-            "userProfilePK": random.randint(10000000, 99999999),
+            "userProfilePK": user_profile_pk[i],
             "calendarDate": date,
             "startTimestampGMT": f"{date}T07:00:00.0",
             "endTimestampGMT": f"{date}T07:00:00.0",
             "startTimestampLocal": f"{date}T00:00:00.0",
             "endTimestampLocal": f"{date}T00:00:00.0",
-            "maxStressLevel": random.randint(70, 100),
-            "avgStressLevel": random.randint(20, 50),
+            "maxStressLevel": max_stress_level[i],
+            "avgStressLevel": avg_stress_level[i],
             "stressChartValueOffset": 1,
             "stressChartYAxisOrigin": -1,
             "stressValueDescriptorsDTOList": [],
-            "stressValuesArray": [],
+            "stressValuesArray": stress_values[i],
         }
 
-        for j in range(24 * 4):
-            timestamp = int(
-                (start_date_obj + timedelta(days=i, minutes=j * 15)).timestamp() * 1000
-            )
-            stress_level = random.randint(10, 99)
-            stress_entry["stressValuesArray"].append([timestamp, stress_level])
-
         stress_data.append(stress_entry)
 
     return stress_data
@@ -180,16 +202,30 @@ def get_respiration_data(start_date, num_days):
         user profile ID, calendar date, respiration values, sleep-related respiration metrics, and timestamps.
     :rtype: List[Dict]
     """
-    respiration_data = []
-
-    start_date_obj = datetime.strptime(start_date, "%Y-%m-%d")
-
-    for i in range(num_days):
-        current_date = start_date_obj + timedelta(days=i)
-        date = current_date.strftime("%Y-%m-%d")
+    dates = calendar_dates(start_date, num_days)
+
+    columns = {
+        "user_profile_pk": randints(10000000, 99999999, num_days),
+        "lowest": np.random.uniform(10.0, 15.0, num_days),
+        "highest": np.random.uniform(20.0, 25.0, num_days),
+        "avg_waking": np.random.uniform(12.0, 18.0, num_days),
+        "avg_sleep": np.random.uniform(16.0, 22.0, num_days),
+        "avg_tomorrow_sleep": np.random.uniform(16.0, 22.0, num_days),
+    }
+    columns = {key: value.tolist() for key, value in columns.items()}
+
+    # [timestamp, value] pairs as nested lists at once, keeping ints and floats
+    respiration_values = np.empty((num_days, 24 * 4, 2), dtype=object)
+    respiration_values[..., 0] = local_millis(
+        start_date, num_days, np.arange(24 * 4) * 15
+    )
+    respiration_values[..., 1] = np.random.uniform(10.0, 25.0, (num_days, 24 * 4))
+    respiration_values = respiration_values.tolist()
 
+    respiration_data = []
+    for i, date in enumerate(dates):
         respiration_entry = {
-            "userProfilePK": random.randint(10000000, 99999999),
+            "userProfilePK": columns["user_profile_pk"][i],
             "calendarDate": date,
             "startTimestampGMT": f"{date}T07:00:00.0",
             "endTimestampGMT": f"{date}T07:00:00.0",
@@ -203,24 +239,15 @@ def get_respiration_data(start_date, num_days):
             "tomorrowSleepEndTimestampGMT": f"{date}T14:16:00.0",
             "tomorrowSleepStartTimestampLocal": f"{date}T22:39:00.0",
             "tomorrowSleepEndTimestampLocal": f"{date}T07:16:00.0",
-            "lowestRespirationValue": random.uniform(10.0, 15.0),
-            "highestRespirationValue": random.uniform(20.0, 25.0),
-            "avgWakingRespirationValue": random.uniform(12.0, 18.0),
-            "avgSleepRespirationValue": random.uniform(16.0, 22.0),
-            "avgTomorrowSleepRespirationValue": random.uniform(16.0, 22.0),
+            "lowestRespirationValue": columns["lowest"][i],
+            "highestRespirationValue": columns["highest"][i],
+            "avgWakingRespirationValue": columns["avg_waking"][i],
+            "avgSleepRespirationValue": columns["avg_sleep"][i],
+            "avgTomorrowSleepRespirationValue": columns["avg_tomorrow_sleep"][i],
             "respirationValueDescriptorsDTOList": [],
-            "respirationValuesArray": [],
+            "respirationValuesArray": respiration_values[i],
         }
 
-        for j in range(24 * 4):
-            timestamp = int(
-                (current_date + timedelta(minutes=15 * j)).timestamp() * 1000
-            )
-            respiration_value = random.uniform(10.0, 25.0)
-            respiration_entry["respirationValuesArray"].append(
-                [timestamp, respiration_value]
-            )
-
         respiration_data.append(respiration_entry)
     return respiration_data
 
@@ -239,15 +266,12 @@ def get_spo2_data(start_date, num_days):
         sleep-related SpO2 metrics, and timestamps.
     :rtype: List[Dict]
     """
-    spo2_data = []
-
-    for i in range(num_days):
-        date = (datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)).strftime(
-            "%Y-%m-%d"
-        )
+    user_profile_pk = randints(10000000, 99999999, num_days).tolist()
 
+    spo2_data = []
+    for i, date in enumerate(calendar_dates(start_date, num_days)):
         spo2_entry = {
-            "userProfilePK": random.randint(10000000, 99999999),
+            "userProfilePK": user_profile_pk[i],
             "calendarDate": date,
             "startTimestampGMT": f"{date}T07:00:00.0",
             "endTimestampGMT": f"{date}T07:00:00.0",
@@ -4,7 +4,11 @@ import requests
 
 from ...utils import seed_everything
 from ..device import BaseDevice
-from .googlefitness_fetch import fetch_real_data
+from .googlefitness_fetch import (
+    default_time_bucket,
+    fetch_real_data,
+    fetch_real_data_batched,
+)
 from .googlefitness_synthetic import create_syn_data
 
 
@@ -49,17 +53,26 @@ class GoogleFit(BaseDevice):
     :type synthetic_start_date: str, optional
     :param synthetic_end_date: end date for synthetic data generation, defaults to "2022-06-17"
     :type synthetic_end_date: str, optional
+    :param time_bucket: length of a synthetic bucket in milliseconds, defaults to "86400000" (one day)
+    :type time_bucket: str, optional
     :param use_cache: decide whether to cache the credentials, defaults to True
     :type use_cache: bool, optional
     """
 
     name = "google/googlefit"
 
-    def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
+    def __init__(
+        self,
+        seed=0,
+        start_date="2022-03-01",
+        end_date="2022-06-17",
+        time_bucket="86400000",
+    ):
         params = {
             "seed": seed,
             "start_date": str(start_date),
             "end_date": str(end_date),
+            "time_bucket": str(time_bucket),
         }
 
         self._initialize_device_params(
@@ -109,6 +122,16 @@ class GoogleFit(BaseDevice):
             params["time_bucket"],
         )
 
+    def _get_real_many(self, data_types, params):
+        # several data types are aggregated per request
+        return fetch_real_data_batched(
+            self,
+            params["start_date"],
+            params["end_date"],
+            data_types,
+            params.get("time_bucket", default_time_bucket),
+        )
+
     def _filter_synthetic(self, data, data_type, params):
         # Here we just return the data we've already generated,
         # but index into it based on the params. Specifically, we
@@ -123,38 +146,27 @@ class GoogleFit(BaseDevice):
         start_idx = (date_str_to_obj(params["start_date"]) - synthetic_start).days
         end_idx = (date_str_to_obj(params["end_date"]) - synthetic_start).days
 
-        return data[start_idx:end_idx]
+        # there are several buckets per day when time_bucket is shorter than a day
+        buckets_per_day = 86400000 // int(self.init_params["time_bucket"])
+
+        return data[start_idx * buckets_per_day : end_idx * buckets_per_day]
 
     def _gen_synthetic(self):
         # generate random data according to seed
         seed_everything(self.init_params["seed"])
-        # steps, hrs, weight, height, speed, heart_minutes, calories_expended, sleep,
-        #  blood_pressure, blood_glucose, activity_mins, distance, oxygen_saturation,
-        # body_temperature, menstruation
-
-        # # and based on start and end dates
-        (
-            self.steps,
-            self.heart_rate,
-            self.weight,
-            self.height,
-            self.speed,
-            self.heart_minutes,
-            self.calories_expended,
-            self.sleep,
-            self.blood_pressure,
-            self.blood_glucose,
-            self.activity_minutes,
-            self.distance,
-            self.oxygen_saturation,
-            self.body_temperature,
-            self.menstruation,
-        ) = create_syn_data(
+
+        # and based on start and end dates. The buckets of each data type are only
+        # drawn once that data type is first requested
+        syn_data = create_syn_data(
             self.init_params["synthetic_start_date"],
             self.init_params["synthetic_end_date"],
             self.init_params["time_bucket"],
+            seed=self.init_params["seed"],
         )
 
+        for data_type, buckets in syn_data.items():
+            setattr(self, data_type, buckets)
+
     def _authenticate(self, auth_creds):
 
         if "authorization_code" not in auth_creds and "access_token" not in auth_creds:
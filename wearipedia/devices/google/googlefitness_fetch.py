@@ -3,10 +3,58 @@ from datetime import date, datetime, timedelta
 
 import requests
 
+from ...utils import fetch_concurrently
+
 year, month, day = 0, 1, 2
 
 default_time_bucket = 86400000
 
+# URL to access all of participant's activities.
+api_url = "https://www.googleapis.com/fitness/v1/users/me/dataset:aggregate"
+
+# The aggregate endpoint rejects requests spanning more than 90 days
+max_request_millis = 90 * 86400000
+
+# The data type names and data source ids are used to specify the type of data we want to access
+# from the API.
+
+datatypenames = {
+    "steps": "com.google.step_count.delta",
+    "heart_rate": "com.google.heart_rate.bpm",
+    "height": "com.google.height",
+    "weight": "com.google.weight",
+    "speed": "com.google.speed",
+    "heart_minutes": "com.google.heart_minutes",
+    "calories_expended": "com.google.calories.expended",
+    "sleep": "com.google.sleep.segment",
+    "blood_pressure": "com.google.blood_pressure",
+    "blood_glucose": "com.google.blood_glucose",
+    "activity_minutes": "com.google.activity_minutes",
+    "distance": "com.google.distance.delta",
+    "oxygen_saturation": "com.google.oxygen_saturation",
+    "body_temperature": "com.google.body.temperature",
+    "menstruation": "com.google.menstruation",
+}
+
+# The data source ids are used to specify the type of data we want to access from the API.
+datasourceids = {
+    "steps": "derived:com.google.step_count.delta:com.google.android.gms:estimated_steps",
+    "heart_rate": "derived:com.google.heart_rate.bpm:com.google.android.gms:merge_heart_rate_bpm",
+    "height": "derived:com.google.height:com.google.android.gms:merge_height",
+    "weight": "derived:com.google.weight:com.google.android.gms:merge_weight",
+    "speed": "derived:com.google.speed:com.google.android.gms:merge_speed",
+    "heart_minutes": "derived:com.google.heart_minutes:com.google.android.gms:merge_heart_minutes",
+    "calories_expended": "derived:com.google.calories.expended:com.google.android.gms:merge_calories_expended",
+    "sleep": "derived:com.google.sleep.segment:com.google.android.gms:merged",
+    "blood_pressure": "derived:com.google.blood_pressure:com.google.android.gms:merged",
+    "blood_glucose": "derived:com.google.blood_glucose:com.google.android.gms:merged",
+    "activity_minutes": "derived:com.google.active_minutes:com.google.android.gms:merge_active_minutes",
+    "distance": "derived:com.google.distance.delta:com.google.android.gms:merge_distance_delta",
+    "oxygen_saturation": "derived:com.google.oxygen_saturation:com.google.android.gms:merged",
+    "body_temperature": "derived:com.google.body.temperature:com.google.android.gms:merged",
+    "menstruation": "derived:com.google.menstruation:com.google.android.gms:merged",
+}
+
 
 def milliconvert(d):
     return int(
@@ -31,13 +79,75 @@ def transform_response_bucket(data):
     return output
 
 
+def build_request_body(data_types, start_millis, end_millis, time_bucket):
+    """Build the body of an aggregate request for one or more data types.
+
+    :param data_types: the data types to aggregate, e.g. ["steps", "heart_rate"]
+    :type data_types: List[str]
+    :param start_millis: start of the range in milliseconds since the epoch
+    :type start_millis: int
+    :param end_millis: end of the range in milliseconds since the epoch
+    :type end_millis: int
+    :param time_bucket: length of a bucket in milliseconds
+    :type time_bucket: int or str
+    :return: the request body
+    :rtype: Dict
+    """
+    return {
+        "aggregateBy": [
+            {
+                "dataTypeName": datatypenames[data_type],
+                "dataSourceId": datasourceids[data_type],
+            }
+            for data_type in data_types
+        ],
+        "bucketByTime": {"durationMillis": time_bucket},
+        "startTimeMillis": start_millis,
+        "endTimeMillis": end_millis,
+    }
+
+
+def post_aggregate(session, headers, body):
+    response = session.post(api_url, data=json.dumps(body), headers=headers)
+    out = response.json()
+
+    # If there is an error in the response, raise an exception
+    if "error" in out:
+        raise Exception(f"Error in response: {out['error']}")
+
+    return out["bucket"]
+
+
+def split_by_type(buckets, data_types):
+    """Demultiplex the buckets of a multi-type aggregate response.
+
+    The datasets of each bucket come back in the same order as the `aggregateBy`
+    entries of the request, so the i-th dataset belongs to the i-th data type.
+
+    :param buckets: the buckets of the response
+    :type buckets: List[Dict]
+    :param data_types: the data types of the request, in request order
+    :type data_types: List[str]
+    :return: mapping from data type to its buckets, each holding a single dataset
+    :rtype: Dict[str, List[Dict]]
+    """
+    out = {data_type: [] for data_type in data_types}
+    for bucket in buckets:
+        for data_type, dataset in zip(data_types, bucket["dataset"]):
+            out[data_type].append(
+                {
+                    "startTimeMillis": bucket["startTimeMillis"],
+                    "endTimeMillis": bucket["endTimeMillis"],
+                    "dataset": [dataset],
+                }
+            )
+    return out
+
+
 def fetch_real_data(
     self, start_date, end_date, data_type, time_bucket=default_time_bucket
 ):
 
-    # URL to access all of participant's activities.
-    api_url = "https://www.googleapis.com/fitness/v1/users/me/dataset:aggregate"
-
     # Access token that enables us to access the user's data using google's API
     g_access_token = self.access_token
 
@@ -47,65 +157,89 @@ def fetch_real_data(
         "Content-Type": "application/json;encoding=utf-8",
     }
 
-    # The data type names and data source ids are used to specify the type of data we want to access
-    # from the API.
-
-    datatypenames = {
-        "steps": "com.google.step_count.delta",
-        "heart_rate": "com.google.heart_rate.bpm",
-        "height": "com.google.height",
-        "weight": "com.google.weight",
-        "speed": "com.google.speed",
-        "heart_minutes": "com.google.heart_minutes",
-        "calories_expended": "com.google.calories.expended",
-        "sleep": "com.google.sleep.segment",
-        "blood_pressure": "com.google.blood_pressure",
-        "blood_glucose": "com.google.blood_glucose",
-        "activity_minutes": "com.google.activity_minutes",
-        "distance": "com.google.distance.delta",
-        "oxygen_saturation": "com.google.oxygen_saturation",
-        "body_temperature": "com.google.body.temperature",
-        "menstruation": "com.google.menstruation",
-    }
-
-    # The data source ids are used to specify the type of data we want to access from the API.
-    datasourceids = {
-        "steps": "derived:com.google.step_count.delta:com.google.android.gms:estimated_steps",
-        "heart_rate": "derived:com.google.heart_rate.bpm:com.google.android.gms:merge_heart_rate_bpm",
-        "height": "derived:com.google.height:com.google.android.gms:merge_height",
-        "weight": "derived:com.google.weight:com.google.android.gms:merge_weight",
-        "speed": "derived:com.google.speed:com.google.android.gms:merge_speed",
-        "heart_minutes": "derived:com.google.heart_minutes:com.google.android.gms:merge_heart_minutes",
-        "calories_expended": "derived:com.google.calories.expended:com.google.android.gms:merge_calories_expended",
-        "sleep": "derived:com.google.sleep.segment:com.google.android.gms:merged",
-        "blood_pressure": "derived:com.google.blood_pressure:com.google.android.gms:merged",
-        "blood_glucose": "derived:com.google.blood_glucose:com.google.android.gms:merged",
-        "activity_minutes": "derived:com.google.active_minutes:com.google.android.gms:merge_active_minutes",
-        "distance": "derived:com.google.distance.delta:com.google.android.gms:merge_distance_delta",
-        "oxygen_saturation": "derived:com.google.oxygen_saturation:com.google.android.gms:merged",
-        "body_temperature": "derived:com.google.body.temperature:com.google.android.gms:merged",
-        "menstruation": "derived:com.google.menstruation:com.google.android.gms:merged",
-    }
-
     # The body of the GET request that specifies the data type, data source, start date, and end date
-    body = {
-        "aggregateBy": [
-            {
-                "dataTypeName": datatypenames[data_type],
-                "dataSourceId": datasourceids[data_type],
-            }
-        ],
-        "bucketByTime": {"durationMillis": time_bucket},
-        "startTimeMillis": milliconvert(start_date),
-        "endTimeMillis": milliconvert(end_date),
-    }
+    body = build_request_body(
+        [data_type], milliconvert(start_date), milliconvert(end_date), time_bucket
+    )
 
     # GET request to get all your activities from the API
-    response = requests.post(api_url, data=json.dumps(body), headers=headers)
-
-    # If there is an error in the response, raise an exception
-    if "error" in response.json():
-        raise Exception(f"Error in response: {response.json()['error']}")
+    buckets = post_aggregate(requests, headers, body)
 
     # Return the bucket of data
-    return transform_response_bucket(response.json()["bucket"])
+    return transform_response_bucket(buckets)
+
+
+def fetch_real_data_batched(
+    self,
+    start_date,
+    end_date,
+    data_types,
+    time_bucket=default_time_bucket,
+    types_per_request=len(datatypenames),
+    max_workers=4,
+):
+    """Fetch several data types using multi-type aggregate requests.
+
+    The range is split into chunks of at most 90 days (aligned to the bucket size)
+    and up to `types_per_request` data types are aggregated in each request. The
+    requests are issued concurrently on a shared session, and the buckets are then
+    demultiplexed back into one result per data type, in the same format as
+    `fetch_real_data`.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param data_types: the data types to fetch, e.g. ["steps", "heart_rate"]
+    :type data_types: List[str]
+    :param time_bucket: length of a bucket in milliseconds, defaults to one day
+    :type time_bucket: int or str, optional
+    :param types_per_request: maximum number of data types aggregated per request,
+        defaults to all of them
+    :type types_per_request: int, optional
+    :param max_workers: maximum number of requests in flight, defaults to 4
+    :type max_workers: int, optional
+    :return: mapping from data type to its list of buckets
+    :rtype: Dict[str, List[List[Dict]]]
+    """
+    headers = {
+        "Authorization": f"Bearer {self.access_token}",
+        "Content-Type": "application/json;encoding=utf-8",
+    }
+
+    bucket_millis = int(time_bucket)
+    chunk_millis = max(max_request_millis // bucket_millis, 1) * bucket_millis
+    start_millis, end_millis = milliconvert(start_date), milliconvert(end_date)
+    chunks = [
+        (chunk_start, min(chunk_start + chunk_millis, end_millis))
+        for chunk_start in range(start_millis, end_millis, chunk_millis)
+    ]
+
+    type_groups = [
+        list(data_types[i : i + types_per_request])
+        for i in range(0, len(data_types), types_per_request)
+    ]
+    requests_to_send = [(group, chunk) for group in type_groups for chunk in chunks]
+
+    session = requests.Session()
+
+    def fetch(request):
+        group, (chunk_start, chunk_end) = request
+        body = build_request_body(group, chunk_start, chunk_end, time_bucket)
+        return split_by_type(post_aggregate(session, headers, body), group)
+
+    try:
+        results = fetch_concurrently(fetch, requests_to_send, max_workers=max_workers)
+    finally:
+        session.close()
+
+    # results are in chunk order within each group, so buckets stay in time order
+    out = {data_type: [] for data_type in data_types}
+    for result in results:
+        for data_type, buckets in result.items():
+            out[data_type].extend(buckets)
+
+    return {
+        data_type: transform_response_bucket(buckets)
+        for data_type, buckets in out.items()
+    }
@@ -21,591 +21,302 @@ datasourceids = {
 }
 
 
-def syn_weight(x):
-    return np.round(np.random.normal(70, 10), 1)
+def watch_origin(data_type_name):
+    return f"derived:{data_type_name}:com.google.ios.fit:appleinc.:watch:{{device_id}}:top_level"
 
 
-def syn_height(x):
-    return np.round(np.random.normal(1.7, 0.15), 14)
+def user_input_origin(data_type_name):
+    return f"raw:{data_type_name}:com.google.android.apps.fitness:user_input"
+
+
+def normal(mean, std, decimals=1, low=None):
+    """Returns a generator drawing one rounded normal value per bucket."""
+
+    def gen(rng, n):
+        values = np.round(rng.normal(mean, std, n), decimals)
+        return values if low is None else np.maximum(values, low)
+
+    return gen
+
+
+def constant(value):
+    def gen(rng, n):
+        return np.full(n, value)
+
+    return gen
+
+
+def syn_steps(rng, n):
+    return np.maximum(0, rng.normal(10000, 9000, n)).astype(np.int64)
+
+
+def syn_heart_rate(rng, n):
+    hrs = np.round(rng.normal(120, 20, n), 14)
+    return [
+        np.round(hrs, 1),
+        np.round(hrs + rng.uniform(10, 40, n), 1),
+        np.round(hrs - rng.uniform(10, 40, n), 1),
+    ]
+
+
+def syn_weight(rng, n):
+    weight = np.round(rng.normal(70, 10), 1)
+    values = np.round(weight + rng.normal(-1, 1, n), 1)
+    return [values, values, values]
+
+
+def syn_height(rng, n):
+    height = np.round(rng.normal(1.7, 0.15), 14)
+    values = np.round(height + rng.normal(-0.05, 0.05, n), 1)
+    return [values, values, values]
+
+
+def syn_speed(rng, n):
+    return [
+        normal(2, 1, low=0)(rng, n),
+        normal(3, 1, low=0)(rng, n),
+        normal(1, 0.5, low=0)(rng, n),
+    ]
+
+
+def syn_distance(rng, n):
+    return np.abs(normal(3000, 2000)(rng, n))
+
+
+def syn_menstruation(rng, n):
+    return rng.choice([1, 2, 3, 4], n)
+
+
+# For every data type: its dataTypeName, originDataSourceId and a list of
+# (value key, generator) pairs, one per entry of the point's "value" list.
+# A generator may also produce several value columns at once, in which case
+# it is paired with a list of value keys.
+SPECS = {
+    "steps": (
+        "com.google.step_count.delta",
+        watch_origin("com.google.step_count.delta"),
+        [("intVal", syn_steps)],
+    ),
+    "heart_rate": (
+        "com.google.heart_rate.bpm",
+        watch_origin("com.google.heart_rate.bpm"),
+        [(["fpVal"] * 3, syn_heart_rate)],
+    ),
+    "sleep": (
+        "com.google.sleep.segment",
+        watch_origin("com.google.sleep.segment"),
+        [("fpVal", normal(8, 3, low=0))],
+    ),
+    "weight": (
+        "com.google.weight",
+        watch_origin("com.google.weight"),
+        [(["fpVal"] * 3, syn_weight)],
+    ),
+    "height": (
+        "com.google.height.summary",
+        user_input_origin("com.google.height"),
+        [(["fpVal"] * 3, syn_height)],
+    ),
+    "speed": (
+        "com.google.speed.summary",
+        watch_origin("com.google.speed.summary"),
+        [(["fpVal"] * 3, syn_speed)],
+    ),
+    "blood_glucose": (
+        "com.google.blood_glucose.summary",
+        user_input_origin("com.google.blood_glucose"),
+        [("fpVal", normal(100, 20, low=0))] * 3
+        + [("intVal", constant(2)), ("intVal", constant(3)), ("intVal", constant(2))],
+    ),
+    "blood_pressure": (
+        "com.google.blood_pressure.summary",
+        user_input_origin("com.google.blood_pressure"),
+        [("fpVal", normal(120, 20, low=1))]
+        + [("fpVal", normal(80, 20, low=1))] * 4
+        + [("intVal", constant(2))] * 2,
+    ),
+    "distance": (
+        "com.google.distance.delta",
+        watch_origin("com.google.distance.delta"),
+        [("fpVal", syn_distance)],
+    ),
+    "heart_minutes": (
+        "com.google.heart_minutes.summary",
+        watch_origin("com.google.heart_minutes.summary"),
+        [("fpVal", normal(90, 30, low=0))] * 2,
+    ),
+    "calories_expended": (
+        "com.google.calories.expended",
+        watch_origin("com.google.calories.expended"),
+        [("fpVal", normal(2000, 1000, low=0))],
+    ),
+    "activity_minutes": (
+        "com.google.activity_minutes",
+        watch_origin("com.google.activity_minutes.summary"),
+        [("fpVal", normal(100, 50, decimals=0, low=0))],
+    ),
+    "menstruation": (
+        "com.google.menstrual_cycle",
+        user_input_origin("com.google.menstrual_cycle"),
+        [("intVal", syn_menstruation)],
+    ),
+    "body_temperature": (
+        "com.google.body.temperature",
+        user_input_origin("com.google.body.temperature"),
+        [("fpVal", normal(36.5, 2, low=0))] * 3,
+    ),
+    "oxygen_saturation": (
+        "com.google.oxygen_saturation",
+        user_input_origin("com.google.oxygen_saturation"),
+        [("fpVal", normal(96.5, 5, low=0))] * 3
+        + [("fpVal", normal(3, 2, low=0))] * 3
+        + [("intVal", constant(1))] * 3,
+    ),
+}
+
 
+class SyntheticBuckets:
+    """Synthetic aggregate buckets of a single Google Fit data type.
+
+    Values are drawn for all buckets at once, the first time the buckets are
+    accessed, and the nested response dictionaries are only built for the buckets
+    that are actually indexed. Slicing returns a plain list, in the same format as
+    the real aggregate responses, which can be serialized to JSON; the buckets
+    themselves compare equal to that list.
+
+    :param data_type: the data type, e.g. "steps"
+    :type data_type: str
+    :param start_millis: start of every bucket in milliseconds since the epoch
+    :type start_millis: np.ndarray
+    :param bucket_millis: length of a bucket in milliseconds
+    :type bucket_millis: int
+    :param rng: random generator dedicated to this data type
+    :type rng: np.random.Generator
+    :param device_id: the synthetic device id
+    :type device_id: str
+    """
+
+    def __init__(self, data_type, start_millis, bucket_millis, rng, device_id):
+        self.data_type = data_type
+        self.start_millis = start_millis
+        self.bucket_millis = bucket_millis
+        self.rng = rng
+        self.device_id = device_id
+        self._values = None
+
+    @property
+    def values(self):
+        """List of (value key, values) columns, one per entry of a point's value list."""
+        if self._values is None:
+            n = len(self.start_millis)
+            self._values = []
+            for keys, gen in SPECS[self.data_type][2]:
+                if isinstance(keys, list):
+                    self._values.extend(zip(keys, gen(self.rng, n)))
+                else:
+                    self._values.append((keys, gen(self.rng, n)))
+        return self._values
+
+    def __len__(self):
+        return len(self.start_millis)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __eq__(self, other):
+        if isinstance(other, SyntheticBuckets):
+            other = other[:]
+        return self[:] == other
+
+    __hash__ = None
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            indices = range(*idx.indices(len(self)))
+        else:
+            indices = range(len(self))[idx : idx + 1 or None]
+
+        data_type_name, origin, _ = SPECS[self.data_type]
+        origin = origin.format(device_id=self.device_id)
+        source_id = datasourceids[self.data_type]
+
+        window = slice(indices.start, indices.stop, indices.step)
+        start = self.start_millis[window]
+        start_nanos = (start * 1000000).astype(str).tolist()
+        end_nanos = ((start + self.bucket_millis) * 1000000).astype(str).tolist()
+        columns = [(key, values[window].tolist()) for key, values in self.values]
+
+        buckets = []
+        for i, startmillis in enumerate(start.tolist()):
+            buckets.append(
+                [
+                    {
+                        "startTimeMillis": startmillis,
+                        "endTimeMillis": startmillis + self.bucket_millis,
+                        "dataset": [
+                            {
+                                "dataSourceId": source_id,
+                                "point": [
+                                    {
+                                        "startTimeNanos": start_nanos[i],
+                                        "endTimeNanos": end_nanos[i],
+                                        "dataTypeName": data_type_name,
+                                        "originDataSourceId": origin,
+                                        "value": [
+                                            {key: values[i], "mapVal": []}
+                                            for key, values in columns
+                                        ],
+                                    }
+                                ],
+                            }
+                        ],
+                    }
+                ]
+            )
+
+        return buckets if isinstance(idx, slice) else buckets[0]
 
-weight_gen = syn_weight(1)
-height_gen = syn_height(1)
 
 # Function takes in a start date and end date and returns generated synthetic data for each data type
 
 
-def create_syn_data(start_date, end_date, bucketByTime):
+def create_syn_data(start_date, end_date, bucketByTime, seed=0):
+    """Create synthetic Google Fit aggregate buckets for every data type.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param bucketByTime: length of a bucket in milliseconds
+    :type bucketByTime: str or int
+    :param seed: random seed, defaults to 0
+    :type seed: int, optional
+    :return: mapping from data type to its (lazily generated) buckets
+    :rtype: Dict[str, SyntheticBuckets]
+    """
+    bucket_millis = int(bucketByTime)
 
     # Create a list of dates between start_date and end_date
     dates = pd.date_range(start_date, end_date)
+    day_millis = dates.values.astype("datetime64[ms]").astype(np.int64)
+
+    iter_count = 86400000 // bucket_millis
+    start_millis = (
+        day_millis[:, None] + np.arange(iter_count, dtype=np.int64) * bucket_millis
+    ).ravel()
 
-    # Create empty lists for each data type
-    steps = []
-    hrs = []
-    weight = []
-    height = []
-    speed = []
-    heart_minutes = []
-    calories_expended = []
-    sleep = []
-    blood_pressure = []
-    blood_glucose = []
-    activity_mins = []
-    distance = []
-    oxygen_saturation = []
-    body_temperature = []
-    menstruation = []
+    rng = np.random.default_rng(seed)
 
     # Create a random device id for the synthetic data
-    device_id = "".join(
-        np.random.choice([*"abcdefghijklmnopqrstuvwxyz0123456789"], 8, replace=True)
-    )
-
-    iter_count = 86400000 / int(bucketByTime)
-
-    # Iterate through each date in the list of dates
-    for d in dates:
-        for iter in range(int(iter_count)):
-            # Convert the date to milliseconds
-            startmillis = int(d.timestamp()) * 1000 + iter * int(bucketByTime)
-            endmillis = int(startmillis + 86400000 / iter_count)
-
-            # Create a resulting dictionary that we will alter for each data type
-            res = {}
-            res["startTimeMillis"] = str(startmillis)
-            res["endTimeMillis"] = str(endmillis)
-
-            syn_steps = max(0, int(np.random.normal(10000, 9000)))
-
-            def max_syn_hrs(x):
-                return np.round(np.random.normal(120, 20), 14)
-
-            def syn_sleep_duration(x):
-                return np.round(np.random.normal(8, 3), 1)
-
-            def syn_speed_avg(x):
-                return np.round(np.random.normal(2, 1), 1)
-
-            def syn_speed_max(x):
-                return np.round(np.random.normal(3, 1), 1)
-
-            def syn_speed_min(x):
-                return np.round(np.random.normal(1, 0.5), 1)
-
-            def syn_heart_minutes(x):
-                return np.round(np.random.normal(90, 30), 1)
-
-            def syn_calories_expended(x):
-                return np.round(np.random.normal(2000, 1000), 1)
-
-            def syn_blood_pressure_sys(x):
-                return np.round(np.random.normal(120, 20), 1)
-
-            def syn_blood_pressure_dia(x):
-                return np.round(np.random.normal(80, 20), 1)
-
-            def syn_blood_glucose(x):
-                return np.round(np.random.normal(100, 20), 1)
-
-            def syn_activity(x):
-                return np.round(np.random.normal(100, 50))
-
-            def syn_distance(x):
-                return np.round(np.random.normal(3000, 2000), 1)
-
-            def syn_oxygen_saturation(x):
-                return np.round(np.random.normal(96.5, 5), 1)
-
-            def syn_oxygen_flow(x):
-                return np.round(np.random.normal(3, 2), 1)
-
-            def syn_body_temperature(x):
-                return np.round(np.random.normal(36.5, 2), 1)
-
-            def syn_menstruation(x):
-                return np.random.choice([1, 2, 3, 4])
-
-            # Building the resulting dictionary for steps
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["steps"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.step_count.delta",
-                                    "originDataSourceId": f"derived:com.google.step_count.delta:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [{"intVal": syn_steps, "mapVal": []}],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            steps.append(res)
-            # Building the resulting dictionary for heart rate
-            syn_hrs = max_syn_hrs(0)
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["heart_rate"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.heart_rate.bpm",
-                                    "originDataSourceId": f"derived:com.google.heart_rate.bpm:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": np.round(syn_hrs, 1), "mapVal": []},
-                                        {
-                                            "fpVal": np.round(
-                                                syn_hrs + np.random.uniform(10, 40), 1
-                                            ),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": np.round(
-                                                syn_hrs - np.random.uniform(10, 40), 1
-                                            ),
-                                            "mapVal": [],
-                                        },
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            hrs.append(res)
-
-            # Building the resulting dictionary for sleep duration
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["sleep"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.sleep.segment",
-                                    "originDataSourceId": f"derived:com.google.sleep.segment:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": syn_sleep_duration(0), "mapVal": []}
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            sleep.append(res)
-
-            weightGen = np.round(weight_gen + np.random.normal(-1, 1), 1)
-            # Building the resulting dictionary for weight
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["weight"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.weight",
-                                    "originDataSourceId": f"derived:com.google.weight:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": weightGen, "mapVal": []},
-                                        {"fpVal": weightGen, "mapVal": []},
-                                        {"fpVal": weightGen, "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            weight.append(res)
-
-            heightGen = np.round(height_gen + np.random.normal(-0.05, 0.05), 1)
-            # Building the resulting dictionary for height
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["height"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.height.summary",
-                                    "originDataSourceId": "raw:com.google.height:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {"fpVal": heightGen, "mapVal": []},
-                                        {"fpVal": heightGen, "mapVal": []},
-                                        {"fpVal": heightGen, "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            height.append(res)
-
-            # Building the resulting dictionary for speed
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["speed"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.speed.summary",
-                                    "originDataSourceId": f"derived:com.google.speed.summary:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": syn_speed_avg(0), "mapVal": []},
-                                        {"fpVal": syn_speed_max(0), "mapVal": []},
-                                        {"fpVal": syn_speed_min(0), "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            speed.append(res)
-
-            # Building the resulting dictionary for blood glucose
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["blood_glucose"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.blood_glucose.summary",
-                                    "originDataSourceId": "raw:com.google.blood_glucose:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {"fpVal": syn_blood_glucose(0), "mapVal": []},
-                                        {"fpVal": syn_blood_glucose(0), "mapVal": []},
-                                        {"fpVal": syn_blood_glucose(0), "mapVal": []},
-                                        {"intVal": 2, "mapVal": []},
-                                        {"intVal": 3, "mapVal": []},
-                                        {"intVal": 2, "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            blood_glucose.append(res)
-
-            # Building the resulting dictionary for blood pressure
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["blood_pressure"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.blood_pressure.summary",
-                                    "originDataSourceId": "raw:com.google.blood_pressure:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {
-                                            "fpVal": syn_blood_pressure_sys(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_blood_pressure_dia(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_blood_pressure_dia(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_blood_pressure_dia(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_blood_pressure_dia(0),
-                                            "mapVal": [],
-                                        },
-                                        {"intVal": 2, "mapVal": []},
-                                        {"intVal": 2, "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            blood_pressure.append(res)
-
-            # Building the resulting dictionary for distance
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["distance"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.distance.delta",
-                                    "originDataSourceId": f"derived:com.google.distance.delta:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": abs(syn_distance(0)), "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            distance.append(res)
-
-            # Building the resulting dictionary for heart minutes
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["heart_minutes"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.heart_minutes.summary",
-                                    "originDataSourceId": f"derived:com.google.heart_minutes.summary:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {"fpVal": syn_heart_minutes(0), "mapVal": []},
-                                        {"fpVal": syn_heart_minutes(0), "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            heart_minutes.append(res)
-
-            # Building the resulting dictionary for calories
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["calories_expended"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.calories.expended",
-                                    "originDataSourceId": f"derived:com.google.calories.expended:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [
-                                        {
-                                            "fpVal": syn_calories_expended(0),
-                                            "mapVal": [],
-                                        },
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            calories_expended.append(res)
-
-            # Building the resulting dictionary for activity_minutes
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["activity_minutes"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.activity_minutes",
-                                    "originDataSourceId": f"derived:com.google.activity_minutes.summary:com.google.ios.fit:appleinc.:watch:{device_id}:top_level",
-                                    "value": [{"fpVal": syn_activity(0), "mapVal": []}],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-
-            activity_mins.append(res)
-
-            # Building the resulting dictionary for menstrual cycle
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["menstruation"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.menstrual_cycle",
-                                    "originDataSourceId": "raw:com.google.menstrual_cycle:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {
-                                            "intVal": int(syn_menstruation(0)),
-                                            "mapVal": [],
-                                        }
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            menstruation.append(res)
-
-            # Building the resulting dictionary for body temperature
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["body_temperature"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.body.temperature",
-                                    "originDataSourceId": "raw:com.google.body.temperature:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {
-                                            "fpVal": syn_body_temperature(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_body_temperature(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_body_temperature(0),
-                                            "mapVal": [],
-                                        },
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            body_temperature.append(res)
-
-            # Building the resulting dictionary for oxygen saturation
-
-            res = [
-                {
-                    "startTimeMillis": startmillis,
-                    "endTimeMillis": endmillis,
-                    "dataset": [
-                        {
-                            "dataSourceId": datasourceids["oxygen_saturation"],
-                            "point": [
-                                {
-                                    "startTimeNanos": str(startmillis * 1000000),
-                                    "endTimeNanos": str(endmillis * 1000000),
-                                    "dataTypeName": "com.google.oxygen_saturation",
-                                    "originDataSourceId": "raw:com.google.oxygen_saturation:com.google.android.apps.fitness:user_input",
-                                    "value": [
-                                        {
-                                            "fpVal": syn_oxygen_saturation(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_oxygen_saturation(0),
-                                            "mapVal": [],
-                                        },
-                                        {
-                                            "fpVal": syn_oxygen_saturation(0),
-                                            "mapVal": [],
-                                        },
-                                        {"fpVal": syn_oxygen_flow(0), "mapVal": []},
-                                        {"fpVal": syn_oxygen_flow(0), "mapVal": []},
-                                        {"fpVal": syn_oxygen_flow(0), "mapVal": []},
-                                        {"intVal": 1, "mapVal": []},
-                                        {"intVal": 1, "mapVal": []},
-                                        {"intVal": 1, "mapVal": []},
-                                    ],
-                                }
-                            ],
-                        }
-                    ],
-                }
-            ]
-            oxygen_saturation.append(res)
-
-    # Retuning the resulting lists
-    return (
-        steps,
-        hrs,
-        weight,
-        height,
-        speed,
-        heart_minutes,
-        calories_expended,
-        sleep,
-        blood_pressure,
-        blood_glucose,
-        activity_mins,
-        distance,
-        oxygen_saturation,
-        body_temperature,
-        menstruation,
-    )
+    device_id = "".join(rng.choice([*"abcdefghijklmnopqrstuvwxyz0123456789"], 8))
+
+    # every data type gets its own generator, so it can be drawn independently
+    # of whether (and in which order) the other data types are ever requested
+    type_rngs = rng.spawn(len(SPECS))
+
+    return {
+        data_type: SyntheticBuckets(
+            data_type, start_millis, bucket_millis, type_rng, device_id
+        )
+        for data_type, type_rng in zip(SPECS, type_rngs)
+    }
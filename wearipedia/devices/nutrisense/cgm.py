@@ -1,11 +1,10 @@
-from datetime import datetime, timedelta
-
+import numpy as np
 import requests
 import urllib3
 
 from ...devices.device import BaseDevice
 from ...utils import seed_everything
-from .cgm_fetch import fetch_real_data
+from .cgm_fetch import fetch_many, fetch_real_data
 from .cgm_gen import gen_data
 
 
@@ -65,22 +64,39 @@ class NutrisenseCGM(BaseDevice):
 
     def _get_real(self, data_type, params):
         return fetch_real_data(
-            params["start_date"], params["end_date"], data_type, self.headers
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            self.headers,
+            memo=self.responses,
+        )
+
+    def _get_real_many(self, data_types, params):
+        # continuous and summary share one query, as do scores and statistics
+        return fetch_many(
+            params["start_date"],
+            params["end_date"],
+            data_types,
+            self.headers,
+            memo=self.responses,
         )
 
+    def clear_responses(self):
+        """Forget the GraphQL responses memoized by previous calls, so that the
+        next call for any date range fetches fresh data from the API.
+        """
+        self.responses = {}
+
     def _filter_synthetic(self, data, data_type, params):
-        # choose only the dates between start and end
-        result = []
-        str_to_date = lambda x: datetime.strptime(x, "%Y-%m-%dT%H:%M:%S-08:00")
-        start = datetime.strptime(params["start_date"], "%Y-%m-%d")
-        end = datetime.strptime(params["end_date"], "%Y-%m-%d")
-        end = end + timedelta(days=1)
+        # choose only the dates between start and end, by binary searching
+        # the timestamps of the continuous data
         if data_type == "continuous":
-            for e in data:
-                d = str_to_date(e["x"])
-                if d > start and d < end:
-                    result.append(e)
-            return result
+            start = np.datetime64(params["start_date"], "s")
+            end = np.datetime64(params["end_date"], "s") + np.timedelta64(1, "D")
+            start_idx, end_idx = np.searchsorted(
+                self.continuous_times, [start.astype(np.int64), end.astype(np.int64)]
+            )
+            return data[start_idx:end_idx]
         else:
             return data
 
@@ -89,12 +105,21 @@ class NutrisenseCGM(BaseDevice):
         seed_everything(self.init_params["seed"])
 
         # and based on start and end dates
-        self.scores, self.continuous, self.summary, self.statistics = gen_data(
+        (
+            self.scores,
+            self.continuous,
+            self.summary,
+            self.statistics,
+            times,
+        ) = gen_data(
             self.init_params["synthetic_start_date"],
             self.init_params["synthetic_end_date"],
             self.init_params["seed"],
         )
 
+        # timestamps (seconds, local time) of the continuous data, for filtering
+        self.continuous_times = times.astype("datetime64[s]").astype(np.int64)
+
     def _authenticate(self, auth_creds):
 
         urllib3.disable_warnings()
@@ -133,3 +158,6 @@ class NutrisenseCGM(BaseDevice):
 
         # save the token to the header for future requests
         self.headers["Authorization"] = bearer
+
+        # GraphQL responses per (operation, start_date, end_date)
+        self.clear_responses()
@@ -1,7 +1,184 @@
 import requests
 
+from ...utils import date_windows, fetch_concurrently
 
-def fetch_real_data(start_date, end_date, data_type, headers):
+GRAPHQL_URL = "https://api-production.nutrisense.io/graphql"
+
+# allCharts queries over more days than this are split into concurrent windows
+CHART_WINDOW_DAYS = 31
+MAX_WORKERS = 4
+
+# the GraphQL operation serving each data type
+OPERATIONS = {
+    "continuous": "allCharts",
+    "summary": "allCharts",
+    "scores": "allNutrition",
+    "statistics": "allNutrition",
+}
+
+QUERIES = {
+    "allCharts": "query allCharts($filter: DateFilter) {\n  allCharts(filter: $filter) {\n    charts {\n      type\n      title\n      description\n      xAxis\n      yAxis\n      range {\n        min\n        max\n        goal\n        goalMin\n        goalMax\n        __typename\n      }\n      meta {\n        key\n        tag\n        section\n        __typename\n      }\n      values {\n        ... on TimePair {\n          x\n          y\n          interpolated\n          __typename\n        }\n        ... on NumericPair {\n          x\n          y\n          __typename\n        }\n        ... on StringPair {\n          name\n          x\n          y\n          __typename\n        }\n        ... on RangePair {\n          x {\n            min\n            max\n            __typename\n          }\n          y\n          __typename\n        }\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
+    "allNutrition": "query allNutrition($filter: DateFilter) {\n  allNutrition(filter: $filter) {\n    nutrition {\n      today {\n        key\n        value\n        __typename\n      }\n      average {\n        key\n        value\n        __typename\n      }\n      __typename\n    }\n    score {\n      today {\n        scoreTimeOutsideRange\n        scorePeak\n        scoreMean\n        scoreStdDev\n        score\n        __typename\n      }\n      __typename\n    }\n    statistics {\n      today {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      average {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
+}
+
+
+def _variables(operation, start_date, end_date):
+    date_filter = {"startDate": start_date, "endDate": end_date}
+    if operation == "allCharts":
+        date_filter = {"types": [{"key": "timeline", "value": []}], **date_filter}
+    return {"filter": date_filter}
+
+
+def post_query(session, headers, operation, start_date, end_date):
+    """Run a single GraphQL operation over a date range.
+
+    :param session: session to send the request on
+    :type session: requests.Session
+    :param headers: current header with credentials to Nutrisense, pre authenticated
+    :type headers: dict
+    :param operation: "allCharts" or "allNutrition"
+    :type operation: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: the decoded response
+    :rtype: dict
+    """
+    json_data = {
+        "operationName": operation,
+        "variables": _variables(operation, start_date, end_date),
+        "query": QUERIES[operation],
+    }
+
+    response = session.post(GRAPHQL_URL, headers=headers, json=json_data, verify=False)
+    return response.json()
+
+
+def _succeeded(res):
+    return not res.get("errors") and bool(res.get("data"))
+
+
+def _merge_charts(responses):
+    """Merge allCharts responses of consecutive windows into one response."""
+    charts = [res["data"]["allCharts"]["charts"][0] for res in responses]
+    ranges = [chart["range"] for chart in charts if chart.get("range")]
+
+    merged = dict(charts[0])
+    merged["values"] = [value for chart in charts for value in chart["values"]]
+    if ranges:
+        merged["range"] = dict(ranges[0])
+        mins = [r["min"] for r in ranges if r["min"] is not None]
+        maxs = [r["max"] for r in ranges if r["max"] is not None]
+        merged["range"]["min"] = min(mins) if mins else None
+        merged["range"]["max"] = max(maxs) if maxs else None
+
+    return {"data": {"allCharts": {"charts": [merged]}}}
+
+
+def fetch_operation(
+    session,
+    headers,
+    operation,
+    start_date,
+    end_date,
+    window_days=CHART_WINDOW_DAYS,
+    max_workers=MAX_WORKERS,
+):
+    """Run a GraphQL operation over a date range, splitting long allCharts ranges
+    into windows that are queried concurrently and merged. If any window fails,
+    its response is returned instead.
+
+    :return: the (merged) response
+    :rtype: dict
+    """
+    if operation != "allCharts":
+        return post_query(session, headers, operation, start_date, end_date)
+
+    windows = date_windows(start_date, end_date, window_days)
+    responses = fetch_concurrently(
+        lambda window: post_query(session, headers, operation, *window),
+        windows,
+        max_workers=max_workers,
+    )
+    failed = [res for res in responses if not _succeeded(res)]
+    if failed:
+        return failed[0]
+    return responses[0] if len(responses) == 1 else _merge_charts(responses)
+
+
+def extract(data_type, res):
+    """Pick a data type out of the response of its GraphQL operation.
+
+    :param data_type: one of "continuous", "summary", "scores", "statistics"
+    :type data_type: str
+    :param res: the response of OPERATIONS[data_type]
+    :type res: dict
+    :return: the data
+    :rtype: list[dict] (for continuous data) or dict (otherwise)
+    """
+    if data_type == "continuous":
+        return res["data"]["allCharts"]["charts"][0]["values"]
+    elif data_type == "summary":
+        return res["data"]["allCharts"]["charts"][0]["range"]
+    elif data_type == "scores":
+        return res["data"]["allNutrition"]["score"]["today"]
+    elif data_type == "statistics":
+        return {
+            "today": res["data"]["allNutrition"]["statistics"]["today"],
+            "average": res["data"]["allNutrition"]["statistics"]["average"],
+        }
+
+
+def fetch_many(start_date, end_date, data_types, headers, memo=None):
+    """Fetch several data types, sending each GraphQL operation they need once.
+
+    The operations are sent concurrently. Successful responses are memoized per
+    (operation, start_date, end_date) in `memo` when given, so later calls for
+    the other data types of an operation cost no request at all; responses
+    carrying GraphQL errors are not, so they are requested again next time.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param data_types: the data types to fetch
+    :type data_types: list[str]
+    :param headers: current header with credentials to Nutrisense, pre authenticated
+    :type headers: dict
+    :param memo: responses of previous requests, updated in place, defaults to None
+    :type memo: dict, optional
+    :return: dictionary mapping each data type to its data
+    :rtype: dict
+    """
+    memo = {} if memo is None else memo
+
+    keys = []
+    for data_type in data_types:
+        key = (OPERATIONS[data_type], start_date, end_date)
+        if key not in memo and key not in keys:
+            keys.append(key)
+
+    session = requests.Session()
+    try:
+        responses = fetch_concurrently(
+            lambda key: fetch_operation(session, headers, *key), keys
+        )
+    finally:
+        session.close()
+    fetched = dict(zip(keys, responses))
+    memo.update((key, res) for key, res in fetched.items() if _succeeded(res))
+    fetched = {**memo, **fetched}
+
+    return {
+        data_type: extract(
+            data_type, fetched[(OPERATIONS[data_type], start_date, end_date)]
+        )
+        for data_type in data_types
+    }
+
+
+def fetch_real_data(start_date, end_date, data_type, headers, memo=None):
     """Main function for fetching real data from the nutrisense database.
     Uses Nutrisense's internal API.
 
@@ -13,65 +190,10 @@ def fetch_real_data(start_date, end_date, data_type, headers):
     :type data_type: str
     :param headers: current header with credentials to Nutrisense, pre authenticated
     :type headers: requests.sessions.Session
+    :param memo: responses of previous requests, see :func:`fetch_many`, defaults to None
+    :type memo: dict, optional
     :return: the data fetched from the API according to the inputs
     :rtype: list[dict] (for continuous data) or dict (otherwise)
     """
 
-    if data_type == "continuous" or data_type == "summary":
-        json_data = {
-            "operationName": "allCharts",
-            "variables": {
-                "filter": {
-                    "types": [
-                        {
-                            "key": "timeline",
-                            "value": [],
-                        },
-                    ],
-                    "startDate": start_date,
-                    "endDate": end_date,
-                },
-            },
-            "query": "query allCharts($filter: DateFilter) {\n  allCharts(filter: $filter) {\n    charts {\n      type\n      title\n      description\n      xAxis\n      yAxis\n      range {\n        min\n        max\n        goal\n        goalMin\n        goalMax\n        __typename\n      }\n      meta {\n        key\n        tag\n        section\n        __typename\n      }\n      values {\n        ... on TimePair {\n          x\n          y\n          interpolated\n          __typename\n        }\n        ... on NumericPair {\n          x\n          y\n          __typename\n        }\n        ... on StringPair {\n          name\n          x\n          y\n          __typename\n        }\n        ... on RangePair {\n          x {\n            min\n            max\n            __typename\n          }\n          y\n          __typename\n        }\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
-        }
-
-        response = requests.post(
-            "https://api-production.nutrisense.io/graphql",
-            headers=headers,
-            json=json_data,
-            verify=False,
-        )
-        res = response.json()
-
-        if data_type == "continuous":
-            return res["data"]["allCharts"]["charts"][0]["values"]
-        elif data_type == "summary":
-            return res["data"]["allCharts"]["charts"][0]["range"]
-
-    else:
-        json_data = {
-            "operationName": "allNutrition",
-            "variables": {
-                "filter": {
-                    "startDate": start_date,
-                    "endDate": end_date,
-                },
-            },
-            "query": "query allNutrition($filter: DateFilter) {\n  allNutrition(filter: $filter) {\n    nutrition {\n      today {\n        key\n        value\n        __typename\n      }\n      average {\n        key\n        value\n        __typename\n      }\n      __typename\n    }\n    score {\n      today {\n        scoreTimeOutsideRange\n        scorePeak\n        scoreMean\n        scoreStdDev\n        score\n        __typename\n      }\n      __typename\n    }\n    statistics {\n      today {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      average {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
-        }
-
-        response = requests.post(
-            "https://api-production.nutrisense.io/graphql",
-            headers=headers,
-            json=json_data,
-            verify=False,
-        )
-        res = response.json()
-
-        if data_type == "scores":
-            return res["data"]["allNutrition"]["score"]["today"]
-        elif data_type == "statistics":
-            return {
-                "today": res["data"]["allNutrition"]["statistics"]["today"],
-                "average": res["data"]["allNutrition"]["statistics"]["average"],
-            }
+    return fetch_many(start_date, end_date, [data_type], headers, memo)[data_type]
@@ -1,12 +1,6 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from threading import Thread
-
 import numpy as np
-import pandas as pd
 from numpy.random import randint
 from scipy.stats import tstd
-from tqdm import tqdm
 
 
 def gen_data(start_date, end_date, seed=0):
@@ -18,99 +12,91 @@ def gen_data(start_date, end_date, seed=0):
     :type end_date: str
     :param seed: the seed for the random number generator, defaults to 0
     :type seed: int, optional
-    :return: the data generated according to the inputs
-    :rtype: tuple(dict, list[dict], dict, dict)
+    :return: the data generated according to the inputs, followed by the local times
+        of the continuous data
+    :rtype: tuple(dict, list[dict], dict, dict, np.ndarray)
     """
 
     scores = gen_scores()
-    continuous, Y = gen_continuous(start_date, end_date, seed)
+    continuous, Y, times = gen_continuous(start_date, end_date, seed)
     summary = gen_summary(Y)
     stat = {
         "today": gen_stats(Y),
         "average": gen_stats(Y, weekly=True),
     }
-    return (scores, continuous, summary, stat)
+    return (scores, continuous, summary, stat, times)
+
+
+def reflect(values, low, high):
+    """Fold values back into [low, high], as if they bounced off of the bounds.
+
+    :param values: the values to fold
+    :type values: np.ndarray
+    :param low: the lower bound
+    :type low: float
+    :param high: the upper bound
+    :type high: float
+    :return: the folded values
+    :rtype: np.ndarray
+    """
+    span = high - low
+    folded = np.mod(values - low, 2 * span)
+    return low + np.where(folded > span, 2 * span - folded, folded)
 
 
 def gen_continuous(start_date, end_date, seed=0):
     """Generate the continuous data. Other data generating functions depend on results
     from this function.
 
+    Every day is a glucose walk over 96 15-minute segments, starting at a random
+    level within [110, 135], with clipped normal increments and reflected into [75, 135], the soft
+    bounds the glucose level is kept within. The walks of all days are drawn at
+    once.
+
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
     :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
     :type end_date: str
     :param seed: the seed for the random number generator, defaults to 0
     :type seed: int, optional
-    :return: the data generated according to the inputs
-    :rtype: tuple(list[dict], list[float])
+    :return: the data generated according to the inputs, the sensor values in time order
+        and their local times
+    :rtype: tuple(list[dict], np.ndarray, np.ndarray)
     """
 
-    start = datetime.strptime(start_date, "%Y-%m-%d")
-    end = datetime.strptime(end_date, "%Y-%m-%d")
-    dToStr = lambda x: f"{datetime.strftime(x, '%Y-%m-%dT%H:%M:%S')}-08:00"
-
-    n = (end - start).days + 1
-
-    datelist = pd.date_range(start, periods=n).tolist()
-
-    X = []
-    Y = []
-
-    def gen_glucose(t, index, seed=0):
-        local_rng = np.random.RandomState(seed + index)
-        cdata = []
-
-        y = local_rng.uniform(low=110, high=150, size=(1,))[0]
-
-        for i in range(96):  # 15 minute segments in a day
-            # simulate lack of adherence
-            interpolated = False
-            if local_rng.uniform(low=0, high=1, size=(1,))[0] > 0.95:
-                interpolated = True
-
-            x = t + i * timedelta(minutes=15)
-            item = {
-                "x": dToStr(x),
-                "y": y,
-                "interpolated": interpolated,
-                "__typename": "TimePair",
-            }
-            cdata.append(item)
-            X.append(x)
-            Y.append(y)
-
-            added = sorted([-1.1, local_rng.normal(scale=1), 1.1])[1] * 10 + 0.01 * (
-                160 / y
-            )
-            if y < 75:
-                added = abs(added)
-            elif y > 135:
-                added = -1 * abs(added)
-            y += added
+    n = (
+        int(
+            (np.datetime64(end_date) - np.datetime64(start_date))
+            // np.timedelta64(1, "D")
+        )
+        + 1
+    )
+    segments = 96  # 15 minute segments in a day
 
-        result[index] = cdata
+    times = np.datetime64(start_date, "m") + np.arange(n * segments) * np.timedelta64(
+        15, "m"
+    )
+    X = np.char.add(np.datetime_as_string(times, unit="s"), "-08:00").tolist()
 
-    threads = []
-    result = defaultdict(dict)
-    for j in tqdm(range(len(datelist))):
-        t = datelist[j]
-        new_thread = Thread(target=gen_glucose, args=(t, j, seed))
-        threads.append(new_thread)
+    local_rng = np.random.RandomState(seed)
+    start = local_rng.uniform(low=110, high=135, size=n)
 
-    # start threads
-    for thread in threads:
-        thread.start()
+    # simulate lack of adherence
+    interpolated = (local_rng.uniform(low=0, high=1, size=(n, segments)) > 0.95).ravel()
 
-    # wait for all threads to terminate
-    for thread in tqdm(threads):
-        thread.join()
+    added = np.clip(local_rng.normal(scale=1, size=(n, segments - 1)), -1.1, 1.1) * 10
+    added += 0.01 * (160 / start[:, None])
+    walk = start[:, None] + np.concatenate(
+        [np.zeros((n, 1)), np.cumsum(added, axis=1)], axis=1
+    )
+    Y = reflect(walk, 75, 135).ravel()
 
-    continuous = []
-    for k in sorted(result.keys()):
-        continuous += result[k]
+    continuous = [
+        {"x": x, "y": y, "interpolated": i, "__typename": "TimePair"}
+        for x, y, i in zip(X, Y.tolist(), interpolated.tolist())
+    ]
 
-    return (continuous, Y)
+    return (continuous, Y, times)
 
 
 def gen_summary(Y):
@@ -123,8 +109,8 @@ def gen_summary(Y):
     """
 
     summary = {
-        "min": min(Y),
-        "max": max(Y),
+        "min": float(np.min(Y)),
+        "max": float(np.max(Y)),
         "goal": None,
         "goalMin": 70.0,
         "goalMax": 140.0,
@@ -163,7 +149,7 @@ def gen_stats(Y, weekly=False):
     """
 
     if weekly:
-        low, high = min(Y), max(Y)
+        low, high = float(np.min(Y)), float(np.max(Y))
         median = np.median(Y)
         std = tstd(Y)
         q1, q3 = (np.quantile(Y, [0.25, 0.75])).round(1)
@@ -173,8 +159,8 @@ def gen_stats(Y, weekly=False):
         timeWithinRange = float(len(np.extract(condition, Y)))
         avg = np.average(Y)
     else:
-        low = randint(min(Y), 110)
-        high = randint(low, max(Y))
+        low = randint(np.min(Y), 110)
+        high = randint(low, np.max(Y))
         median = randint(low, high)
         std = randint(0, 10)
         q1 = randint(low, median)
@@ -3,6 +3,7 @@ import requests
 
 from ...devices.device import BaseDevice
 from .h10_gen import gen_data
+from .polar_gen import filter_by_date
 from .polar_get import fetch_real_data
 
 
@@ -56,22 +57,15 @@ class H10(BaseDevice):
             self.session,
             self.post,
             self.elite_hrv_session,
+            columnar=params.get("columnar", False),
         )
 
     def _filter_synthetic(self, data, data_type, params):
         # return data within range of start date and end date
         # includes both RR and HR data
-        result = {}
-
-        for key in data.keys():
-            if np.datetime64(key) - np.datetime64(params["end_date"]) > 0:
-                break
-            elif np.datetime64(key) - np.datetime64(params["start_date"]) < 0:
-                continue
-            else:
-                result[key] = data[key]
-
-        return result
+        return filter_by_date(
+            data, self.session_dates, params["start_date"], params["end_date"]
+        )
 
     def _gen_synthetic(self):
         # generate heart rate data according to start and end dates
@@ -81,6 +75,9 @@ class H10(BaseDevice):
             self.init_params["end_date"],
         )
 
+        # sorted index of the session dates, shared by all data types
+        self.session_dates = np.array(list(self.sessions), dtype="datetime64[D]")
+
     def _authenticate(self, auth_creds):
         self.elite_hrv_session = None
         self.session = None
@@ -0,0 +1,223 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+
+def bounded_walk(rng, start, n, low, high, scale, sampling_rate=1):
+    """Random walk of `n` steps starting at `start`, reflected into [low, high].
+
+    Every second, the walk moves by a standard normal draw plus a small upward
+    drift of `0.01 * scale / start`; at higher sampling rates each sample moves
+    by the matching fraction of that. The whole walk is computed with one
+    `np.cumsum`.
+
+    Unlike the former per-second loop, whose drift was `0.01 * scale / value`
+    for the current value, the drift is constant over the walk: it depends on
+    the start value only, which is what lets the steps be summed at once. As the
+    drift is a hundredth of the step size, the walks look the same.
+
+    :param rng: random generator to draw the steps from
+    :type rng: np.random.RandomState
+    :param start: first value of the walk
+    :type start: float
+    :param n: number of values
+    :type n: int
+    :param low: lower bound of the walk
+    :type low: float
+    :param high: upper bound of the walk
+    :type high: float
+    :param scale: value around which the drift is one percent per second
+    :type scale: float
+    :param sampling_rate: number of values per second, defaults to 1
+    :type sampling_rate: int, optional
+    :return: the walk
+    :rtype: np.ndarray
+    """
+    steps = rng.normal(scale=1 / np.sqrt(sampling_rate), size=n - 1)
+    steps += 0.01 * (scale / start) / sampling_rate
+    walk = start + np.concatenate([[0.0], np.cumsum(steps)])
+
+    # fold the walk back into the bounds, as if it bounced off of them
+    span = high - low
+    folded = np.mod(walk - low, 2 * span)
+    return low + np.where(folded > span, 2 * span - folded, folded)
+
+
+def gen_session(seed, start_date, index, sampling_rate=1, rr=False):
+    """Create the synthetic training session of a single day, if there is one.
+
+    The day gets its own random generator, seeded with `seed + index`, so the
+    result doesn't depend on which other days are generated or in which order.
+
+    :param seed: random seed of the whole range
+    :type seed: int
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param index: the day, as an offset in days from `start_date`
+    :type index: int
+    :param sampling_rate: number of heart rate samples per second, defaults to 1
+    :type sampling_rate: int, optional
+    :param rr: whether to also generate RR intervals, defaults to False
+    :type rr: bool, optional
+    :return: None for a skipped day, else a tuple of the date, its heart rate data
+        and its RR data (None unless `rr` is set)
+    :rtype: tuple(str, Dict[str: np.ndarray, str: int, str: int], Dict[str: np.ndarray]) or None
+    """
+    local_rng = np.random.RandomState(seed + index)
+
+    # simulate skip day
+    if local_rng.uniform(low=0, high=1) > 0.8:
+        return None
+
+    # day that you workout
+    day = np.datetime_as_string(
+        np.datetime64(start_date) + np.timedelta64(index, "D"), unit="D"
+    )
+    duration = int(local_rng.uniform(low=45, high=60))  # minutes
+    n = duration * 60 * sampling_rate
+
+    hrate = bounded_walk(
+        local_rng,
+        local_rng.uniform(low=70, high=110),
+        n,
+        50,
+        190,
+        160,
+        sampling_rate=sampling_rate,
+    )
+
+    rr_data = None
+    if rr:
+        rr_list = bounded_walk(
+            local_rng,
+            local_rng.uniform(low=400, high=2000),
+            duration * 60,
+            400,
+            2000,
+            1000,
+        )
+
+        # each RR interval starts when the previous one ends
+        offsets = np.concatenate([[0.0], np.cumsum(rr_list[:-1])])
+        times = np.datetime64("1900-01-01") + (offsets * 1000).astype("timedelta64[us]")
+        rr_data = {"rr": rr_list, "time": times}
+
+    hr_data = {
+        "heart_rates": hrate,
+        "calories": int(local_rng.uniform(low=200, high=500)),
+        "minutes": duration,
+    }
+
+    return day, hr_data, rr_data
+
+
+def gen_sessions(
+    seed, start_date, end_date, sampling_rate=1, rr=False, max_workers=None
+):
+    """Create the synthetic training sessions of every day between two dates.
+
+    :param seed: random seed for synthetic data generation
+    :type seed: int
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param sampling_rate: number of heart rate samples per second, defaults to 1
+    :type sampling_rate: int, optional
+    :param rr: whether to also generate RR intervals, defaults to False
+    :type rr: bool, optional
+    :param max_workers: number of processes to spread the days over, defaults to None,
+        which generates them in this process
+    :type max_workers: int, optional
+    :return: the (date, heart rate data, RR data) tuple of every session, ordered by date
+    :rtype: List[tuple]
+    """
+    num_days = int(
+        (np.datetime64(end_date) - np.datetime64(start_date)) // np.timedelta64(1, "D")
+    )
+    args = (
+        repeat(seed),
+        repeat(start_date),
+        range(num_days),
+        repeat(sampling_rate),
+        repeat(rr),
+    )
+
+    if max_workers is not None and max_workers > 1 and num_days > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunksize = max(1, num_days // (4 * max_workers))
+            days = list(executor.map(gen_session, *args, chunksize=chunksize))
+    else:
+        days = list(map(gen_session, *args))
+
+    return [day for day in days if day is not None]
+
+
+def sessions_to_dict(sessions, part=1):
+    """Per-day dictionary of one part of the sessions, with the arrays as lists.
+
+    :param sessions: sessions as returned by :func:`gen_sessions`
+    :type sessions: List[tuple]
+    :param part: 1 for the heart rate data, 2 for the RR data, defaults to 1
+    :type part: int, optional
+    :return: dictionary with keys the training session dates, ordered by date
+    :rtype: Dict[str: Dict]
+    """
+    return {
+        str(session[0]): {
+            key: value.tolist() if isinstance(value, np.ndarray) else value
+            for key, value in session[part].items()
+        }
+        for session in sessions
+    }
+
+
+def sessions_to_frame(sessions, sampling_rate=1):
+    """Heart rate samples of all sessions as a single DataFrame.
+
+    :param sessions: sessions as returned by :func:`gen_sessions`
+    :type sessions: List[tuple]
+    :param sampling_rate: number of heart rate samples per second, defaults to 1
+    :type sampling_rate: int, optional
+    :return: DataFrame with a row per sample and the columns "date", "time"
+        (seconds since the start of the session) and "heart_rate"
+    :rtype: pd.DataFrame
+    """
+    hrates = [hr_data["heart_rates"] for _, hr_data, _ in sessions]
+    lengths = [len(hrate) for hrate in hrates]
+
+    return pd.DataFrame(
+        {
+            "date": np.repeat(
+                np.array([day for day, _, _ in sessions], dtype="datetime64[D]"),
+                lengths,
+            ),
+            "time": np.concatenate(
+                [np.arange(length) / sampling_rate for length in lengths] or [[]]
+            ),
+            "heart_rate": np.concatenate(hrates or [[]]),
+        }
+    )
+
+
+def filter_by_date(data, dates, start_date, end_date):
+    """Sessions within the inclusive range [start_date, end_date].
+
+    :param data: per-day dictionary with "YYYY-MM-DD" keys
+    :type data: Dict[str: Dict]
+    :param dates: the keys of `data` as a sorted datetime64[D] array
+    :type dates: np.ndarray
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: the entries of `data` within the range
+    :rtype: Dict[str: Dict]
+    """
+    start_idx = np.searchsorted(dates, np.datetime64(start_date), side="left")
+    end_idx = np.searchsorted(dates, np.datetime64(end_date), side="right")
+
+    keys = np.datetime_as_string(dates[start_idx:end_idx], unit="D")
+    return {key: data[key] for key in keys.tolist()}
@@ -1,4 +1,3 @@
-import datetime
 import io
 import re
 import zipfile
@@ -7,9 +6,82 @@ import numpy as np
 import pandas as pd
 import requests
 
+from ...utils import fetch_concurrently
+
+# maximum number of training session exports downloaded, or Elite HRV
+# readings parsed, at once
+MAX_WORKERS = 4
+
+
+def parse_session_csv(text, date):
+    """Parse the heart rate samples of a Polar Flow training session CSV export.
+
+    The export starts with a header and a row summarizing the session, followed
+    by the header of the samples ("Sample rate", "Time", "HR (bpm)", ...) and the
+    samples themselves, with the elapsed time in "HH:MM:SS".
+
+    :param text: the exported CSV
+    :type text: str
+    :param date: the date of the session in the format "YYYY-MM-DD"
+    :type date: str
+    :return: DataFrame with the timestamp ("time") and heart rate ("bpm") of every sample
+    :rtype: pd.DataFrame
+    """
+    raw = pd.read_csv(
+        io.StringIO(text),
+        sep=",",
+        skiprows=2,
+        usecols=[1, 2],
+        names=["time", "bpm"],
+        header=0,
+        dtype=str,
+    )
+
+    # add the date and time stamp of data point
+    raw["time"] = pd.to_datetime(
+        date + " " + raw["time"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
+    )
+    raw["bpm"] = pd.to_numeric(raw["bpm"], errors="coerce")
+
+    # gets rid of not a number (NaN) entries if monitor loses connection to app
+    raw = raw.dropna()
+
+    return raw[raw["time"].dt.normalize() == pd.Timestamp(date)]
+
+
+def parse_rr_member(archive, name):
+    """Parse the RR intervals of one reading in an Elite HRV export, streaming
+    it straight from the zip archive.
+
+    :param archive: the Elite HRV export
+    :type archive: zipfile.ZipFile
+    :param name: name of the reading's ".txt" member, e.g. "export/2022-03-01 08-00-00.txt"
+    :type name: str
+    :return: the reading's name (its date and time), its RR intervals in milliseconds
+        and the offset of every interval from the start of the reading, in milliseconds
+    :rtype: tuple(str, np.ndarray, np.ndarray)
+    """
+    dte = (name.split("/")[1]).split(".")[0]  # get the date from the file name
+
+    with archive.open(name) as member:
+        rr = pd.read_csv(member, usecols=[0], dtype=np.float32).iloc[:, 0].to_numpy()
+
+    # each interval starts when the previous one ends
+    offsets = np.zeros(len(rr), dtype=np.int64)
+    offsets[1:] = np.round(np.cumsum(rr[:-1], dtype=np.float64))
+
+    return dte, rr, offsets
+
 
 def fetch_real_data(
-    start_date, end_date, data_type, session, post, elite_hrv_session=None
+    start_date,
+    end_date,
+    data_type,
+    session,
+    post,
+    elite_hrv_session=None,
+    columnar=False,
+    max_workers=MAX_WORKERS,
 ):
     """Main function for fetching real data from the Polar website.
     Does not use Polar's API, but instead scrapes the website.
@@ -26,13 +98,17 @@ def fetch_real_data(
     :type post: requests.models.Response
     :param elite_hrv_session: current login session to Elite HRV, pre authenticated, defaults to None
     :type elite_hrv_session: requests.sessions.Session, optional
+    :param columnar: for "rr", return every reading as an "rr" float32 array of RR intervals
+        and an "offset" int64 array of their offsets in milliseconds, defaults to False
+    :type columnar: bool, optional
+    :param max_workers: maximum number of downloads or readings processed at once,
+        defaults to MAX_WORKERS
+    :type max_workers: int, optional
     :return: a dictionary with keys the training session dates and values a dictionary with keys heart_rates, calories, and minutes
     :rtype: Dict[str: Dict[str: list, str: int, str: int]]
     """
 
-    # declare some new functions to help us parse the data
     result = {}
-    func = lambda x: list(str(x).split())[0]
 
     if data_type == "sessions":
 
@@ -69,31 +145,22 @@ def fetch_real_data(
             e for e in trainhist if (e["hrAvg"] != None and e["duration"] > 1200000)
         ]
 
-        for sesh in trainhist[::-1]:
+        def fetch_session(sesh):
             train_id = sesh["id"]
             date = list(sesh["startDate"].split())[0]
             r = session.get(
                 f"https://flow.polar.com/api/export/training/csv/{str(train_id)}"
             )
-            raw = pd.read_csv(io.StringIO(r.text), sep=",", engine="python")
+            return date, parse_session_csv(r.text, date)
 
-            # the columns processed by panda are named wrong
-            # that is, the time and bpm are named "Sport" and "Date" respectively
-            raw = raw.iloc[2:, :]
-            raw = raw[["Sport", "Date"]]
-            raw.columns = ["time", "bpm"]
-
-            # add the date and time stamp of data point
-            mapping = lambda x: np.datetime64(f"{date} {x}")
-            raw["time"] = raw["time"].apply(mapping)
-            raw["bpm"] = pd.to_numeric(raw["bpm"])
-
-            # gets rid of not a number (NaN) entries if monitor loses connection to app
-            raw.dropna(inplace=True)
+        # the exports are downloaded concurrently on the logged in session
+        sessions = trainhist[::-1]
+        exports = fetch_concurrently(fetch_session, sessions, max_workers=max_workers)
 
+        for sesh, (date, raw) in zip(sessions, exports):
             # add the data to the result dictionary
             result[date] = {
-                "heart_rates": list(raw[raw["time"].apply(func) == date]["bpm"]),
+                "heart_rates": raw["bpm"].tolist(),
                 "calories": sesh["calories"],
                 "minutes": sesh["duration"] / 60000,
             }
@@ -130,36 +197,24 @@ def fetch_real_data(
         z = zipfile.ZipFile(io.BytesIO(response.content))
 
         # for each of the session data, read the file
-        s = None
-        for f in z.namelist():
-            if f.endswith(".txt") and f != "!About This Export.txt":
-                dte = (f.split("/")[1]).split(".")[0]  # get the date from the file name
-                s = z.read(f)
-
-                # convert to bytes then read raw text as csv
-                bstring = str(s, "utf-8")
-                data = io.StringIO(bstring)
-                df = pd.read_csv(data)
-
-                # rename the columns correctly
-                df = df.rename(columns={str(df.columns[0]): "rr"})
-
-                # create a list of timestamps
-                cur_time = datetime.datetime.strptime("00:00:00.0", "%H:%M:%S.%f")
-                date_list = []
-
-                for interval in list(df["rr"]):
-                    date_list.append(cur_time)
-                    cur_time = cur_time + datetime.timedelta(milliseconds=interval)
-
-                # complete dataframe by setting index to the time
-                df["time"] = date_list
-                df = df.set_index("time")
+        names = [
+            f
+            for f in z.namelist()
+            if f.endswith(".txt") and f != "!About This Export.txt"
+        ]
+        readings = fetch_concurrently(
+            lambda name: parse_rr_member(z, name), names, max_workers=max_workers
+        )
 
-                # add the data to the result dictionary
+        for dte, rr, offsets in readings:
+            # add the data to the result dictionary
+            if columnar:
+                result[dte] = {"rr": rr, "offset": offsets}
+            else:
+                times = np.datetime64("1900-01-01") + offsets.astype("timedelta64[ms]")
                 result[dte] = {
-                    "rr": list(df["rr"]),
-                    "time": list(df.index),
+                    "rr": rr.tolist(),
+                    "time": times.astype("datetime64[us]").tolist(),
                 }
 
         return result
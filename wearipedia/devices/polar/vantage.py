@@ -26,6 +26,10 @@ class PolarVantage(BaseDevice):
 
     * `activity_by_id`: a list that contains activity data for a given activity session
 
+    For `training_data` and `daily_activity`, pass `"batched": True` in the params to
+    fetch the full exercises or activities (and, with `"samples": True`, their samples)
+    in a single transaction.
+
     :param seed: random seed for synthetic data generation, defaults to 0
     :type seed: int, optional
     :param synthetic_start_date: start date for synthetic data generation, defaults to "2022-03-01"
@@ -62,24 +66,16 @@ class PolarVantage(BaseDevice):
         }
 
     def _get_real(self, data_type, params):
-        if "training_id" in params:
-            return fetch_real_data(
-                self.token,
-                self.user_id,
-                params["start_date"],
-                params["end_date"],
-                data_type,
-                params["training_id"],
-            )
-        else:
-            return fetch_real_data(
-                self.token,
-                self.user_id,
-                params["start_date"],
-                params["end_date"],
-                data_type,
-                "",
-            )
+        return fetch_real_data(
+            self.token,
+            self.user_id,
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            params.get("training_id") or "",
+            batched=params.get("batched", False),
+            samples=params.get("samples", False),
+        )
 
     def _filter_synthetic(self, data, data_type, params):
         # Here we just return the data we've already generated,
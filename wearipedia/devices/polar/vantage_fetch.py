@@ -4,14 +4,129 @@ import re
 import pandas as pd
 import requests
 
+from ...utils import fetch_concurrently
+
 # This is the class that will be used to fetch data from Polar Flow
 
+ACCESSLINK_URL = "https://www.polaraccesslink.com/v3"
+
+# maximum number of exercises or activities fetched at once
+MAX_WORKERS = 4
+
+# for every listing data type: its transaction endpoint, the key listing the
+# items of a transaction and the endpoints of an item's samples
+TRANSACTIONS = {
+    "training_data": ("exercise-transactions", "exercises", ["samples"]),
+    "daily_activity": (
+        "activity-transactions",
+        "activity-log",
+        ["step-samples", "zone-samples"],
+    ),
+}
+
+
+def _get_json(session, url, what):
+    r = session.get(url)
+
+    if r.status_code >= 200 and r.status_code < 400:
+        return r.json()
+    else:
+        raise Exception(f"Failed to fetch {what}:", r)
+
+
+def fetch_transaction(
+    access_token, user_id, data_type, samples=False, max_workers=MAX_WORKERS
+):
+    """Fetch every exercise or activity available to a single transaction.
+
+    One transaction is opened, all of its items (and optionally their samples)
+    are fetched concurrently, and the transaction is committed once at the end,
+    instead of opening a transaction per item.
+
+    :param access_token: AccessLink access token
+    :type access_token: str
+    :param user_id: AccessLink user id
+    :type user_id: str
+    :param data_type: "training_data" for exercises or "daily_activity" for activities
+    :type data_type: str
+    :param samples: whether to also fetch the samples of every item, stored under
+        the name of their endpoint (e.g. "samples" or "step-samples"), defaults to False
+    :type samples: bool, optional
+    :param max_workers: maximum number of items fetched at once, defaults to MAX_WORKERS
+    :type max_workers: int, optional
+    :return: the exercises or activities
+    :rtype: List[Dict]
+    """
+    transactions, list_key, sample_endpoints = TRANSACTIONS[data_type]
+
+    session = requests.Session()
+    session.headers.update(
+        {"Accept": "application/json", "Authorization": f"Bearer {access_token}"}
+    )
+
+    try:
+        r = session.post(f"{ACCESSLINK_URL}/users/{user_id}/{transactions}")
+
+        if r.status_code == 201:
+            transaction_id = r.json()["transaction-id"]
+        elif r.status_code == 204:
+            print("No data available")
+            return []
+        else:
+            raise Exception(f"Opening {transactions} failed:", r)
+
+        transaction_url = (
+            f"{ACCESSLINK_URL}/users/{user_id}/{transactions}/{transaction_id}"
+        )
+        item_urls = _get_json(session, transaction_url, list_key).get(list_key, [])
+
+        def fetch_item(url):
+            item = _get_json(session, url, list_key)
+
+            if samples:
+                for endpoint in sample_endpoints:
+                    sample_data = _get_json(session, f"{url}/{endpoint}", endpoint)
+
+                    # exercise samples are listed as links to every sample type
+                    if endpoint == "samples":
+                        sample_data = [
+                            _get_json(session, sample_url, endpoint)
+                            for sample_url in sample_data.get("samples", [])
+                        ]
+
+                    item[endpoint] = sample_data
+
+            return item
+
+        items = fetch_concurrently(fetch_item, item_urls, max_workers=max_workers)
+
+        # only commit once everything has been fetched, so that a failed fetch
+        # leaves the data available to the next transaction
+        r = session.put(transaction_url)
+
+        if r.status_code < 200 or r.status_code >= 400:
+            raise Exception(f"Committing {transactions} failed:", r)
+    finally:
+        session.close()
+
+    return items
+
 
 def fetch_real_data(
-    access_token, user_id, start_date, end_date, data_type, training_id=None
+    access_token,
+    user_id,
+    start_date,
+    end_date,
+    data_type,
+    training_id=None,
+    batched=False,
+    samples=False,
 ):
     headers = {"Accept": "application/json", "Authorization": f"Bearer {access_token}"}
 
+    if batched and data_type in TRANSACTIONS:
+        return fetch_transaction(access_token, user_id, data_type, samples=samples)
+
     if data_type == "training_data":
         training_history = []
         r = requests.post(
@@ -38,7 +153,7 @@ def fetch_real_data(
             raise Exception("Failed to fetch exercises:", r)
 
         r = requests.put(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}",
             headers=headers,
         )
         return training_history
@@ -74,7 +189,7 @@ def fetch_real_data(
             raise Exception("Opening transaction for training history failed:", r)
 
         r = requests.get(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}/exercises/{training_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}/exercises/{training_id}",
             headers=headers,
         )
 
@@ -84,7 +199,7 @@ def fetch_real_data(
             raise Exception("Failed to fetch exercises:", r)
 
         r = requests.put(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/exercise-transactions/{transaction_id}",
             headers=headers,
         )
         return training_data
@@ -114,7 +229,7 @@ def fetch_real_data(
             raise Exception("Failed to fetch activities:", r)
 
         r = requests.put(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}",
             headers=headers,
         )
         return training_history
@@ -132,7 +247,7 @@ def fetch_real_data(
         else:
             raise Exception("Opening transaction for training history failed:", r)
         r = requests.get(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}/activities/{training_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}/activities/{training_id}",
             headers=headers,
         )
 
@@ -142,7 +257,7 @@ def fetch_real_data(
             raise Exception("Failed to fetch activity:", r)
 
         r = requests.put(
-            "https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}",
+            f"https://www.polaraccesslink.com/v3/users/{user_id}/activity-transactions/{transaction_id}",
             headers=headers,
         )
         return training_data
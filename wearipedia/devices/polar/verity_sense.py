@@ -2,6 +2,7 @@ import numpy as np
 import requests
 
 from ...devices.device import BaseDevice
+from .polar_gen import filter_by_date, sessions_to_frame
 from .polar_get import fetch_real_data
 from .verity_gen import gen_data
 
@@ -18,16 +19,24 @@ class VeritySense(BaseDevice):
     :type start_date: str, optional
     :param end_date: end date for synthetic data generation, defaults to "2022-06-17"
     :type end_date: str, optional
+    :param sampling_rate: number of synthetic heart rate samples per second, defaults to 1
+    :type sampling_rate: int, optional
+
+    Pass `"columnar": True` in the params to get the synthetic sessions as a single
+    DataFrame with a "date", "time" and "heart_rate" column.
     """
 
     name = "polar/verity_sense"
 
-    def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
+    def __init__(
+        self, seed=0, start_date="2022-03-01", end_date="2022-06-17", sampling_rate=1
+    ):
 
         params = {
             "seed": seed,
             "start_date": start_date,
             "end_date": end_date,
+            "sampling_rate": sampling_rate,
         }
 
         self._initialize_device_params(
@@ -37,6 +46,7 @@ class VeritySense(BaseDevice):
                 "seed": 0,
                 "start_date": "2022-03-01",
                 "end_date": "2022-06-17",
+                "sampling_rate": 1,
             },
         )
 
@@ -53,19 +63,21 @@ class VeritySense(BaseDevice):
             data_type,
             self.session,
             self.post,
+            columnar=params.get("columnar", False),
         )
 
     def _filter_synthetic(self, data, data_type, params):
         # return data within range of start date and end date
-        result = {}
-        for key in data.keys():
-            if np.datetime64(key) - np.datetime64(params["end_date"]) > 0:
-                break
-            elif np.datetime64(key) - np.datetime64(params["start_date"]) < 0:
-                continue
-            else:
-                result[key] = data[key]
-        return result
+        sessions = filter_by_date(
+            data, self.session_dates, params["start_date"], params["end_date"]
+        )
+
+        if params.get("columnar", False):
+            return sessions_to_frame(
+                [(day, hr_data, None) for day, hr_data in sessions.items()],
+                sampling_rate=self.init_params["sampling_rate"],
+            )
+        return sessions
 
     def _gen_synthetic(self):
         # generate heart rate data according to start and end dates
@@ -73,8 +85,12 @@ class VeritySense(BaseDevice):
             self.init_params["seed"],
             self.init_params["start_date"],
             self.init_params["end_date"],
+            sampling_rate=self.init_params["sampling_rate"],
         )
 
+        # sorted index of the session dates, for filtering
+        self.session_dates = np.array(list(self.sessions), dtype="datetime64[D]")
+
     def _authenticate(self, auth_creds):
 
         # set credentials for device object to be accessed later if needed
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .whoop_gen import create_fake_cycles, create_fake_hr
 from .whoop_user import WhoopUser
 
@@ -64,6 +64,9 @@ class Whoop4(BaseDevice):
 
     def _get_real(self, data_type, params):
         api_func = getattr(self.user, self.data_types_methods_map[data_type])
+        if data_type == "hr":
+            params = dict(params)
+            return api_func(params, columnar=params.pop("columnar", False))
         return api_func(params)
 
     def _filter_synthetic(self, data, data_type, params):
@@ -95,22 +98,23 @@ class Whoop4(BaseDevice):
             return cycles
 
         else:
-            # hr data is generated in 7 second intervals, so we need to
-            # do a binary search to find the start and end indices
-            # and then return the data between those indices
+            # hr data is kept as sorted columns, so we can binary search
+            # for the window and only build the samples inside it
 
             start_ts = pd.Timestamp(params["start"]).timestamp()
             end_ts = pd.Timestamp(params["end"]).timestamp()
 
-            vals = np.array([val["time"] for val in data["values"]])
+            start_idx, end_idx = np.searchsorted(data["time"], [start_ts, end_ts])
 
-            start_idx = bin_search(vals, start_ts)
-            end_idx = bin_search(vals, end_ts)
+            times = data["time"][start_idx:end_idx].tolist()
+            values = data["data"][start_idx:end_idx].tolist()
 
             return {
                 "name": "heart_rate",
-                "start": data["values"][start_idx]["time"],
-                "values": data["values"][start_idx:end_idx],
+                "start": times[0] if times else start_ts,
+                "values": [
+                    {"data": value, "time": time} for value, time in zip(values, times)
+                ],
             }
 
     def _gen_synthetic(self):
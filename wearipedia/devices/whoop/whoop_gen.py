@@ -1,163 +1,274 @@
 # utils for generating synthetic data
 
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 import numpy as np
+import pandas as pd
 
 __all__ = [
+    "FakeCycles",
     "create_fake_cycles",
     "create_fake_hr",
 ]
 
 
-def create_fake_cycles(start_date, end_date):
-    num_cycles = (end_date - start_date).days
-
-    records = []
-
-    for i in range(num_cycles):
-        day = end_date - timedelta(days=i + 1)
-
-        cycle = {
-            "id": np.random.randint(0, 1000000000),
-            "created_at": "2022-04-27T16:28:30.523+0000",
-            "updated_at": "2022-08-19T17:10:29.456+0000",
-            "scaled_strain": np.clip(0, 30, np.random.normal() * 5 + 10),
-            "during": "['2022-04-27T11:42:16.060Z','2022-04-28T12:41:13.254Z')",
-            "user_id": 4005531,
-            "sleep_need": None,
-            "predicted_end": "2022-04-28T12:41:13.254+0000",
-            "timezone_offset": "-0700",
-            "days": f"['{datetime.strftime(day, '%Y-%m-%d')}','{datetime.strftime(day + timedelta(days=1), '%Y-%m-%d')}')",
-            "intensity_score": None,
-            "data_state": "complete",
-            "day_strain": np.clip(0, 0.01, np.random.normal() * 0.005 + 0.005),
-            "day_kilojoules": np.random.normal() * 2500 + 5000,
-            "day_avg_heart_rate": np.random.normal() * 10 + 75,
-            "day_max_heart_rate": np.random.normal() * 20 + 150,
+def _normal(mean, std, size):
+    return np.random.normal(size=size) * std + mean
+
+
+def _randint(size):
+    return np.random.randint(0, 1000000000, size=size)
+
+
+class FakeCycles:
+    """Synthetic Whoop cycle records, most recent day first.
+
+    Every field is drawn for all days (and all sleeps) at once, and the nested
+    Whoop-shaped records are only assembled for the days that are indexed.
+    Slicing returns a plain list of records, like the real API. Use
+    :meth:`to_frame` to work with the fields directly instead.
+
+    :param start_date: first day of the range
+    :type start_date: datetime
+    :param end_date: end of the range (exclusive)
+    :type end_date: datetime
+    """
+
+    def __init__(self, start_date, end_date):
+        n = (end_date - start_date).days
+        self.days = np.datetime_as_string(
+            np.datetime64(end_date.date()) - np.arange(1, n + 1), unit="D"
+        )
+        self.next_days = np.datetime_as_string(
+            np.datetime64(end_date.date()) - np.arange(n), unit="D"
+        )
+
+        self.cycle = {
+            "id": _randint(n),
+            "scaled_strain": np.clip(_normal(10, 5, n), 0, 30),
+            "day_strain": np.clip(_normal(0.005, 0.005, n), 0, 0.01),
+            "day_kilojoules": _normal(5000, 2500, n),
+            "day_avg_heart_rate": _normal(75, 10, n),
+            "day_max_heart_rate": _normal(150, 20, n),
         }
 
         # overly simplistic model for now
         # TODO: change this so that it matches the
         # notebook
-        num_sleeps = np.random.poisson(1)
-
-        sleeps = []
-
-        for _ in range(num_sleeps):
-            sleep = {
-                "cycle_id": np.random.randint(0, 1000000000),
-                "created_at": "2022-04-27T01:47:48.706+0000",
-                "updated_at": "2022-04-27T03:25:23.600+0000",
-                "activity_id": np.random.randint(0, 1000000000),
-                "score": int(np.random.uniform(0, 100)),
-                "quality_duration": int(
-                    np.clip(0, 50_000_000, np.random.normal() * 5_000_000 + 25_000_000)
-                ),
-                "latency": 0,
-                "max_heart_rate": None,
-                "average_heart_rate": None,
-                "debt_pre": np.random.normal() * 100_000 + 3_000_000.0,
-                "debt_post": np.random.normal() * 100_000 + 3_000_000.0,
-                "need_from_strain": np.random.normal() * 100_000 + 3_000_000.0,
-                "sleep_need": np.random.normal() * 100_000 + 3_000_000.0,
-                "habitual_sleep_need": np.random.normal() * 100_000 + 3_000_000.0,
-                "disturbances": 1,
-                "time_in_bed": np.random.normal() * 100_000 + 3_000_000.0,
-                "light_sleep_duration": np.random.normal() * 100_000 + 3_000_000,
-                "slow_wave_sleep_duration": int(
-                    np.random.normal() * 100_000 + 3_000_000
-                ),
-                "rem_sleep_duration": int(np.random.normal() * 100_000 + 3_000_000),
-                "cycles_count": 1,
-                "wake_duration": np.clip(
-                    0, 1_000_000, int(np.random.normal() * 100_000 + 100_000)
-                ),
-                "arousal_time": np.random.normal() * 50_000 + 100_000,
-                "no_data_duration": 0,
-                "in_sleep_efficiency": np.random.uniform(0, 1),
-                "credit_from_naps": 0.0,
-                "hr_baseline": None,
-                "respiratory_rate": np.random.normal() * 10 + 15.0,
-                "sleep_consistency": None,
-                "algo_version": "5.0.0",
-                "projected_score": np.random.uniform(0, 100),
-                "projected_sleep": 4281596.0,
-                "optimal_sleep_times": None,
-                "kilojoules": None,
-                "user_id": np.random.randint(0, 1000000000),
-                "during": "['2022-04-27T00:03:38.208Z','2022-04-27T01:20:41.151Z')",
+        num_sleeps = np.random.poisson(1, n)
+        self.sleep_offsets = np.concatenate([[0], np.cumsum(num_sleeps)])
+        m = int(self.sleep_offsets[-1])
+
+        self.sleep = {
+            "day": np.repeat(np.arange(n), num_sleeps),
+            "cycle_id": _randint(m),
+            "activity_id": _randint(m),
+            "score": np.random.uniform(0, 100, m).astype(int),
+            "quality_duration": np.clip(
+                _normal(25_000_000, 5_000_000, m), 0, 50_000_000
+            ).astype(int),
+            "debt_pre": _normal(3_000_000.0, 100_000, m),
+            "debt_post": _normal(3_000_000.0, 100_000, m),
+            "need_from_strain": _normal(3_000_000.0, 100_000, m),
+            "sleep_need": _normal(3_000_000.0, 100_000, m),
+            "habitual_sleep_need": _normal(3_000_000.0, 100_000, m),
+            "time_in_bed": _normal(3_000_000.0, 100_000, m),
+            "light_sleep_duration": _normal(3_000_000, 100_000, m),
+            "slow_wave_sleep_duration": _normal(3_000_000, 100_000, m).astype(int),
+            "rem_sleep_duration": _normal(3_000_000, 100_000, m).astype(int),
+            "wake_duration": np.clip(
+                _normal(100_000, 100_000, m).astype(int), 0, 1_000_000
+            ),
+            "arousal_time": _normal(100_000, 50_000, m),
+            "in_sleep_efficiency": np.random.uniform(0, 1, m),
+            "respiratory_rate": _normal(15.0, 10, m),
+            "projected_score": np.random.uniform(0, 100, m),
+            "user_id": _randint(m),
+        }
+
+        self.recovery = {
+            "id": _randint(n),
+            "user_id": _randint(n),
+            "sleep_id": _randint(n),
+            "cycle_id": _randint(n),
+            "recovery_score": np.random.uniform(0, 100, n).astype(int),
+            "resting_heart_rate": np.random.uniform(45, 65, n).astype(int),
+            "skin_temp_celsius": np.round(np.random.uniform(25, 40, n), 1),
+            "spo2": np.round(np.random.uniform(70, 100, n), 1),
+            "recovery_rate": np.clip(_normal(3.5, 2, n), 0, 10),
+        }
+
+    def __len__(self):
+        return len(self.days)
+
+    def __iter__(self):
+        return iter(self[:])
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self._record(i) for i in range(*idx.indices(len(self)))]
+        return self._record(range(len(self))[idx])
+
+    def to_frame(self, part="cycle"):
+        """The drawn fields as a DataFrame with one row per cycle, sleep or recovery.
+
+        :param part: one of "cycle", "sleep" or "recovery", defaults to "cycle"
+        :type part: str, optional
+        :return: the fields of `part`, with the day of each row in a "day" column
+        :rtype: pd.DataFrame
+        """
+        columns = dict(getattr(self, part))
+        columns["day"] = self.days[columns.get("day", slice(None))]
+        return pd.DataFrame(columns)
+
+    def _record(self, i):
+        day, next_day = self.days[i], self.next_days[i]
+        cycle = {key: values[i].item() for key, values in self.cycle.items()}
+        recovery = {key: values[i].item() for key, values in self.recovery.items()}
+
+        return {
+            "cycle": {
+                "id": cycle["id"],
+                "created_at": "2022-04-27T16:28:30.523+0000",
+                "updated_at": "2022-08-19T17:10:29.456+0000",
+                "scaled_strain": cycle["scaled_strain"],
+                "during": "['2022-04-27T11:42:16.060Z','2022-04-28T12:41:13.254Z')",
+                "user_id": 4005531,
+                "sleep_need": None,
+                "predicted_end": "2022-04-28T12:41:13.254+0000",
                 "timezone_offset": "-0700",
+                "days": f"['{day}','{next_day}')",
+                "intensity_score": None,
+                "data_state": "complete",
+                "day_strain": cycle["day_strain"],
+                "day_kilojoules": cycle["day_kilojoules"],
+                "day_avg_heart_rate": cycle["day_avg_heart_rate"],
+                "day_max_heart_rate": cycle["day_max_heart_rate"],
+            },
+            "sleeps": [
+                self._sleep(j)
+                for j in range(self.sleep_offsets[i], self.sleep_offsets[i + 1])
+            ],
+            "recovery": {
+                "during": "['2022-04-27T11:42:16.060Z','2022-04-27T18:17:23.904Z')",
+                "id": recovery["id"],
+                "created_at": "2022-04-27T16:28:30.523+0000",
+                "updated_at": "2022-04-27T18:49:22.756+0000",
+                "date": "2022-04-27T18:17:23.904+0000",
+                "user_id": recovery["user_id"],
+                "sleep_id": recovery["sleep_id"],
                 "survey_response_id": None,
-                "percent_recorded": 1.0,
-                "auto_detected": True,
-                "state": "complete",
+                "cycle_id": recovery["cycle_id"],
                 "responded": False,
-                "team_act_id": None,
-                "source": "auto+user",
-                "is_significant": False,
-                "is_normal": True,
-                "is_nap": True,
-            }
-
-            sleeps.append(sleep)
-
-        recovery = {
-            "during": "['2022-04-27T11:42:16.060Z','2022-04-27T18:17:23.904Z')",
-            "id": np.random.randint(0, 1000000000),
-            "created_at": "2022-04-27T16:28:30.523+0000",
-            "updated_at": "2022-04-27T18:49:22.756+0000",
-            "date": "2022-04-27T18:17:23.904+0000",
-            "user_id": np.random.randint(0, 1000000000),
-            "sleep_id": np.random.randint(0, 1000000000),
+                "recovery_score": recovery["recovery_score"],
+                "resting_heart_rate": recovery["resting_heart_rate"],
+                "hrv_rmssd": 0.071095094,
+                "state": "complete",
+                "calibrating": True,
+                "prob_covid": None,
+                "hr_baseline": 57.0,
+                "skin_temp_celsius": recovery["skin_temp_celsius"],
+                "spo2": recovery["spo2"],
+                "algo_version": "5.0.0",
+                "rhr_component": None,
+                "hrv_component": None,
+                "history_size": 2.0,
+                "from_sws": False,
+                "recovery_rate": recovery["recovery_rate"],
+                "is_normal": None,
+            },
+            "workouts": [],
+            "v2_activities": [],
+        }
+
+    def _sleep(self, j):
+        sleep = {key: values[j].item() for key, values in self.sleep.items()}
+
+        return {
+            "cycle_id": sleep["cycle_id"],
+            "created_at": "2022-04-27T01:47:48.706+0000",
+            "updated_at": "2022-04-27T03:25:23.600+0000",
+            "activity_id": sleep["activity_id"],
+            "score": sleep["score"],
+            "quality_duration": sleep["quality_duration"],
+            "latency": 0,
+            "max_heart_rate": None,
+            "average_heart_rate": None,
+            "debt_pre": sleep["debt_pre"],
+            "debt_post": sleep["debt_post"],
+            "need_from_strain": sleep["need_from_strain"],
+            "sleep_need": sleep["sleep_need"],
+            "habitual_sleep_need": sleep["habitual_sleep_need"],
+            "disturbances": 1,
+            "time_in_bed": sleep["time_in_bed"],
+            "light_sleep_duration": sleep["light_sleep_duration"],
+            "slow_wave_sleep_duration": sleep["slow_wave_sleep_duration"],
+            "rem_sleep_duration": sleep["rem_sleep_duration"],
+            "cycles_count": 1,
+            "wake_duration": sleep["wake_duration"],
+            "arousal_time": sleep["arousal_time"],
+            "no_data_duration": 0,
+            "in_sleep_efficiency": sleep["in_sleep_efficiency"],
+            "credit_from_naps": 0.0,
+            "hr_baseline": None,
+            "respiratory_rate": sleep["respiratory_rate"],
+            "sleep_consistency": None,
+            "algo_version": "5.0.0",
+            "projected_score": sleep["projected_score"],
+            "projected_sleep": 4281596.0,
+            "optimal_sleep_times": None,
+            "kilojoules": None,
+            "user_id": sleep["user_id"],
+            "during": "['2022-04-27T00:03:38.208Z','2022-04-27T01:20:41.151Z')",
+            "timezone_offset": "-0700",
             "survey_response_id": None,
-            "cycle_id": np.random.randint(0, 1000000000),
-            "responded": False,
-            "recovery_score": int(np.random.uniform(0, 100)),
-            "resting_heart_rate": int(np.random.uniform(45, 65)),
-            "hrv_rmssd": 0.071095094,
+            "percent_recorded": 1.0,
+            "auto_detected": True,
             "state": "complete",
-            "calibrating": True,
-            "prob_covid": None,
-            "hr_baseline": 57.0,
-            "skin_temp_celsius": np.round(np.random.uniform(25, 40), 1),
-            "spo2": np.round(np.random.uniform(70, 100), 1),
-            "algo_version": "5.0.0",
-            "rhr_component": None,
-            "hrv_component": None,
-            "history_size": 2.0,
-            "from_sws": False,
-            "recovery_rate": np.clip(0, 10, np.random.normal() * 2 + 3.5),
-            "is_normal": None,
+            "responded": False,
+            "team_act_id": None,
+            "source": "auto+user",
+            "is_significant": False,
+            "is_normal": True,
+            "is_nap": True,
         }
 
-        record = {
-            "cycle": cycle,
-            "sleeps": sleeps,
-            "recovery": recovery,
-            "workouts": [],
-            "v2_activities": [],
-        }
 
-        records.append(record)
+def create_fake_cycles(start_date, end_date):
+    """Create synthetic Whoop cycles for every day between two dates.
+
+    :param start_date: first day of the range
+    :type start_date: datetime
+    :param end_date: end of the range (exclusive)
+    :type end_date: datetime
+    :return: dictionary shaped like the cycles endpoint response, with the
+        records (most recent day first) assembled lazily
+    :rtype: Dict
+    """
+    records = FakeCycles(start_date, end_date)
+    num_cycles = len(records)
 
     return {"total_count": num_cycles, "offset": num_cycles, "records": records}
 
 
 def create_fake_hr(start_date, end_date):
-    # samples every minute now, for some reason
-
-    values = []
-
-    cur_timestamp = start_date
+    """Create a synthetic heart rate series between two dates, in columnar form.
 
-    while True:
-        if cur_timestamp > end_date:
-            break
+    :param start_date: start of the series
+    :type start_date: datetime
+    :param end_date: end of the series (inclusive)
+    :type end_date: datetime
+    :return: dictionary with the series name and start, the sample timestamps
+        (seconds since the epoch, sorted) under "time" and the heart rate samples
+        under "data"
+    :rtype: Dict
+    """
+    # samples every minute now, for some reason
+    step = timedelta(seconds=60.563)
+    num_samples = (end_date - start_date) // step + 1
 
-        values.append(
-            {"data": np.random.normal() * 20 + 80, "time": cur_timestamp.timestamp()}
-        )
-        cur_timestamp += timedelta(seconds=60.563)
+    start = start_date.timestamp()
+    times = start + np.arange(num_samples) * step.total_seconds()
+    values = np.random.normal(size=num_samples) * 20 + 80
 
-    return {"name": "heart_rate", "start": start_date.timestamp(), "values": values}
+    return {"name": "heart_rate", "start": start, "time": times, "data": values}
@@ -1,5 +1,38 @@
+import numpy as np
+import pandas as pd
 import requests
 
+from ...utils import fetch_concurrently
+
+# heart rate is requested in windows of this many days, so that long ranges
+# don't turn into a single enormous (and timing out) response
+HR_WINDOW_DAYS = 1
+HR_MAX_WORKERS = 4
+
+
+def _format_time(timestamp):
+    return timestamp.strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def hr_windows(start, end, window_days=HR_WINDOW_DAYS):
+    """Split the range between two Whoop timestamps into consecutive windows.
+
+    :param start: start of the range, e.g. "2022-04-24T00:00:00.000Z"
+    :type start: str
+    :param end: end of the range, e.g. "2022-04-28T00:00:00.000Z"
+    :type end: str
+    :param window_days: maximum length of a window in days, defaults to HR_WINDOW_DAYS
+    :type window_days: int, optional
+    :return: list of (start, end) timestamp string pairs
+    :rtype: List[Tuple[str, str]]
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    edges = list(pd.date_range(start, end, freq=pd.Timedelta(days=window_days)))
+    if edges[-1] < end or len(edges) == 1:
+        edges.append(end)
+
+    return [(_format_time(a), _format_time(b)) for a, b in zip(edges[:-1], edges[1:])]
+
 
 class WhoopUser:
     def __init__(self, email, password):
@@ -42,12 +75,9 @@ class WhoopUser:
         :return: json with all info from cycles endpoint
         """
 
-        params["startTime"] = params["start"]
-        params["endTime"] = params["end"]
-
-        del params["start"]
-        del params["end"]
-
+        params = dict(params)
+        params["startTime"] = params.pop("start")
+        params["endTime"] = params.pop("end")
         params["apiVersion"] = "7"
 
         cycles_URL = f"https://api.prod.whoop.com/activities-service/v1/cycles/aggregate/range/{self.user_id}"
@@ -63,28 +93,74 @@ class WhoopUser:
 
         return data
 
-    def get_heart_rate_json(self, params):
+    def get_heart_rate_json(
+        self,
+        params,
+        window_days=HR_WINDOW_DAYS,
+        max_workers=HR_MAX_WORKERS,
+        columnar=False,
+    ):
         """
-        Get heart rate data on user
-        :param params: params for heart rate data
+        Get heart rate data on user, fetching the range in concurrent windows
+        :param params: params for heart rate data, including start and end; not modified
+        :param window_days: maximum number of days requested at once
+        :param max_workers: maximum number of requests in flight
+        :param columnar: return the samples as sorted "time" and "data" arrays
+            instead of a list of {"data", "time"} dicts
         :return: dict of heart rate data
         """
 
-        params["step"] = "60"
-        params["order"] = "t"
+        query = {
+            key: value for key, value in params.items() if key not in ("start", "end")
+        }
+        query["step"] = "60"
+        query["order"] = "t"
 
-        hr_request = requests.get(
-            self.BASE_URL + f"users/{self.user_id}/metrics/heart_rate",
-            params=params,
-            headers=self.header,
-        )
+        url = self.BASE_URL + f"users/{self.user_id}/metrics/heart_rate"
+        session = requests.Session()
+
+        def fetch_window(window):
+            hr_request = session.get(
+                url,
+                params={**query, "start": window[0], "end": window[1]},
+                headers=self.header,
+            )
+
+            try:
+                data = hr_request.json()
+            except Exception as e:
+                exception_str = f"Got exception:\n{e}\n"
+                exception_str += f"Received request response is:\n{hr_request.text}"
+
+                raise Exception(exception_str)
+
+            values = data.get("values") or []
+            times = np.array([value["time"] for value in values], dtype=np.int64)
+            samples = np.array([value["data"] for value in values], dtype=float)
+            return data.get("start"), times, samples
 
         try:
-            data = hr_request.json()
-        except Exception as e:
-            exception_str = f"Got exception:\n{e}\n"
-            exception_str += f"Received request response is:\n{hr_request.text}"
+            results = fetch_concurrently(
+                fetch_window,
+                hr_windows(params["start"], params["end"], window_days),
+                max_workers=max_workers,
+            )
+        finally:
+            session.close()
 
-            raise Exception(exception_str)
+        # windows share their boundaries, so drop the duplicated samples
+        times, first = np.unique(
+            np.concatenate([times for _, times, _ in results]), return_index=True
+        )
+        samples = np.concatenate([samples for _, _, samples in results])[first]
+
+        data = {"name": "heart_rate", "start": results[0][0]}
+        if columnar:
+            data["time"], data["data"] = times, samples
+        else:
+            data["values"] = [
+                {"data": sample, "time": time}
+                for sample, time in zip(samples.tolist(), times.tolist())
+            ]
 
         return data
@@ -1,8 +1,45 @@
+import json
 import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 import numpy as np
 
-__all__ = ["is_notebook", "seed_everything"]
+# optional fast JSON parsers, falling back to the standard library
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    try:
+        import simdjson
+
+        _json_loads = simdjson.loads
+    except ImportError:
+        _json_loads = json.loads
+
+__all__ = [
+    "is_notebook",
+    "seed_everything",
+    "RateLimiter",
+    "fetch_concurrently",
+    "date_windows",
+    "json_loads",
+]
+
+
+def json_loads(content):
+    """Parse a JSON document, using orjson or simdjson when they are installed.
+
+    :param content: the raw JSON document, e.g. `response.content`
+    :type content: bytes or str
+    :return: the parsed document
+    :rtype: Dict or List
+    """
+    return _json_loads(content)
 
 
 def is_notebook() -> bool:
@@ -72,3 +109,78 @@ def bin_search(data, target):
     """
 
     return bin_search_aux(data, 0, len(data) - 1, target)
+
+
+class RateLimiter:
+    """Thread-safe sliding-window rate limiter, shared by the worker threads of
+    a concurrent fetch so that together they stay within an API's request budget.
+
+    :param max_calls: maximum number of calls allowed within `period`
+    :type max_calls: int
+    :param period: length of the window in seconds
+    :type period: float
+    """
+
+    def __init__(self, max_calls, period):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until another call can be made without exceeding the budget."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                delay = self.period - (now - self._calls[0])
+            time.sleep(delay)
+
+
+def fetch_concurrently(fetch, items, max_workers=4):
+    """Call `fetch` on every item of `items` on a bounded thread pool.
+
+    :param fetch: function taking a single item and returning its result
+    :type fetch: Callable
+    :param items: the items to fetch, e.g. dates or (start, end) windows
+    :type items: Iterable
+    :param max_workers: maximum number of requests in flight, defaults to 4
+    :type max_workers: int, optional
+    :return: the results, in the same order as `items`
+    :rtype: List
+    """
+    items = list(items)
+    if max_workers <= 1 or len(items) <= 1:
+        return [fetch(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(fetch, items))
+
+
+def date_windows(start_date, end_date, max_days):
+    """Split the inclusive range [start_date, end_date] into consecutive windows
+    spanning at most `max_days` days each.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param max_days: maximum number of days in a single window
+    :type max_days: int
+    :return: list of (start, end) date string pairs in the format "YYYY-MM-DD"
+    :rtype: List[Tuple[str, str]]
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+
+    windows = []
+    while start <= end:
+        window_end = min(start + timedelta(days=max_days - 1), end)
+        windows.append((start.strftime("%Y-%m-%d"), window_end.strftime("%Y-%m-%d")))
+        start = window_end + timedelta(days=1)
+
+    return windows